@@ -2,6 +2,7 @@ import bpy
 from .n8n_node_base import (
     N8nNodeTree,
     N8nNodeBase,
+    clear_execution_order_cache,
     register_node_categories,
     unregister_node_categories
 )
@@ -35,6 +36,9 @@ def unregister():
     # 注销节点类别
     unregister_node_categories()
     
+    # 清空执行顺序缓存
+    clear_execution_order_cache()
+    
     # 注销节点类
     unregister_node_classes()
     
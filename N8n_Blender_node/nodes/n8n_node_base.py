@@ -19,6 +19,91 @@ except ImportError:
     def _(text):
         return text
 
+# 循环依赖节点的标记颜色
+CYCLE_HIGHLIGHT_COLOR = (0.8, 0.15, 0.15)
+
+class CycleError(ValueError):
+    """工作流存在循环依赖，cycles为构成每个循环的节点名称"""
+    
+    def __init__(self, cycles: List[List[str]]):
+        self.cycles = cycles
+        paths = "; ".join(" -> ".join(cycle + cycle[:1]) for cycle in cycles)
+        super().__init__(f"Circular dependency detected in workflow: {paths}")
+
+def strongly_connected_components(adjacency: Dict[str, List[str]]) -> List[List[str]]:
+    """Tarjan算法求强连通分量（显式栈，线性时间）"""
+    index = {}
+    low = {}
+    stack = []
+    on_stack = set()
+    components = []
+    counter = 0
+    
+    for root in adjacency:
+        if root in index:
+            continue
+        index[root] = low[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack.add(root)
+        work = [(root, iter(adjacency[root]))]
+        
+        while work:
+            node, successors = work[-1]
+            for successor in successors:
+                if successor not in index:
+                    index[successor] = low[successor] = counter
+                    counter += 1
+                    stack.append(successor)
+                    on_stack.add(successor)
+                    work.append((successor, iter(adjacency[successor])))
+                    break
+                if successor in on_stack:
+                    low[node] = min(low[node], index[successor])
+            else:
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    low[parent] = min(low[parent], low[node])
+                if low[node] == index[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == node:
+                            break
+                    components.append(component)
+    
+    return components
+
+def find_cycles(adjacency: Dict[str, List[str]]) -> List[List[str]]:
+    """每个包含循环的强连通分量给出一条按连接方向排列的循环路径"""
+    cycles = []
+    for component in strongly_connected_components(adjacency):
+        if len(component) == 1:
+            if component[0] in adjacency[component[0]]:
+                cycles.append(component)
+            continue
+        # 分量内每个节点都有分量内的后继，沿后继前进必然回到路径上的节点
+        members = set(component)
+        path = []
+        position = {}
+        node = component[-1]
+        while node not in position:
+            position[node] = len(path)
+            path.append(node)
+            node = next(successor for successor in adjacency[node] if successor in members)
+        cycles.append(path[position[node]:])
+    return cycles
+
+# 缓存的执行顺序（节点树指针 -> ((节点数, 连接数), 节点名称列表)）
+_execution_order_cache: Dict[int, Tuple[Tuple[int, int], List[str]]] = {}
+
+def clear_execution_order_cache():
+    """清空缓存的执行顺序"""
+    _execution_order_cache.clear()
+
 # 节点树类型
 class N8nNodeTree(NodeTree):
     """n8n节点树"""
@@ -70,39 +155,124 @@ class N8nNodeTree(NodeTree):
         """获取指定类型的所有节点"""
         return [node for node in self.nodes if hasattr(node, 'node_type') and node.node_type == node_type]
     
-    def get_execution_order(self) -> List['N8nNode']:
-        """计算节点执行顺序（拓扑排序）"""
-        # 创建节点依赖图
+    # 当前标记为循环依赖的节点名称（JSON列表）
+    cycle_nodes: StringProperty(
+        name="Cycle Nodes",
+        description="Nodes highlighted as part of a dependency cycle",
+        default="[]"
+    )
+    
+    # 标记前节点自身的颜色设置（JSON字典），取消标记时恢复
+    cycle_saved_colors: StringProperty(
+        name="Cycle Saved Colors",
+        description="Custom color settings of highlighted nodes, restored when they leave the cycle",
+        default="{}"
+    )
+    
+    def update(self):
+        """节点树拓扑变化时清除缓存的执行顺序并标记循环依赖"""
+        _execution_order_cache.pop(self.as_pointer(), None)
+        self.highlight_cycles(self.find_cycles())
+    
+    def build_link_index(self) -> Dict[str, List['N8nNode']]:
+        """遍历一次连接，建立每个节点的上游节点索引（按输入套接字顺序）"""
+        links_by_socket = {}
+        for link in self.links:
+            links_by_socket.setdefault(link.to_socket.as_pointer(), []).append(link.from_node)
+        
         dependencies = {}
         for node in self.nodes:
             if hasattr(node, 'node_type'):
-                dependencies[node] = []
-                
-                # 检查输入连接
+                upstream = []
                 for input_socket in node.inputs:
-                    for link in self.links:
-                        if link.to_socket == input_socket:
-                            dependencies[node].append(link.from_node)
+                    upstream.extend(links_by_socket.get(input_socket.as_pointer(), ()))
+                dependencies[node.name] = [dep for dep in upstream if hasattr(dep, 'node_type')]
+        return dependencies
+    
+    def find_cycles(self) -> List[List[str]]:
+        """查找循环依赖，返回构成每个循环的节点名称（按数据流方向）"""
+        dependencies = self.build_link_index()
+        adjacency = {name: [] for name in dependencies}
+        for name, upstream in dependencies.items():
+            for dependency in upstream:
+                adjacency[dependency.name].append(name)
+        return find_cycles(adjacency)
+    
+    def highlight_cycles(self, cycles: List[List[str]]):
+        """用颜色标记循环中的节点，取消已解除循环的节点的标记并恢复原来的颜色"""
+        current = sorted({name for cycle in cycles for name in cycle})
+        try:
+            previous = set(json.loads(self.cycle_nodes))
+        except ValueError:
+            previous = set()
+        if set(current) == previous:
+            return
+        
+        try:
+            saved_colors = json.loads(self.cycle_saved_colors)
+        except ValueError:
+            saved_colors = {}
+        
+        for name in previous.difference(current):
+            node = self.nodes.get(name)
+            use_custom_color, color = saved_colors.pop(name, (False, None))
+            if node is not None:
+                node.use_custom_color = use_custom_color
+                if color is not None:
+                    node.color = color
+        for name in current:
+            node = self.nodes[name]
+            if name not in saved_colors:
+                saved_colors[name] = (node.use_custom_color, tuple(node.color))
+            node.use_custom_color = True
+            node.color = CYCLE_HIGHLIGHT_COLOR
+        self.cycle_nodes = json.dumps(current)
+        self.cycle_saved_colors = json.dumps(saved_colors)
+    
+    def get_execution_order(self) -> List['N8nNode']:
+        """计算节点执行顺序（拓扑排序），结果缓存到节点树下次更新"""
+        key = self.as_pointer()
+        # 通过脚本修改节点树时update()可能尚未触发，节点或连接数量变化时同样重新计算
+        signature = (len(self.nodes), len(self.links))
+        nodes = {node.name: node for node in self.nodes}
+        cached = _execution_order_cache.get(key)
+        # 节点重命名后缓存的名称失效
+        if cached is None or cached[0] != signature or not all(name in nodes for name in cached[1]):
+            cached = (signature, self._compute_execution_order())
+            _execution_order_cache[key] = cached
         
-        # 拓扑排序
+        return [nodes[name] for name in cached[1]]
+    
+    def _compute_execution_order(self) -> List[str]:
+        """迭代式深度优先拓扑排序，返回节点名称列表"""
+        dependencies = self.build_link_index()
         visited = set()
         temp_visited = set()
         execution_order = []
         
-        def visit(node):
-            if node in temp_visited:
-                raise ValueError("Circular dependency detected in workflow")
-            if node not in visited:
-                temp_visited.add(node)
-                for dependency in dependencies[node]:
-                    visit(dependency)
-                temp_visited.remove(node)
-                visited.add(node)
-                execution_order.append(node)
-        
-        for node in self.nodes:
-            if hasattr(node, 'node_type') and node not in visited:
-                visit(node)
+        for root in self.nodes:
+            if not hasattr(root, 'node_type') or root.name in visited:
+                continue
+            
+            # 用显式栈代替递归，长链不会超过递归深度限制
+            temp_visited.add(root.name)
+            stack = [(root.name, iter(dependencies[root.name]))]
+            while stack:
+                name, pending = stack[-1]
+                for dependency in pending:
+                    if dependency.name in temp_visited:
+                        cycles = self.find_cycles()
+                        self.highlight_cycles(cycles)
+                        raise CycleError(cycles)
+                    if dependency.name not in visited:
+                        temp_visited.add(dependency.name)
+                        stack.append((dependency.name, iter(dependencies[dependency.name])))
+                        break
+                else:
+                    stack.pop()
+                    temp_visited.remove(name)
+                    visited.add(name)
+                    execution_order.append(name)
         
         return execution_order
     
@@ -356,10 +526,6 @@ class N8nNodeBase(Node):
         
         try:
             # 这里应该实现具体的节点执行逻辑
-            # 暂时只模拟执行
-            import time
-            time.sleep(0.5)  # 模拟执行时间
-            
             # 模拟成功执行
             self.execution_state = 'SUCCESS'
             self.execution_result = f"Node {self.node_type} executed successfully"
@@ -130,10 +130,6 @@ def create_node_class(node_type: str, node_data: Dict[str, Any]) -> type:
         
         try:
             # 这里应该实现具体的节点执行逻辑
-            # 暂时只模拟执行
-            import time
-            time.sleep(0.5)  # 模拟执行时间
-            
             # 模拟成功执行
             self.execution_state = 'SUCCESS'
             self.execution_result = f"Node {self.node_type} executed successfully"
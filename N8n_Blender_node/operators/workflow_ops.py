@@ -2,8 +2,10 @@ import bpy
 import time
 import json
 from bpy.types import Operator, Panel
-from bpy.props import StringProperty, BoolProperty, EnumProperty
+from bpy.props import StringProperty, BoolProperty, EnumProperty, FloatProperty, IntProperty
 from ..nodes.n8n_node_base import N8nNodeTree
+from ..utils.layout import (auto_layout, needs_layout, DEFAULT_SPACING_X, DEFAULT_SPACING_Y,
+                            DEFAULT_ITERATIONS)
 
 # Optional import with fallback
 try:
@@ -328,6 +330,10 @@ class N8N_OT_import_workflow(Operator):
             # 反序列化工作流
             node_tree.deserialize_workflow(workflow_data)
             
+            # 导入的工作流没有位置信息时自动布局
+            if needs_layout(node_tree):
+                auto_layout(node_tree)
+            
             # 切换到节点编辑器并显示新工作流
             if context.area.type != 'NODE_EDITOR':
                 context.area.type = 'NODE_EDITOR'
@@ -347,6 +353,50 @@ class N8N_OT_import_workflow(Operator):
         context.window_manager.fileselect_add(self)
         return {'RUNNING_MODAL'}
 
+# 自动布局操作
+class N8N_OT_auto_layout(Operator):
+    """自动布局n8n工作流"""
+    bl_idname = "n8n.auto_layout"
+    bl_label = "Auto Layout"
+    bl_description = "Arrange the nodes of the current workflow in layers from left to right"
+    bl_options = {'REGISTER', 'UNDO'}
+    
+    spacing_x: FloatProperty(
+        name="Horizontal Spacing",
+        description="Gap between node columns",
+        default=DEFAULT_SPACING_X,
+        min=0.0
+    )
+    
+    spacing_y: FloatProperty(
+        name="Vertical Spacing",
+        description="Gap between nodes in a column",
+        default=DEFAULT_SPACING_Y,
+        min=0.0
+    )
+    
+    iterations: IntProperty(
+        name="Iterations",
+        description="Number of crossing reduction passes",
+        default=DEFAULT_ITERATIONS,
+        min=0,
+        max=50
+    )
+    
+    def execute(self, context):
+        # 获取当前节点树
+        node_tree = context.space_data.node_tree
+        
+        if not node_tree or not isinstance(node_tree, N8nNodeTree):
+            self.report({'ERROR'}, "No n8n workflow found")
+            return {'CANCELLED'}
+        
+        start_time = time.perf_counter()
+        count = auto_layout(node_tree, self.spacing_x, self.spacing_y, self.iterations)
+        self.report({'INFO'}, f"Arranged {count} nodes in {time.perf_counter() - start_time:.2f}s")
+        
+        return {'FINISHED'}
+
 # 注册操作类
 classes = [
     N8N_OT_execute_workflow,
@@ -357,6 +407,7 @@ classes = [
     N8N_OT_delete_workflow,
     N8N_OT_export_workflow,
     N8N_OT_import_workflow,
+    N8N_OT_auto_layout,
 ]
 
 def register():
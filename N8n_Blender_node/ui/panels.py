@@ -115,6 +115,7 @@ class N8N_PT_workflow_panel(Panel):
         row = exec_box.row(align=True)
         row.operator("n8n.execute_workflow", icon='PLAY')
         row.operator("n8n.reset_workflow", icon='FILE_REFRESH')
+        row.operator("n8n.auto_layout", icon='NODETREE')
         
         layout.separator()
         
@@ -2,6 +2,9 @@ import bpy
 
 from .config import __addon_name__
 from .i18n.dictionary import dictionary
+from .logs import get_log_sink
+from .execution import register_cache_handlers, unregister_cache_handlers
+from .manager import register_validation_handlers, unregister_validation_handlers
 from ...common.class_loader import auto_load
 from ...common.class_loader.auto_load import add_properties, remove_properties
 from ...common.i18n.dictionary import common_dictionary
@@ -21,7 +24,21 @@ bl_info = {
     "category": "Node"
 }
 
-_addon_properties = {}
+_addon_properties = {
+    bpy.types.WindowManager: {
+        "n8n_log_page": bpy.props.IntProperty(name="Log Page", min=0, default=0),
+        "n8n_log_level": bpy.props.EnumProperty(
+            name="Log Level",
+            items=[
+                ("DEBUG", "Debug", "Show all log entries"),
+                ("INFO", "Info", "Show info, warning and error entries"),
+                ("WARNING", "Warning", "Show warning and error entries"),
+                ("ERROR", "Error", "Show error entries only"),
+            ],
+            default="DEBUG",
+        ),
+    },
+}
 
 
 # You may declare properties like following, framework will automatically add and remove them.
@@ -38,6 +55,14 @@ def register():
     auto_load.init()
     auto_load.register()
     add_properties(_addon_properties)
+    register_cache_handlers()
+    register_validation_handlers()
+
+    # 应用保存的HTTP限速、连接池和缓存设置
+    addon = bpy.context.preferences.addons.get(__addon_name__)
+    if addon is not None and hasattr(addon.preferences, "apply_rate_limits"):
+        addon.preferences.apply_rate_limits()
+        addon.preferences.apply_http_settings()
 
     # Internationalization
     load_dictionary(dictionary)
@@ -52,4 +77,8 @@ def unregister():
     # unRegister classes
     auto_load.unregister()
     remove_properties(_addon_properties)
+    unregister_cache_handlers()
+    unregister_validation_handlers()
+    # 写入剩余的日志
+    get_log_sink().close()
     print("{} addon is uninstalled.".format(__addon_name__))
@@ -1,2 +1,11 @@
 from .n8n_executor import N8nExecutor
 from .n8n_workflow import N8nWorkflow
+from .n8n_handlers import node_handlers, register_handler
+from .n8n_expression import compile_expression, CompiledExpression, ExpressionError
+from .n8n_path import compile_path, CompiledPath, PathError
+from .n8n_template import compile_template, CompiledTemplate, resolve_column
+from .n8n_timings import NodeTimingHistory, get_node_timings, upward_ranks
+from .n8n_subworkflow import (compile_workflow, ExecutionPlan, clear_plan_cache, register_cache_handlers,
+                              unregister_cache_handlers)
+from .n8n_optimizer import (optimize_plan, get_optimized_plan, OptimizationReport, PassResult, clear_fold_cache,
+                            clear_optimized_plans)
@@ -1,25 +1,124 @@
 import bpy
 import time
 import asyncio
-from typing import Dict, Any, List
+import contextlib
+import copy
+import heapq
+import itertools
+import os
+import reprlib
+from typing import Dict, Any, List, Optional, Set, Tuple, Iterator
 from ..nodes.n8n_node_tree import N8nNodeTree
 from ..nodes.n8n_node_base import N8nNodeBase
+from .n8n_handlers import get_node_handler, is_branching_node, is_empty_output, is_loop_node, iter_items
+from .n8n_timings import get_node_timings, upward_ranks
+from .n8n_subworkflow import compile_workflow
+from .n8n_optimizer import OptimizationReport, get_optimized_plan
+from ..logs import get_log_sink
+
+# 循环节点的套接字名称
+LOOP_ITEMS_INPUT = "items"
+LOOP_BATCH_OUTPUT = "batch"
+LOOP_DONE_OUTPUT = "done"
+
+# 节点结果预览，避免把完整输出转换为字符串
+_result_preview = reprlib.Repr()
+_result_preview.maxstring = 120
+_result_preview.maxother = 120
+_result_preview.maxlist = 10
+_result_preview.maxdict = 10
+
+# 同时在线程池中执行的节点数，与asyncio默认线程池的大小一致
+_DISPATCH_LIMIT = min(32, (os.cpu_count() or 1) + 4)
+
+
+class _PriorityGate:
+    """
+    按优先级分配执行名额：名额用完时，等待中优先级最高的节点最先获得释放的名额
+    """
+    
+    def __init__(self, limit: int):
+        self.limit = limit
+        self._active = 0
+        self._waiting: List[Tuple[float, int, asyncio.Future]] = []
+        self._counter = itertools.count()
+    
+    async def acquire(self, priority: float) -> None:
+        if self._active < self.limit and not self._waiting:
+            self._active += 1
+            return
+        future = asyncio.get_event_loop().create_future()
+        heapq.heappush(self._waiting, (-priority, next(self._counter), future))
+        try:
+            await future
+        except asyncio.CancelledError:
+            # 名额已经转交给被取消的任务时归还
+            if future.done() and not future.cancelled():
+                self.release()
+            raise
+    
+    def release(self) -> None:
+        # 名额直接转交给优先级最高的等待者
+        while self._waiting:
+            _, _, future = heapq.heappop(self._waiting)
+            if not future.done():
+                future.set_result(None)
+                return
+        self._active -= 1
+    
+    @contextlib.asynccontextmanager
+    async def slot(self, priority: float):
+        await self.acquire(priority)
+        try:
+            yield
+        finally:
+            self.release()
+
 
 class N8nExecutor:
     """
 n8n工作流执行器，负责执行工作流中的节点
     """
     
-    def __init__(self, node_tree: N8nNodeTree):
+    def __init__(self, node_tree: N8nNodeTree, retain_results: bool = False, optimize: bool = True):
         """
         初始化执行器
         
         参数:
             node_tree: 要执行的节点树
+            retain_results: 是否保留所有中间结果（调试用），默认在最后一个消费者读取后释放
+            optimize: 是否在执行前优化执行计划（删除传递节点和死节点、常量折叠）
         """
         self.node_tree = node_tree
+        # 展开子工作流并优化后的执行计划，没有子工作流且没有可优化的节点时为节点树本身
+        self.plan = node_tree
+        self.optimize = optimize
+        # 最近一次执行的优化报告
+        self.optimization_report: Optional[OptimizationReport] = None
         self.execution_results: Dict[str, Any] = {}
         self.is_running = False
+        self.retain_results = retain_results
+        # 固定的节点结果不会被释放（用于界面查看或缓存）
+        self.pinned_results: Set[str] = set()
+        # 每个节点输出的剩余消费者数量
+        self._remaining_consumers: Dict[str, int] = {}
+        # 因分支未触发而跳过的节点
+        self.skipped_nodes: Set[str] = set()
+        # 分支节点未产生数据的输出 (节点名称, 套接字标识符)
+        self._inactive_outputs: Set[Tuple[str, str]] = set()
+        # 每个节点输出的消费者总数，循环每次迭代时据此重置计数
+        self._consumer_totals: Dict[str, int] = {}
+        # 每个节点的输出连接
+        self._out_links: Dict[str, List[Any]] = {}
+        # 每个节点依赖的上游节点（不含循环回边）
+        self._producers: Dict[str, Set[str]] = {}
+        # 循环节点的循环体（按执行顺序排列）
+        self._loop_bodies: Dict[str, List[N8nNodeBase]] = {}
+        # 节点所属的最内层循环节点名称
+        self._loop_owner: Dict[str, str] = {}
+        # 节点的调度优先级（按历史耗时加权的到结束的最长路径），就绪节点按优先级从高到低分配线程
+        self._priorities: Dict[str, float] = {}
+        self._dispatch_gate = _PriorityGate(_DISPATCH_LIMIT)
     
     def execute(self) -> bool:
         """
@@ -30,19 +129,20 @@ n8n工作流执行器，负责执行工作流中的节点
         """
         try:
             self._pre_execute()
-            execution_order = self.node_tree.calculate_execution_order()
+            execution_order = self.plan.calculate_execution_order()
+            self._prepare_loops(execution_order)
             
             # 执行每个节点
-            for node in execution_order:
-                if not self._execute_node(node):
-                    self.node_tree.workflow_state = "ERROR"
-                    return False
+            if not self._run_sequence(execution_order):
+                self.node_tree.workflow_state = "ERROR"
+                return False
             
             self.node_tree.workflow_state = "SUCCESS"
+            get_log_sink().info(f"Workflow finished in {time.time() - self.start_time:.3f}s", self.node_tree.name)
             return True
         except Exception as e:
             self.node_tree.workflow_state = "ERROR"
-            print(f"Workflow execution failed: {e}")
+            get_log_sink().error(f"Workflow execution failed: {e}", self.node_tree.name)
             return False
         finally:
             self.is_running = False
@@ -56,33 +156,404 @@ n8n工作流执行器，负责执行工作流中的节点
         """
         try:
             self._pre_execute()
-            execution_order = self.node_tree.calculate_execution_order()
+            execution_order = self.plan.calculate_execution_order()
+            self._prepare_loops(execution_order)
+            self._prepare_priorities(execution_order)
             
             # 异步执行每个节点
-            for node in execution_order:
-                if not await self._execute_node_async(node):
-                    self.node_tree.workflow_state = "ERROR"
-                    return False
+            if not await self._run_sequence_async(execution_order):
+                self.node_tree.workflow_state = "ERROR"
+                return False
             
             self.node_tree.workflow_state = "SUCCESS"
+            get_log_sink().info(f"Workflow finished in {time.time() - self.start_time:.3f}s", self.node_tree.name)
             return True
+        except asyncio.CancelledError:
+            self._cancel_running_nodes()
+            get_log_sink().warning("Workflow execution cancelled", self.node_tree.name)
+            raise
         except Exception as e:
             self.node_tree.workflow_state = "ERROR"
-            print(f"Workflow execution failed: {e}")
+            get_log_sink().error(f"Workflow execution failed: {e}", self.node_tree.name)
             return False
         finally:
             self.is_running = False
     
+    def _cancel_running_nodes(self) -> None:
+        """
+        执行被取消时，把仍处于运行状态的节点重置为空闲并注明已取消
+        """
+        for node in itertools.chain(self.plan.nodes, self.node_tree.nodes):
+            if getattr(node, "execution_state", None) == "RUNNING":
+                node.reset()
+                node.execution_result = "Cancelled"
+        self.node_tree.workflow_state = "IDLE"
+    
     def _pre_execute(self) -> None:
         """
         执行前准备
         """
         self.is_running = True
         self.node_tree.workflow_state = "RUNNING"
-        self.node_tree.reset_all_nodes()
+        compiled = compile_workflow(self.node_tree)
+        self.plan = compiled
+        if self.optimize:
+            self.plan, self.optimization_report = get_optimized_plan(self.node_tree, compiled, keep=self.pinned_results)
+        self.plan.reset_all_nodes()
+        self._report_optimization(compiled)
         self.execution_results.clear()
+        self.skipped_nodes.clear()
+        self._inactive_outputs.clear()
+        self._count_consumers()
         self.start_time = time.time()
     
+    def _report_optimization(self, compiled: Any) -> None:
+        """
+        把优化报告写入日志，并把被删除的节点标记为跳过
+        
+        参数:
+            compiled: 优化前的执行计划
+        """
+        report = self.optimization_report
+        if not self.optimize or report is None or not report.changed:
+            return
+        log_sink = get_log_sink()
+        for line in report.format():
+            log_sink.info(f"Optimizer {line}", self.node_tree.name)
+        for name, pass_name in report.removed_nodes().items():
+            node = compiled.nodes.get(name)
+            if node is not None:
+                node.execution_state = "SKIPPED"
+                node.execution_result = f"Removed by {pass_name}"
+    
+    def _count_consumers(self) -> None:
+        """
+        根据连接图统计每个节点输出的消费者数量，并建立输出连接索引
+        """
+        self._consumer_totals.clear()
+        self._out_links.clear()
+        self._producers.clear()
+        for link in self.plan.links:
+            producer = link.from_node.name
+            self._consumer_totals[producer] = self._consumer_totals.get(producer, 0) + 1
+            self._out_links.setdefault(producer, []).append(link)
+            if not getattr(link.to_socket, "is_loop_back", False):
+                self._producers.setdefault(link.to_node.name, set()).add(producer)
+        self._remaining_consumers.clear()
+        self._remaining_consumers.update(self._consumer_totals)
+    
+    def _prepare_priorities(self, execution_order: List[N8nNodeBase]) -> None:
+        """
+        根据历史耗时中位数计算每个节点的向上秩（HEFT），作为就绪节点的调度优先级
+        
+        参数:
+            execution_order: 节点执行顺序
+        """
+        successors = {
+            name: [link.to_node.name for link in links if not getattr(link.to_socket, "is_loop_back", False)]
+            for name, links in self._out_links.items()
+        }
+        durations = get_node_timings().estimate(self.node_tree.name, execution_order)
+        self._priorities = upward_ranks(execution_order, successors, durations)
+    
+    def _record_duration(self, node: N8nNodeBase, seconds: float) -> None:
+        """
+        记录节点执行耗时，供之后的调度估计使用
+        """
+        get_node_timings().record(self.node_tree.name, node.name, getattr(node, "blueprint_id", ""), seconds)
+    
+    def _prepare_loops(self, execution_order: List[N8nNodeBase]) -> None:
+        """
+        确定每个循环节点的循环体
+        
+        循环体是从循环节点batch输出可达、且不经过done输出可达的节点，
+        回边（连接到循环节点回环输入的连接）不参与遍历
+        
+        参数:
+            execution_order: 节点执行顺序
+        """
+        self._loop_bodies.clear()
+        self._loop_owner.clear()
+        
+        for loop_node in execution_order:
+            if not is_loop_node(loop_node):
+                continue
+            
+            reachable = {
+                socket_name: self._reachable_from(loop_node, socket_name)
+                for socket_name in (LOOP_BATCH_OUTPUT, LOOP_DONE_OUTPUT)
+            }
+            members = reachable[LOOP_BATCH_OUTPUT] - reachable[LOOP_DONE_OUTPUT]
+            members.discard(loop_node.name)
+            self._loop_bodies[loop_node.name] = [node for node in execution_order if node.name in members]
+        
+        # 嵌套循环中节点归属于循环体最小的循环
+        for loop_name, body in sorted(self._loop_bodies.items(), key=lambda entry: -len(entry[1])):
+            for node in body:
+                self._loop_owner[node.name] = loop_name
+    
+    def _reachable_from(self, node: N8nNodeBase, socket_name: str) -> Set[str]:
+        """
+        获取从节点某个输出出发可达的节点名称（不经过回边）
+        
+        参数:
+            node: 起始节点
+            socket_name: 起始输出套接字名称
+            
+        返回:
+            可达节点名称集合
+        """
+        reachable = set()
+        stack = [link for link in self._out_links.get(node.name, []) if link.from_socket.name == socket_name]
+        while stack:
+            link = stack.pop()
+            if getattr(link.to_socket, "is_loop_back", False):
+                continue
+            to_name = link.to_node.name
+            if to_name in reachable:
+                continue
+            reachable.add(to_name)
+            stack.extend(self._out_links.get(to_name, []))
+        return reachable
+    
+    def _run_sequence(self, nodes: List[N8nNodeBase], owner: str = "") -> bool:
+        """
+        按顺序执行节点，循环体内的节点由所属循环节点负责执行
+        
+        参数:
+            nodes: 按执行顺序排列的节点
+            owner: 当前所执行的循环节点名称，顶层为空
+            
+        返回:
+            执行成功返回True，失败返回False
+        """
+        for node in nodes:
+            if self._loop_owner.get(node.name, "") != owner:
+                continue
+            if is_loop_node(node):
+                if not self._execute_loop(node):
+                    return False
+            elif not self._execute_node(node):
+                return False
+        return True
+    
+    async def _run_sequence_async(self, nodes: List[N8nNodeBase], owner: str = "") -> bool:
+        """
+        异步执行节点，循环体内的节点由所属循环节点负责执行
+        
+        每个节点在其上游节点完成后立即开始，互不依赖的节点并发执行。
+        等待类节点在事件循环上挂起，不占用线程
+        
+        参数:
+            nodes: 按执行顺序排列的节点
+            owner: 当前所执行的循环节点名称，顶层为空
+            
+        返回:
+            执行成功返回True，失败返回False
+        """
+        tasks: Dict[str, asyncio.Future] = {}
+        failed = False
+        
+        async def run(node: N8nNodeBase, dependencies: List[asyncio.Future]) -> bool:
+            nonlocal failed
+            if dependencies and not all(await asyncio.gather(*dependencies)):
+                return False
+            # 任一节点失败后不再开始新的节点
+            if failed:
+                return False
+            if is_loop_node(node):
+                success = await self._execute_loop_async(node)
+            else:
+                success = await self._execute_node_async(node)
+            if not success:
+                failed = True
+            return success
+        
+        # 节点按拓扑顺序排列，创建任务时上游任务已经存在
+        for node in nodes:
+            if self._loop_owner.get(node.name, "") != owner:
+                continue
+            dependencies = [tasks[name] for name in self._producers.get(node.name, ()) if name in tasks]
+            tasks[node.name] = asyncio.ensure_future(run(node, dependencies))
+        
+        results = await asyncio.gather(*tasks.values())
+        return all(results)
+    
+    def _execute_loop(self, node: N8nNodeBase) -> bool:
+        """
+        执行循环节点：分批把数据送入循环体执行
+        
+        参数:
+            node: 循环节点
+            
+        返回:
+            执行成功返回True，失败返回False
+        """
+        try:
+            for _ in self._loop_iterations(node):
+                if not self._run_sequence(self._loop_bodies[node.name], node.name):
+                    node.execution_state = "ERROR"
+                    return False
+            return True
+        except Exception as e:
+            node.execution_state = "ERROR"
+            node.error_message = str(e)
+            get_log_sink().error(f"Node execution failed: {e}", node.name)
+            return False
+    
+    async def _execute_loop_async(self, node: N8nNodeBase) -> bool:
+        """
+        异步执行循环节点：分批把数据送入循环体执行
+        
+        参数:
+            node: 循环节点
+            
+        返回:
+            执行成功返回True，失败返回False
+        """
+        try:
+            for _ in self._loop_iterations(node):
+                if not await self._run_sequence_async(self._loop_bodies[node.name], node.name):
+                    node.execution_state = "ERROR"
+                    return False
+            return True
+        except Exception as e:
+            node.execution_state = "ERROR"
+            node.error_message = str(e)
+            get_log_sink().error(f"Node execution failed: {e}", node.name)
+            return False
+    
+    def _loop_iterations(self, node: N8nNodeBase) -> Iterator[List[Any]]:
+        """
+        循环迭代器：每次产出前把一批数据放到循环节点的batch输出上，
+        恢复后从回边读取循环体的结果并按设置累积或丢弃
+        
+        输入数据按需分批读取，流式输入不会被整体载入内存
+        
+        参数:
+            node: 循环节点
+            
+        返回:
+            每批数据的迭代器
+        """
+        body = self._loop_bodies[node.name]
+        if self._should_skip(node):
+            self._skip_node(node)
+            for body_node in body:
+                self._skip_node(body_node)
+            return
+        
+        node.execution_state = "RUNNING"
+        input_data = self._collect_input_data(node)
+        items = iter(iter_items(input_data.get(LOOP_ITEMS_INPUT)))
+        batch_size = max(1, int(node.get_parameter("batch_size", 100)))
+        accumulate = bool(node.get_parameter("accumulate", True))
+        back_links = [
+            link
+            for socket in node.inputs if getattr(socket, "is_loop_back", False)
+            for link in socket.links
+        ]
+        
+        accumulated = []
+        processed = 0
+        while True:
+            batch = list(itertools.islice(items, batch_size))
+            if not batch:
+                break
+            processed += len(batch)
+            
+            # 重置本次迭代的状态，上一批的结果在本批读取后即可释放
+            self._reset_loop_iteration(node, body)
+            self.execution_results[node.name] = {LOOP_BATCH_OUTPUT: batch}
+            yield batch
+            
+            # 从回边读取本批结果
+            for link in back_links:
+                from_name = link.from_node.name
+                if from_name in self.execution_results and self._is_link_active(link):
+                    value = self._get_output_value(link.from_node, self.execution_results[from_name], link.from_socket)
+                    if accumulate:
+                        accumulated.extend(iter_items(value))
+                    elif isinstance(value, Iterator):
+                        # 丢弃模式下也要消费流式结果，保证循环体的处理真正执行
+                        for _ in value:
+                            pass
+                self._release_result(from_name)
+        
+        # 没有任何数据时循环体不执行
+        if processed == 0:
+            for body_node in body:
+                self._skip_node(body_node)
+        
+        # 循环结束，done输出的消费者读取最终结果
+        self._remaining_consumers[node.name] = sum(
+            1 for link in self._out_links.get(node.name, []) if link.from_socket.name != LOOP_BATCH_OUTPUT
+        )
+        output_data = {LOOP_DONE_OUTPUT: accumulated, "processed": processed}
+        self.execution_results[node.name] = output_data
+        node.execution_state = "SUCCESS"
+        node.execution_result = _result_preview.repr(output_data)
+    
+    def _reset_loop_iteration(self, node: N8nNodeBase, body: List[N8nNodeBase]) -> None:
+        """
+        重置循环体在新一次迭代前的状态
+        
+        参数:
+            node: 循环节点
+            body: 循环体节点
+        """
+        self._remaining_consumers[node.name] = self._consumer_totals.get(node.name, 0)
+        for body_node in body:
+            self._remaining_consumers[body_node.name] = self._consumer_totals.get(body_node.name, 0)
+            self.skipped_nodes.discard(body_node.name)
+            for socket in body_node.outputs:
+                self._inactive_outputs.discard((body_node.name, socket.identifier))
+    
+    def _is_pinned(self, node_name: str) -> bool:
+        """
+        检查节点结果是否被固定
+        
+        参数:
+            node_name: 节点名称
+            
+        返回:
+            结果需要保留返回True，否则返回False
+        """
+        if self.retain_results or node_name in self.pinned_results:
+            return True
+        node = self.plan.nodes.get(node_name)
+        return bool(getattr(node, "pin_result", False))
+    
+    def _release_result(self, node_name: str) -> None:
+        """
+        消费者读取结果后减少计数，最后一个消费者读取后释放结果
+        
+        参数:
+            node_name: 生产者节点名称
+        """
+        remaining = self._remaining_consumers.get(node_name, 0) - 1
+        self._remaining_consumers[node_name] = remaining
+        if remaining <= 0 and not self._is_pinned(node_name):
+            self.execution_results.pop(node_name, None)
+    
+    def pin_result(self, node_name: str) -> None:
+        """
+        固定节点结果，使其在执行期间不被释放
+        
+        参数:
+            node_name: 节点名称
+        """
+        self.pinned_results.add(node_name)
+    
+    def unpin_result(self, node_name: str) -> None:
+        """
+        取消固定节点结果
+        
+        参数:
+            node_name: 节点名称
+        """
+        self.pinned_results.discard(node_name)
+    
     def _execute_node(self, node: N8nNodeBase) -> bool:
         """
         执行单个节点
@@ -94,6 +565,11 @@ n8n工作流执行器，负责执行工作流中的节点
             执行成功返回True，失败返回False
         """
         try:
+            # 所依赖的分支都没有触发时跳过节点
+            if self._should_skip(node):
+                self._skip_node(node)
+                return True
+            
             # 设置节点状态为运行中
             node.execution_state = "RUNNING"
             
@@ -101,21 +577,19 @@ n8n工作流执行器，负责执行工作流中的节点
             input_data = self._collect_input_data(node)
             
             # 执行节点
-            output_data = node.execute(input_data)
+            started = time.perf_counter()
+            output_data = self._invoke_node(node, input_data)
+            self._record_duration(node, time.perf_counter() - started)
             
             # 保存执行结果
-            self.execution_results[node.name] = output_data
-            
-            # 设置节点状态为成功
-            node.execution_state = "SUCCESS"
-            node.execution_result = str(output_data) if output_data else "Success"
+            self._store_result(node, output_data)
             
             return True
         except Exception as e:
             # 设置节点状态为错误
             node.execution_state = "ERROR"
             node.error_message = str(e)
-            print(f"Node {node.name} execution failed: {e}")
+            get_log_sink().error(f"Node execution failed: {e}", node.name)
             return False
     
     async def _execute_node_async(self, node: N8nNodeBase) -> bool:
@@ -129,35 +603,173 @@ n8n工作流执行器，负责执行工作流中的节点
             执行成功返回True，失败返回False
         """
         try:
+            # 所依赖的分支都没有触发时跳过节点
+            if self._should_skip(node):
+                self._skip_node(node)
+                return True
+            
             # 设置节点状态为运行中
             node.execution_state = "RUNNING"
             
             # 收集输入数据
             input_data = self._collect_input_data(node)
             
-            # 异步执行节点
-            loop = asyncio.get_event_loop()
-            output_data = await loop.run_in_executor(None, node.execute, input_data)
+            # 异步执行节点，协程处理器直接在事件循环上等待，其他处理器在线程池中执行
+            # 线程名额不足时按优先级排队，关键路径上的节点先执行
+            handler = get_node_handler(node)
+            if asyncio.iscoroutinefunction(handler) and not getattr(node, "is_folded", False):
+                started = time.perf_counter()
+                output_data = await handler(node, input_data)
+            else:
+                loop = asyncio.get_event_loop()
+                async with self._dispatch_gate.slot(self._priorities.get(node.name, 0.0)):
+                    started = time.perf_counter()
+                    output_data = await loop.run_in_executor(None, self._invoke_node, node, input_data)
+            self._record_duration(node, time.perf_counter() - started)
             
             # 保存执行结果
-            self.execution_results[node.name] = output_data
-            
-            # 设置节点状态为成功
-            node.execution_state = "SUCCESS"
-            node.execution_result = str(output_data) if output_data else "Success"
+            self._store_result(node, output_data)
             
             return True
         except Exception as e:
             # 设置节点状态为错误
             node.execution_state = "ERROR"
             node.error_message = str(e)
-            print(f"Node {node.name} execution failed: {e}")
+            get_log_sink().error(f"Node execution failed: {e}", node.name)
             return False
     
+    def _invoke_node(self, node: N8nNodeBase, input_data: Dict[str, Any]) -> Any:
+        """
+        调用节点逻辑，优先使用蓝图注册的处理器
+        
+        参数:
+            node: 要执行的节点
+            input_data: 输入数据字典
+            
+        返回:
+            输出数据
+        """
+        if getattr(node, "is_folded", False):
+            # 常量折叠的结果在多次执行间共享，复制后交给下游
+            return copy.deepcopy(node.folded_output)
+        handler = get_node_handler(node)
+        if handler is None:
+            return node.execute(input_data)
+        if asyncio.iscoroutinefunction(handler):
+            # 同步执行时在临时事件循环中运行协程处理器
+            return asyncio.run(handler(node, input_data))
+        return handler(node, input_data)
+    
+    def _store_result(self, node: N8nNodeBase, output_data: Any) -> None:
+        """
+        保存节点执行结果并更新节点状态
+        
+        参数:
+            node: 已执行的节点
+            output_data: 输出数据
+        """
+        # 流式输出（迭代器）只能读取一次，有多个消费者时先物化为列表
+        if isinstance(output_data, dict):
+            for socket in node.outputs:
+                value = self._get_output_value(node, output_data, socket)
+                if isinstance(value, Iterator) and len(socket.links) > 1:
+                    key = socket.name if socket.name in output_data else list(node.outputs).index(socket)
+                    output_data[key] = list(value)
+        elif isinstance(output_data, Iterator) and sum(len(socket.links) for socket in node.outputs) > 1:
+            output_data = list(output_data)
+        
+        self.execution_results[node.name] = output_data
+        
+        # 记录分支节点中未产生数据的输出
+        if is_branching_node(node):
+            for socket in node.outputs:
+                if is_empty_output(self._get_output_value(node, output_data, socket)):
+                    self._inactive_outputs.add((node.name, socket.identifier))
+        
+        # 设置节点状态为成功
+        node.execution_state = "SUCCESS"
+        node.execution_result = _result_preview.repr(output_data) if output_data else "Success"
+    
+    def _is_link_active(self, link: Any) -> bool:
+        """
+        检查连接的源输出是否产生了数据
+        
+        参数:
+            link: 节点连接
+            
+        返回:
+            源输出有效返回True，源节点被跳过或分支未触发返回False
+        """
+        from_name = link.from_node.name
+        if from_name in self.skipped_nodes:
+            return False
+        return (from_name, link.from_socket.identifier) not in self._inactive_outputs
+    
+    def _should_skip(self, node: N8nNodeBase) -> bool:
+        """
+        检查节点是否只依赖于未触发的分支
+        
+        参数:
+            node: 要检查的节点
+            
+        返回:
+            所有输入连接都来自未触发的分支返回True，否则返回False
+        """
+        links = [
+            link
+            for socket in node.inputs if not getattr(socket, "is_loop_back", False)
+            for link in socket.links
+        ]
+        if not links:
+            return False
+        return not any(self._is_link_active(link) for link in links)
+    
+    def _skip_node(self, node: N8nNodeBase) -> None:
+        """
+        跳过节点，其所有输出视为未触发
+        
+        参数:
+            node: 要跳过的节点
+        """
+        self.skipped_nodes.add(node.name)
+        for socket in node.inputs:
+            for link in socket.links:
+                self._release_result(link.from_node.name)
+        node.execution_state = "SKIPPED"
+        node.execution_result = ""
+    
+    @staticmethod
+    def _get_output_value(node: Any, results: Any, socket: Any) -> Any:
+        """
+        从节点结果中获取输出套接字对应的数据
+        
+        结果字典优先按套接字名称查找，同名输出（如n8n的If节点）按输出序号查找
+        
+        参数:
+            node: 源节点
+            results: 源节点执行结果
+            socket: 输出套接字
+            
+        返回:
+            输出数据
+        """
+        if not isinstance(results, dict):
+            # 如果结果不是字典，直接使用整个结果
+            return results
+        if socket.name in results:
+            return results[socket.name]
+        for index, output in enumerate(node.outputs):
+            if output == socket:
+                return results.get(index, None)
+        return None
+    
     def _collect_input_data(self, node: N8nNodeBase) -> Dict[str, Any]:
         """
         收集节点的输入数据
         
+        多连接输入套接字的数据为列表，按连接顺序每个连接一项；
+        同名输入套接字（如n8n的Merge节点）从第二个起按输入序号存放
+        
         参数:
             node: 要收集输入数据的节点
             
@@ -165,29 +777,39 @@ n8n工作流执行器，负责执行工作流中的节点
             输入数据字典
         """
         input_data = {}
+        seen_names = set()
         
         # 遍历所有输入套接字
-        for socket in node.inputs:
+        for index, socket in enumerate(node.inputs):
+            key = index if socket.name in seen_names else socket.name
+            seen_names.add(socket.name)
+            
+            # 回环输入由循环节点在每次迭代后读取
+            if getattr(socket, "is_loop_back", False):
+                continue
+            
             # 检查是否有连接
             if socket.is_linked:
-                # 获取连接的源节点和套接字
-                link = socket.links[0]
-                from_node = link.from_node
-                from_socket = link.from_socket
+                values = []
+                for link in socket.links:
+                    from_node = link.from_node
+                    
+                    # 从源节点的执行结果中获取数据（未触发的分支不提供数据）
+                    if from_node.name in self.execution_results and self._is_link_active(link):
+                        from_results = self.execution_results[from_node.name]
+                        values.append(self._get_output_value(from_node, from_results, link.from_socket))
+                    
+                    # 读取完成，最后一个消费者读取后释放源节点结果
+                    self._release_result(from_node.name)
                 
-                # 从源节点的执行结果中获取数据
-                if from_node.name in self.execution_results:
-                    from_results = self.execution_results[from_node.name]
-                    # 尝试从源节点结果中获取对应套接字的数据
-                    if isinstance(from_results, dict):
-                        input_data[socket.name] = from_results.get(from_socket.name, None)
-                    else:
-                        # 如果结果不是字典，直接使用整个结果
-                        input_data[socket.name] = from_results
+                if getattr(socket, "link_limit", 1) > 1:
+                    input_data[key] = values
+                elif values:
+                    input_data[key] = values[0]
             else:
                 # 没有连接，检查是否使用默认值
                 if hasattr(socket, "use_default_value") and socket.use_default_value:
-                    input_data[socket.name] = socket.get_value()
+                    input_data[key] = socket.get_value()
         
         return input_data
     
@@ -195,11 +817,13 @@ n8n工作流执行器，负责执行工作流中的节点
         """
         获取节点执行结果
         
+        中间结果在所有消费者读取后会被释放，需要查看的节点应先固定结果
+        
         参数:
             node_name: 节点名称
             
         返回:
-            节点执行结果
+            节点执行结果，如果不存在或已释放返回None
         """
         return self.execution_results.get(node_name, None)
     
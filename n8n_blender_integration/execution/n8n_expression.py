@@ -0,0 +1,303 @@
+import ast
+import hashlib
+import itertools
+from collections import OrderedDict
+from typing import Dict, Any, Iterable, Iterator, List, Tuple
+
+# 表达式中可以使用的函数
+SAFE_FUNCTIONS: Dict[str, Any] = {
+    "abs": abs,
+    "all": all,
+    "any": any,
+    "bool": bool,
+    "dict": dict,
+    "enumerate": enumerate,
+    "float": float,
+    "int": int,
+    "len": len,
+    "list": list,
+    "max": max,
+    "min": min,
+    "range": range,
+    "reversed": reversed,
+    "round": round,
+    "set": set,
+    "sorted": sorted,
+    "str": str,
+    "sum": sum,
+    "tuple": tuple,
+    "zip": zip,
+}
+
+# 兼容n8n/JSON写法的常量
+SAFE_CONSTANTS: Dict[str, Any] = {
+    "true": True,
+    "false": False,
+    "null": None,
+}
+
+# 每个数据项可用的变量名，都指向当前数据项
+ITEM_VARIABLES: Tuple[str, ...] = ("data", "item", "json")
+
+# 允许的语法节点
+_ALLOWED_NODES = (
+    ast.Expression, ast.Constant, ast.Name, ast.Load, ast.Store,
+    ast.BoolOp, ast.BinOp, ast.UnaryOp, ast.IfExp, ast.Compare, ast.Call, ast.keyword,
+    ast.Attribute, ast.Subscript, ast.Slice,
+    ast.List, ast.Tuple, ast.Dict, ast.Set,
+    ast.ListComp, ast.SetComp, ast.DictComp, ast.GeneratorExp, ast.comprehension,
+    ast.JoinedStr, ast.FormattedValue,
+    ast.And, ast.Or,
+    ast.Add, ast.Sub, ast.Mult, ast.Div, ast.FloorDiv, ast.Mod, ast.Pow,
+    ast.USub, ast.UAdd, ast.Not,
+    ast.Eq, ast.NotEq, ast.Lt, ast.LtE, ast.Gt, ast.GtE, ast.In, ast.NotIn, ast.Is, ast.IsNot,
+)
+
+# 禁止访问的属性（可用于跳出沙箱的格式化方法和帧对象）
+_DENIED_ATTRIBUTES = {
+    "format", "format_map", "mro",
+    "gi_frame", "gi_code", "cr_frame", "cr_code", "ag_frame", "ag_code",
+    "f_globals", "f_locals", "f_builtins", "f_back", "f_code",
+    "tb_frame", "tb_next",
+}
+
+# 批量求值时每次传入生成函数的数据项数量
+DEFAULT_CHUNK_SIZE = 1024
+
+# 编译缓存的最大条目数
+_CACHE_SIZE = 1024
+
+# 编译缓存（源码哈希 -> 已编译表达式）
+_compiled_cache: "OrderedDict[str, CompiledExpression]" = OrderedDict()
+
+
+class ExpressionError(ValueError):
+    """
+    表达式解析、校验或求值失败
+    """
+
+
+class _ExpressionValidator(ast.NodeVisitor):
+    """
+    按白名单校验表达式语法树
+    """
+
+    def __init__(self, source: str):
+        self.source = source
+        self.names = set()
+        self.bound_names = set()
+
+    def _reject(self, reason: str) -> None:
+        raise ExpressionError(f"{reason} in expression: {self.source}")
+
+    def generic_visit(self, node: ast.AST) -> None:
+        if not isinstance(node, _ALLOWED_NODES):
+            self._reject(f"Unsupported syntax '{type(node).__name__}'")
+        super().generic_visit(node)
+
+    def visit_Name(self, node: ast.Name) -> None:
+        if node.id.startswith("_"):
+            self._reject(f"Private name '{node.id}'")
+        if isinstance(node.ctx, ast.Store):
+            self.bound_names.add(node.id)
+        else:
+            self.names.add(node.id)
+        self.generic_visit(node)
+
+    def visit_Attribute(self, node: ast.Attribute) -> None:
+        if node.attr.startswith("_") or node.attr in _DENIED_ATTRIBUTES:
+            self._reject(f"Access to attribute '{node.attr}'")
+        self.generic_visit(node)
+
+    def visit_Call(self, node: ast.Call) -> None:
+        func = node.func
+        if isinstance(func, ast.Name) and func.id not in SAFE_FUNCTIONS:
+            self._reject(f"Call to '{func.id}'")
+        if not isinstance(func, (ast.Name, ast.Attribute)):
+            self._reject("Call to a computed function")
+        self.generic_visit(node)
+
+
+class CompiledExpression:
+    """
+    已编译的表达式，源码只解析和校验一次
+    """
+
+    def __init__(self, source: str):
+        """
+        解析、校验并编译表达式
+
+        参数:
+            source: 表达式源码
+        """
+        self.source = source
+        try:
+            self._tree = ast.parse(source.strip(), mode="eval")
+        except SyntaxError as e:
+            raise ExpressionError(f"Invalid expression '{source}': {e.msg}") from e
+
+        validator = _ExpressionValidator(source)
+        validator.visit(self._tree)
+        # 表达式引用的外部变量（不含数据项变量、可用函数、常量和推导式变量）
+        self.variables = tuple(sorted(
+            validator.names
+            - set(ITEM_VARIABLES) - {"index"}
+            - set(SAFE_FUNCTIONS) - set(SAFE_CONSTANTS)
+            - validator.bound_names
+        ))
+
+        self._globals = _make_globals()
+        self._single_function = None
+        self._batch_function = None
+
+    def evaluate(self, data: Any = None, index: int = 0, **variables: Any) -> Any:
+        """
+        对单个数据项求值
+
+        参数:
+            data: 当前数据项
+            index: 数据项序号
+            variables: 其他变量
+
+        返回:
+            表达式结果
+        """
+        if self._single_function is None:
+            self._single_function = self._build_function(_SINGLE_TEMPLATE, "_n8n_single")
+        arguments = [variables.get(name) for name in self.variables]
+        try:
+            return self._single_function(data, index, *arguments)
+        except Exception as e:
+            raise ExpressionError(f"Failed to evaluate '{self.source}': {e}") from e
+
+    def evaluate_many(self, items: Iterable[Any], **variables: Any) -> List[Any]:
+        """
+        在生成的循环函数中对一批数据项求值
+
+        参数:
+            items: 数据项序列
+            variables: 其他变量
+
+        返回:
+            每个数据项的结果列表
+        """
+        batch_function = self._get_batch_function()
+        arguments = [variables.get(name) for name in self.variables]
+        try:
+            return batch_function(items, *arguments)
+        except Exception as e:
+            raise ExpressionError(f"Failed to evaluate '{self.source}': {e}") from e
+
+    def iter_evaluate(self, items: Iterable[Any], chunk_size: int = DEFAULT_CHUNK_SIZE, **variables: Any) -> Iterator[Any]:
+        """
+        分块惰性求值，流式输入不会被整体载入内存
+
+        参数:
+            items: 数据项序列
+            chunk_size: 每块数据项数量
+            variables: 其他变量
+
+        返回:
+            结果迭代器
+        """
+        iterator = iter(items)
+        while True:
+            chunk = list(itertools.islice(iterator, chunk_size))
+            if not chunk:
+                return
+            yield from self.evaluate_many(chunk, **variables)
+
+    def _get_batch_function(self) -> Any:
+        """
+        生成并缓存批量求值函数，表达式直接内联到循环体中
+        """
+        if self._batch_function is None:
+            self._batch_function = self._build_function(_BATCH_TEMPLATE, "_n8n_batch")
+        return self._batch_function
+
+    def _build_function(self, template: str, name: str) -> Any:
+        """
+        由模板生成求值函数；变量都是函数的局部变量，推导式中也可以访问
+        """
+        module = ast.parse(template.format(
+            parameters="".join(f", {variable}" for variable in self.variables),
+            aliases="; ".join(f"{variable} = data" for variable in ITEM_VARIABLES if variable != "data"),
+        ))
+        _ExpressionInliner(self._tree.body).visit(module)
+        ast.fix_missing_locations(module)
+        namespace = dict(self._globals)
+        exec(compile(module, f"<n8n-expression-{name[5:]}>", "exec"), namespace)
+        return namespace[name]
+
+
+# 单项求值函数模板，_n8n_expression 会被替换为表达式语法树
+_SINGLE_TEMPLATE = """
+def _n8n_single(data, index{parameters}):
+    {aliases}
+    return _n8n_expression
+"""
+
+# 批量求值函数模板，_n8n_expression 会被替换为表达式语法树
+_BATCH_TEMPLATE = """
+def _n8n_batch(_n8n_items{parameters}):
+    _n8n_results = []
+    _n8n_append = _n8n_results.append
+    for index, data in enumerate(_n8n_items):
+        {aliases}
+        _n8n_append(_n8n_expression)
+    return _n8n_results
+"""
+
+
+class _ExpressionInliner(ast.NodeTransformer):
+    """
+    将模板中的占位符替换为表达式语法树
+    """
+
+    def __init__(self, expression: ast.AST):
+        self.expression = expression
+
+    def visit_Name(self, node: ast.Name) -> ast.AST:
+        if node.id == "_n8n_expression":
+            return self.expression
+        return node
+
+
+def _make_globals() -> Dict[str, Any]:
+    """
+    创建表达式求值用的全局命名空间（不含内置函数）
+    """
+    namespace: Dict[str, Any] = {"__builtins__": {}}
+    namespace.update(SAFE_FUNCTIONS)
+    namespace.update(SAFE_CONSTANTS)
+    return namespace
+
+
+def compile_expression(source: str) -> CompiledExpression:
+    """
+    编译表达式，按源码哈希缓存编译结果
+
+    参数:
+        source: 表达式源码
+
+    返回:
+        已编译的表达式
+    """
+    key = hashlib.sha1(source.encode("utf-8")).hexdigest()
+    compiled = _compiled_cache.get(key)
+    if compiled is not None:
+        _compiled_cache.move_to_end(key)
+        return compiled
+
+    compiled = CompiledExpression(source)
+    _compiled_cache[key] = compiled
+    if len(_compiled_cache) > _CACHE_SIZE:
+        _compiled_cache.popitem(last=False)
+    return compiled
+
+
+def clear_expression_cache() -> None:
+    """
+    清空表达式编译缓存
+    """
+    _compiled_cache.clear()
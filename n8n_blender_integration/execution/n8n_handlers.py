@@ -0,0 +1,642 @@
+import asyncio
+import itertools
+import json
+import operator
+import reprlib
+from typing import Dict, Any, Callable, Iterable, Iterator, List, Set
+
+from .n8n_expression import compile_expression
+from .n8n_path import compile_path
+from .n8n_template import resolve_column
+from ..network import get_pool_manager, get_http_cache
+from ..filesystem import read_file, read_whole, write_file, iter_json_array, iter_json_file, json_loads
+from ..logs import LOG_LEVELS, get_log_sink
+
+# 节点处理器注册表（蓝图ID -> 处理函数）
+# 处理函数签名为 handler(node, input_data) -> 输出数据字典
+node_handlers: Dict[str, Callable[[Any, Dict[str, Any]], Dict[str, Any]]] = {}
+
+# 分支节点的蓝图ID，这类节点未产生数据的输出会剪枝下游子图
+branching_blueprints: Set[str] = set()
+
+# 循环节点的蓝图ID，执行器分批把数据送入其循环体
+loop_blueprints: Set[str] = {"split_in_batches", "SplitInBatches"}
+
+# 纯函数节点的蓝图ID，输出只取决于参数和输入，优化器可以在计划阶段对其常量折叠
+pure_blueprints: Set[str] = set()
+
+# 有副作用的节点的蓝图ID（写文件、发请求等），优化器保留这类节点及其上游
+side_effect_blueprints: Set[str] = set()
+
+# 原样传递输入的节点的蓝图ID，优化器把这类节点从计划中删除并直接连接上下游
+passthrough_blueprints: Set[str] = {"No Operation"}
+
+
+def register_handler(*blueprint_ids: str, branching: bool = False, pure: bool = False,
+                     side_effect: bool = False) -> Callable:
+    """
+    注册节点处理器的装饰器
+
+    参数:
+        blueprint_ids: 处理器对应的蓝图ID
+        branching: 是否为分支节点
+        pure: 是否为纯函数节点
+        side_effect: 是否有副作用
+
+    返回:
+        装饰器
+    """
+    def decorator(func: Callable) -> Callable:
+        for blueprint_id in blueprint_ids:
+            node_handlers[blueprint_id] = func
+            if branching:
+                branching_blueprints.add(blueprint_id)
+            if pure:
+                pure_blueprints.add(blueprint_id)
+            if side_effect:
+                side_effect_blueprints.add(blueprint_id)
+        return func
+    return decorator
+
+
+def get_node_handler(node: Any) -> Callable:
+    """
+    获取节点对应的处理器
+
+    参数:
+        node: 节点
+
+    返回:
+        处理函数，如果没有注册返回None
+    """
+    return node_handlers.get(getattr(node, "blueprint_id", ""), None)
+
+
+def is_branching_node(node: Any) -> bool:
+    """
+    检查节点是否为分支节点
+
+    参数:
+        node: 节点
+
+    返回:
+        是分支节点返回True，否则返回False
+    """
+    return getattr(node, "blueprint_id", "") in branching_blueprints
+
+
+def is_loop_node(node: Any) -> bool:
+    """
+    检查节点是否为循环节点
+
+    参数:
+        node: 节点
+
+    返回:
+        是循环节点返回True，否则返回False
+    """
+    return getattr(node, "blueprint_id", "") in loop_blueprints
+
+
+def is_empty_output(value: Any) -> bool:
+    """
+    检查输出是否没有产生数据
+
+    参数:
+        value: 输出值
+
+    返回:
+        没有数据返回True，否则返回False
+    """
+    if value is None:
+        return True
+    if isinstance(value, (list, tuple, dict, str)):
+        return len(value) == 0
+    return False
+
+
+def iter_items(value: Any) -> Iterable[Any]:
+    """
+    将输入值转换为可迭代的数据项，流式输入（迭代器）保持惰性
+
+    参数:
+        value: 输入值
+
+    返回:
+        数据项序列
+    """
+    if value is None:
+        return []
+    if isinstance(value, (list, tuple, Iterator)):
+        return value
+    return [value]
+
+
+# 条件运算符
+_CONDITION_OPERATIONS = {
+    "equals": operator.eq,
+    "notEquals": operator.ne,
+    "gt": operator.gt,
+    "gte": operator.ge,
+    "lt": operator.lt,
+    "lte": operator.le,
+    "contains": lambda left, right: right in left,
+    "notContains": lambda left, right: right not in left,
+    "startsWith": lambda left, right: str(left).startswith(str(right)),
+    "endsWith": lambda left, right: str(left).endswith(str(right)),
+    "exists": lambda left, right: left is not None,
+    "notExists": lambda left, right: left is None,
+    "isEmpty": lambda left, right: is_empty_output(left),
+    "isNotEmpty": lambda left, right: not is_empty_output(left),
+}
+
+
+def _evaluate_condition(condition: Dict[str, Any], items: List[Any]) -> List[bool]:
+    """
+    在一批数据项上计算单个n8n条件，字段引用按整列提取
+
+    参数:
+        condition: 条件定义，包含leftValue、rightValue和operator
+        items: 数据项列表
+
+    返回:
+        每个数据项的条件结果
+    """
+    operation = condition.get("operator", {}).get("operation", "equals")
+    compare = _CONDITION_OPERATIONS.get(operation)
+    if compare is None:
+        raise ValueError(f"Unsupported condition operation: {operation}")
+
+    results = []
+    lefts = resolve_column(condition.get("leftValue"), items)
+    rights = resolve_column(condition.get("rightValue"), items)
+    for left, right in zip(lefts, rights):
+        try:
+            results.append(bool(compare(left, right)))
+        except TypeError:
+            results.append(False)
+    return results
+
+
+@register_handler("logic_branch", branching=True, pure=True)
+def execute_logic_branch(node: Any, input_data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    逻辑分支节点：根据条件表达式将数据路由到true或false输出
+    """
+    value = input_data.get("input")
+    condition = compile_expression(node.get_parameter("condition", "input") or "input")
+    if condition.evaluate(value, input=value):
+        return {"true": value, "false": None}
+    return {"true": None, "false": value}
+
+
+@register_handler("data_transform", pure=True)
+def execute_data_transform(node: Any, input_data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    数据转换节点：对输入求值表达式，列表和流式输入逐项转换
+    """
+    value = input_data.get("input_data")
+    expression = compile_expression(node.get_parameter("expression", "data") or "data")
+    if isinstance(value, Iterator):
+        return {"output_data": expression.iter_evaluate(value)}
+    if isinstance(value, (list, tuple)):
+        return {"output_data": expression.evaluate_many(value)}
+    return {"output_data": expression.evaluate(value)}
+
+
+@register_handler("If", branching=True, pure=True)
+def execute_if(node: Any, input_data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    n8n If节点：按条件把数据项分到第一个（true）和第二个（false）输出
+    """
+    settings = node.get_parameter("conditions", {}) or {}
+    conditions = settings.get("conditions", [])
+    combine = all if settings.get("combinator", "and") == "and" else any
+
+    items = list(iter_items(input_data.get("main")))
+    columns = [_evaluate_condition(condition, items) for condition in conditions]
+
+    true_items = []
+    false_items = []
+    for item, results in zip(items, zip(*columns) if columns else [()] * len(items)):
+        if combine(results):
+            true_items.append(item)
+        else:
+            false_items.append(item)
+
+    # 两个输出同名，按输出序号返回
+    return {0: true_items, 1: false_items}
+
+
+@register_handler("Set", pure=True)
+def execute_set(node: Any, input_data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    n8n Set节点：按路径为每个数据项写入字段
+    """
+    settings = node.get_parameter("values", []) or []
+    keep_only_set = bool(node.get_parameter("keepOnlySet", False))
+
+    # 兼容按类型分组的写法 {"string": [...], "number": [...]}
+    if isinstance(settings, dict):
+        settings = [entry for entries in settings.values() for entry in entries]
+
+    items = list(iter_items(input_data.get("main")))
+    assignments = [
+        (compile_path(entry.get("name", "")), resolve_column(entry.get("value"), items))
+        for entry in settings if entry.get("name")
+    ]
+
+    outputs = []
+    for index, item in enumerate(items):
+        if keep_only_set or not isinstance(item, dict):
+            result = {}
+        else:
+            result = dict(item)
+        for path, column in assignments:
+            path.assign(result, column[index])
+        outputs.append(result)
+    return {0: outputs}
+
+
+@register_handler("Switch", branching=True, pure=True)
+def execute_switch(node: Any, input_data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    n8n Switch节点：按规则把数据项路由到对应序号的输出
+    """
+    settings = node.get_parameter("values", {}) or {}
+    rules = settings.get("rules", [])
+
+    # value1和每条规则的value2都按数据项取值，每个数据项按自己的值路由
+    items = list(iter_items(input_data.get("main")))
+    values = resolve_column(settings.get("value1"), items)
+    columns = [(resolve_column(rule.get("value2"), items), int(rule.get("output", 0))) for rule in rules]
+
+    outputs: Dict[int, List[Any]] = {index: [] for index in range(len(node.outputs))}
+    for index, (item, value) in enumerate(zip(items, values)):
+        for column, output in columns:
+            if column[index] == value:
+                outputs.setdefault(output, []).append(item)
+                break
+    return outputs
+
+
+# 迭代结束标记
+_EXHAUSTED = object()
+
+
+def _zip_by_index(streams: List[Iterable[Any]]) -> Iterator[Any]:
+    """
+    按序号逐项合并多个输入，字典数据项合并字段，其他数据项组成列表
+    """
+    for group in zip(*streams):
+        if all(isinstance(item, dict) for item in group):
+            merged = {}
+            for item in group:
+                merged.update(item)
+            yield merged
+        else:
+            yield list(group)
+
+
+def _join_by_key(left: Iterable[Any], right: Iterable[Any], key: str) -> Iterator[Any]:
+    """
+    对称哈希连接：交替读取两个输入，每个数据项到达时立即与另一侧已到达的数据项匹配
+
+    两侧输入都是流式读取，匹配结果在双方数据到达后立即产出，
+    不需要等待任一侧读取完毕
+    """
+    get_key = compile_path(key).get
+    sides = [iter(left), iter(right)]
+    tables: List[Dict[Any, List[Any]]] = [{}, {}]
+    active = [True, True]
+    while any(active):
+        for side in (0, 1):
+            if not active[side]:
+                continue
+            item = next(sides[side], _EXHAUSTED)
+            if item is _EXHAUSTED:
+                active[side] = False
+                continue
+            value = get_key(item)
+            if value is None or isinstance(value, (dict, list)):
+                continue
+            tables[side].setdefault(value, []).append(item)
+            for match in tables[1 - side].get(value, ()):
+                merged = dict(match) if side == 1 else dict(item)
+                merged.update(item if side == 1 else match)
+                yield merged
+
+
+def _mismatches_by_key(streams: List[Iterable[Any]], key: str) -> Iterator[Any]:
+    """
+    反连接：只保留键在其他输入中都不存在的数据项，没有键的数据项无法匹配，也会保留
+
+    除第一个输入外的输入先读入内存并建立键集合，第一个输入流式读取
+    """
+    get_key = compile_path(key).get
+
+    def key_of(item: Any) -> Any:
+        value = get_key(item)
+        return None if isinstance(value, (dict, list)) else value
+
+    buffered = [list(stream) for stream in streams[1:]]
+    buffered_keys = [{key_of(item) for item in items} - {None} for items in buffered]
+    other_keys = set().union(*buffered_keys)
+
+    first_keys = set()
+    for item in streams[0]:
+        value = key_of(item)
+        first_keys.add(value)
+        if value is None or value not in other_keys:
+            yield item
+
+    for index, items in enumerate(buffered):
+        seen_elsewhere = first_keys.union(*(keys for other, keys in enumerate(buffered_keys) if other != index))
+        for item in items:
+            value = key_of(item)
+            if value is None or value not in seen_elsewhere:
+                yield item
+
+# 合并模式别名（兼容n8n的Merge节点模式名称）
+_MERGE_MODES = {
+    "append": "append",
+    "combine": "append",
+    "zip": "zip",
+    "mergeByIndex": "zip",
+    "combineByPosition": "zip",
+    "key_join": "key_join",
+    "mergeByKey": "key_join",
+    "keepOnlyMatches": "key_join",
+    "key_mismatch": "key_mismatch",
+    "keepMismatches": "key_mismatch",
+    "passThrough": "pass_through",
+}
+
+
+def merge_streams(streams: List[Any], mode: str = "append", key: str = "id") -> Iterable[Any]:
+    """
+    合并多个数据流，结果为惰性迭代器，下游读取时才从输入中取数据
+
+    参数:
+        streams: 输入数据流列表
+        mode: 合并模式（append、zip、key_join、key_mismatch）
+        key: key_join和key_mismatch模式下用于匹配的字段
+
+    返回:
+        合并后的数据项迭代器
+    """
+    resolved = _MERGE_MODES.get(mode)
+    if resolved is None:
+        raise ValueError(f"Unsupported merge mode: {mode}")
+
+    streams = [iter_items(stream) for stream in streams]
+    if not streams:
+        return []
+    if resolved == "append":
+        return itertools.chain.from_iterable(streams)
+    if resolved == "zip":
+        return _zip_by_index(streams)
+    if resolved == "pass_through":
+        return streams[0]
+    if resolved == "key_mismatch":
+        return _mismatches_by_key(streams, key)
+
+    # 多于两个输入时逐级连接
+    joined = streams[0]
+    for stream in streams[1:]:
+        joined = _join_by_key(joined, stream, key)
+    return joined
+
+
+@register_handler("merge", pure=True)
+def execute_merge(node: Any, input_data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    合并节点：合并多连接输入上的所有数据流
+    """
+    streams = input_data.get("inputs", [])
+    mode = node.get_parameter("mode", "append")
+    key = node.get_parameter("key", "id")
+    return {"output": merge_streams(streams, mode, key)}
+
+
+@register_handler("Merge", pure=True)
+def execute_n8n_merge(node: Any, input_data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    n8n Merge节点：两个同名输入按输入序号读取
+    """
+    streams = [input_data.get("main")] + [input_data.get(index) for index in range(1, len(node.inputs))]
+    streams = [stream for stream in streams if stream is not None]
+    mode = node.get_parameter("mode", "combine")
+    key = node.get_parameter("propertyName", "id")
+    return {0: merge_streams(streams, mode, key)}
+
+
+# 不发送请求体的HTTP方法
+_BODYLESS_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+
+def _json_value(value: Any) -> Any:
+    """
+    将JSON文本参数解析为对象，空文本返回None
+    """
+    if isinstance(value, str):
+        value = value.strip()
+        return json.loads(value) if value else None
+    return value
+
+
+def _send_request(method: str, url: str, headers: Any = None, body: Any = None,
+                  connect_timeout: Any = None, read_timeout: Any = None, stream: bool = False,
+                  use_cache: bool = True) -> Dict[str, Any]:
+    """
+    通过共享连接池发送HTTP请求，use_cache为True时经过HTTP缓存
+
+    返回:
+        包含response和status_code的字典，stream为True时response为响应体数据块迭代器
+    """
+    method = (method or "GET").upper()
+    headers = _json_value(headers) or {}
+    body = _json_value(body)
+    if method in _BODYLESS_METHODS or body in ({}, []):
+        body = None
+
+    client = get_http_cache() if use_cache else get_pool_manager()
+    response = client.request(
+        method, url, headers=headers, body=body,
+        connect_timeout=float(connect_timeout) if connect_timeout is not None else None,
+        read_timeout=float(read_timeout) if read_timeout is not None else None,
+    )
+    if stream:
+        return {"response": response.iter_content(), "status_code": response.status}
+    return {"response": response.decoded_body(), "status_code": response.status}
+
+
+@register_handler("http_request", side_effect=True)
+def execute_http_request(node: Any, input_data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    HTTP请求节点：输入值覆盖节点属性
+    """
+    return _send_request(
+        node.get_parameter("method", "GET"),
+        input_data.get("url") or node.get_parameter("url", ""),
+        _json_value(input_data.get("headers")) or node.get_parameter("headers", "{}"),
+        _json_value(input_data.get("body")) or node.get_parameter("body", "{}"),
+        connect_timeout=node.get_parameter("connect_timeout", None),
+        read_timeout=node.get_parameter("timeout", None),
+        stream=bool(node.get_parameter("stream", False)),
+        use_cache=bool(node.get_parameter("use_cache", True)),
+    )
+
+
+@register_handler("HTTP Request", side_effect=True)
+def execute_n8n_http_request(node: Any, input_data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    n8n HTTP Request节点：每个输入数据项发送一次请求，URL、请求头和请求体可以是引用数据项字段的模板
+    """
+    items = list(iter_items(input_data.get("main"))) or [{}]
+    urls = resolve_column(node.get_parameter("url", ""), items)
+    headers = resolve_column(node.get_parameter("headers", {}), items)
+    bodies = resolve_column(node.get_parameter("body", {}), items)
+    method = node.get_parameter("requestMethod", "GET")
+    return {0: [_send_request(method, url, header, body)["response"]
+                for url, header, body in zip(urls, headers, bodies)]}
+
+
+@register_handler("json_parse")
+def execute_json_parse(node: Any, input_data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    JSON解析节点：stream模式逐项解析顶层数组并输出惰性迭代器，大文件不会整体载入内存
+    """
+    source = input_data.get("json_string")
+    file_path = node.get_parameter("file_path", "")
+    chunk_size = node.get_parameter("chunk_size", 65536) or 65536
+
+    if node.get_parameter("mode", "whole") == "stream":
+        if file_path:
+            return {"parsed_data": iter_json_file(file_path, chunk_size)}
+        # 输入可以是字符串，也可以是文件读取节点chunks模式输出的文本块
+        return {"parsed_data": iter_json_array(source if source is not None else "[]", chunk_size)}
+
+    if file_path and not source:
+        source = read_whole(file_path)
+    if isinstance(source, Iterator):
+        source = "".join(source)
+    if not isinstance(source, (str, bytes, bytearray)):
+        # 已经解析过的数据原样输出
+        return {"parsed_data": source}
+    return {"parsed_data": json_loads(source) if source else None}
+
+
+@register_handler("file_read")
+def execute_file_read(node: Any, input_data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    文件读取节点：lines和chunks模式输出惰性迭代器，大文件不会整体载入内存
+    """
+    file_path = input_data.get("file_path") or node.get_parameter("file_path", "")
+    try:
+        content = read_file(
+            file_path,
+            mode=node.get_parameter("mode", "whole"),
+            encoding=node.get_parameter("encoding", "utf-8") or "utf-8",
+            chunk_size=node.get_parameter("chunk_size", 1048576),
+        )
+    except (OSError, UnicodeDecodeError) as e:
+        get_log_sink().error(f"Failed to read file {file_path}: {e}", node.name)
+        return {"content": None, "success": False}
+    return {"content": content, "success": True}
+
+
+@register_handler("file_write", side_effect=True)
+def execute_file_write(node: Any, input_data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    文件写入节点：列表和流式输入逐项写入，同一路径的写入串行执行
+    """
+    file_path = input_data.get("file_path") or node.get_parameter("file_path", "")
+    content = input_data.get("content")
+    if content is None or content == "":
+        content = node.get_parameter("content", "")
+
+    if isinstance(content, (list, tuple, Iterator)):
+        items, line_ending = content, node.get_parameter("line_ending", "\n")
+    else:
+        items, line_ending = [content], ""
+
+    try:
+        write_file(
+            file_path, items,
+            mode=node.get_parameter("mode", "w") or "w",
+            encoding=node.get_parameter("encoding", "utf-8") or "utf-8",
+            line_ending=line_ending,
+            fsync=bool(node.get_parameter("fsync", False)),
+        )
+    except (OSError, ValueError) as e:
+        get_log_sink().error(f"Failed to write file {file_path}: {e}", node.name)
+        return {"success": False, "file_path": file_path}
+    return {"success": True, "file_path": file_path}
+
+
+# 日志节点的数据预览，避免把大量数据转换为字符串
+_log_preview = reprlib.Repr()
+_log_preview.maxstring = 200
+_log_preview.maxother = 200
+_log_preview.maxlist = 10
+_log_preview.maxdict = 10
+
+
+@register_handler("log", side_effect=True)
+def execute_log(node: Any, input_data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    日志节点：写入日志接收器的环形缓冲区，文件写入由后台线程完成
+    """
+    level = str(node.get_parameter("level", "info") or "info").lower()
+    if level not in LOG_LEVELS:
+        level = "info"
+    message = str(node.get_parameter("message", ""))
+    data = input_data.get("data")
+    if data is not None:
+        message = f"{message} {_log_preview.repr(data)}" if message else _log_preview.repr(data)
+    get_log_sink().log(level, message, node.name)
+    return {"logged": True}
+
+
+@register_handler("workflow_input", "workflow_output", pure=True)
+def execute_workflow_port(node: Any, input_data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    子工作流输入/输出节点：原样传递数据，输入节点的数据来自编译时连接的调用方
+    """
+    return {"data": input_data.get("data")}
+
+
+@register_handler("No Operation", pure=True)
+def execute_no_operation(node: Any, input_data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    n8n No Operation节点：原样传递输入（启用优化时会在计划阶段被删除）
+    """
+    return {0: input_data.get("main")}
+
+
+# n8n Wait节点的时间单位
+_WAIT_UNITS = {"seconds": 1, "minutes": 60, "hours": 3600, "days": 86400}
+
+
+@register_handler("wait")
+async def execute_wait(node: Any, input_data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    等待节点：在事件循环的定时器上挂起，等待期间不占用线程
+    """
+    seconds = input_data.get("seconds")
+    if seconds is None:
+        seconds = node.get_parameter("seconds", 5)
+    await asyncio.sleep(max(0.0, float(seconds)))
+    return {"completed": True}
+
+
+@register_handler("Wait")
+async def execute_n8n_wait(node: Any, input_data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    n8n Wait节点：等待指定时间后原样输出数据项
+    """
+    amount = float(node.get_parameter("amount", 1) or 0)
+    unit = _WAIT_UNITS.get(node.get_parameter("unit", "seconds"), 1)
+    await asyncio.sleep(max(0.0, amount * unit))
+    return {0: input_data.get("main")}
@@ -0,0 +1,458 @@
+import asyncio
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Set, Tuple
+
+from .n8n_handlers import (get_node_handler, is_loop_node, pure_blueprints, side_effect_blueprints,
+                           passthrough_blueprints)
+from .n8n_subworkflow import ExecutionPlan, WORKFLOW_INPUT_BLUEPRINT, WORKFLOW_OUTPUT_BLUEPRINT
+from ..nodes.n8n_node_tree import CycleError
+
+# 常量折叠结果缓存的最大条数
+FOLD_CACHE_SIZE = 256
+
+# 报告中每个优化过程最多列出的节点名称数
+_REPORT_NAME_LIMIT = 10
+
+# 幂等的请求节点（蓝图ID -> 请求方法参数名），使用这些方法时重复的请求可以合并
+_IDEMPOTENT_REQUESTS = {"http_request": "method", "HTTP Request": "requestMethod"}
+_IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+# 常量折叠结果缓存（节点指纹 -> 输出）
+_fold_cache: 'OrderedDict[Tuple, Any]' = OrderedDict()
+
+# 已优化的执行计划（节点树指针 -> (编译结果标识, 状态, 优化后的计划, 优化报告)）
+_optimized_cache: Dict[int, Tuple[Any, Tuple, Any, 'OptimizationReport']] = {}
+
+
+class PassResult(NamedTuple):
+    """
+    单个优化过程的结果
+    """
+    name: str
+    # 从计划中删除的节点名称
+    removed: List[str]
+    # 被改写的节点名称（例如常量折叠）
+    rewritten: List[str]
+
+    def format(self) -> str:
+        """
+        格式化为一行报告
+        """
+        parts = []
+        for action, names in (("removed", self.removed), ("rewrote", self.rewritten)):
+            if names:
+                listed = ", ".join(names[:_REPORT_NAME_LIMIT])
+                if len(names) > _REPORT_NAME_LIMIT:
+                    listed += ", ..."
+                parts.append(f"{action} {len(names)} node(s): {listed}")
+        return f"{self.name}: {'; '.join(parts) if parts else 'no change'}"
+
+
+class OptimizationReport:
+    """
+    优化报告，按顺序记录每个优化过程的效果
+    """
+
+    def __init__(self, node_count: int, link_count: int):
+        self.passes: List[PassResult] = []
+        self.nodes_before = node_count
+        self.links_before = link_count
+        self.nodes_after = node_count
+        self.links_after = link_count
+        self.elapsed = 0.0
+
+    @property
+    def changed(self) -> bool:
+        return any(result.removed or result.rewritten for result in self.passes)
+
+    def removed_nodes(self) -> Dict[str, str]:
+        """
+        获取被删除的节点
+
+        返回:
+            节点名称到删除它的优化过程名称的字典
+        """
+        return {name: result.name for result in self.passes for name in result.removed}
+
+    def format(self) -> List[str]:
+        """
+        格式化为报告行，最后一行为汇总
+        """
+        lines = [result.format() for result in self.passes]
+        lines.append(f"nodes {self.nodes_before} -> {self.nodes_after}, "
+                     f"links {self.links_before} -> {self.links_after} in {self.elapsed * 1000:.1f} ms")
+        return lines
+
+
+def _is_passthrough(node: Any) -> bool:
+    """
+    检查节点是否原样传递输入：No Operation节点，以及内联后的子工作流输入输出节点
+    """
+    blueprint_id = getattr(node, "blueprint_id", "")
+    if blueprint_id in passthrough_blueprints:
+        return True
+    return (blueprint_id in (WORKFLOW_INPUT_BLUEPRINT, WORKFLOW_OUTPUT_BLUEPRINT)
+            and getattr(node, "caller", None) is not None)
+
+
+def _is_sink(node: Any) -> bool:
+    """
+    检查节点是否为必须执行的汇节点：有副作用的节点、没有注册处理器的节点（行为未知）和固定了结果的节点
+    """
+    if getattr(node, "blueprint_id", "") in side_effect_blueprints or getattr(node, "pin_result", False):
+        return True
+    return get_node_handler(node) is None and not is_loop_node(node)
+
+
+def _is_workflow_output(node: Any) -> bool:
+    """
+    检查节点是否为顶层工作流的输出节点
+    """
+    return getattr(node, "blueprint_id", "") == WORKFLOW_OUTPUT_BLUEPRINT and getattr(node, "caller", None) is None
+
+
+def _is_implicit_output(node: Any) -> bool:
+    """
+    检查节点是否为隐式输出：有输出套接字、输入已连接但没有下游的节点，其结果就是工作流的结果
+    """
+    return (bool(node.outputs) and not any(socket.links for socket in node.outputs)
+            and any(socket.links for socket in node.inputs))
+
+
+def elide_passthrough_nodes(plan: ExecutionPlan, keep: Iterable[str] = ()) -> PassResult:
+    """
+    删除只有一个输入连接的传递节点，把其下游直接连接到上游的输出
+
+    参数:
+        plan: 执行计划
+        keep: 不能删除的节点名称
+
+    返回:
+        优化结果
+    """
+    keep = set(keep)
+    removed = []
+    for node in list(plan.nodes):
+        if node.name in keep or not _is_passthrough(node):
+            continue
+        incoming = [link for socket in node.inputs for link in socket.links]
+        if len(incoming) != 1:
+            continue
+        source = incoming[0].from_socket
+        for socket in node.outputs:
+            plan.redirect_links(socket, source)
+        # 输入连接和节点一起由remove_nodes批量删除
+        removed.append(node.name)
+    plan.remove_nodes(set(removed))
+    return PassResult("passthrough_elision", removed, [])
+
+
+def eliminate_dead_nodes(plan: ExecutionPlan, keep: Iterable[str] = ()) -> PassResult:
+    """
+    删除无法到达任何汇节点的节点。汇节点包括有副作用的节点和工作流的输出：
+    顶层工作流有Workflow Output节点时以其为输出，否则已连接且没有下游的节点都视为输出，
+    因此未连接的节点和没有输出套接字的纯函数节点会被删除
+
+    参数:
+        plan: 执行计划
+        keep: 不能删除的节点名称
+
+    返回:
+        优化结果
+    """
+    keep = set(keep)
+    has_outputs = any(_is_workflow_output(node) for node in plan.nodes)
+    is_output = _is_workflow_output if has_outputs else _is_implicit_output
+    roots = [node for node in plan.nodes if node.name in keep or _is_sink(node) or is_output(node)]
+
+    # 从汇节点沿输入连接反向遍历（包括循环回边）
+    live = {node.name for node in roots}
+    stack = list(roots)
+    while stack:
+        node = stack.pop()
+        for socket in node.inputs:
+            for link in socket.links:
+                producer = link.from_node
+                if producer.name not in live:
+                    live.add(producer.name)
+                    stack.append(producer)
+
+    removed = [node.name for node in plan.nodes if node.name not in live]
+    plan.remove_nodes(set(removed))
+    return PassResult("dead_node_elimination", removed, [])
+
+
+def _is_deduplicable(node: Any) -> bool:
+    """
+    检查相同输入的节点是否可以只执行一次：没有副作用的节点，以及使用幂等方法的请求节点
+    """
+    blueprint_id = getattr(node, "blueprint_id", "")
+    if get_node_handler(node) is None or is_loop_node(node):
+        return False
+    if blueprint_id not in side_effect_blueprints:
+        return True
+    method_parameter = _IDEMPOTENT_REQUESTS.get(blueprint_id)
+    return method_parameter is not None and str(node.get_parameter(method_parameter, "GET")).upper() in _IDEMPOTENT_METHODS
+
+
+def _node_fingerprint(node: Any, canonical: Dict[str, str]) -> Optional[Tuple]:
+    """
+    计算节点的指纹：蓝图、参数、每个输入的上游（生产者节点和输出序号，按连接顺序）或默认值，以及输出套接字；
+    上游节点使用合并后的名称，因此重复的链会从上游到下游逐级合并。参数无法序列化时返回None
+    """
+    inputs = []
+    for socket in node.inputs:
+        if socket.links:
+            inputs.append(tuple(
+                (canonical.get(link.from_node.name, link.from_node.name),
+                 list(link.from_node.outputs).index(link.from_socket))
+                for link in socket.links
+            ))
+        elif getattr(socket, "use_default_value", False):
+            inputs.append(("default", repr(socket.get_value())))
+        else:
+            inputs.append(())
+    try:
+        parameters = json.dumps(node.get_parameters(), sort_keys=True)
+    except (TypeError, ValueError):
+        return None
+    return (node.blueprint_id, parameters, tuple(inputs), tuple(socket.name for socket in node.outputs))
+
+
+def eliminate_common_subexpressions(plan: ExecutionPlan, keep: Iterable[str] = ()) -> PassResult:
+    """
+    公共子表达式消除：按拓扑顺序计算节点指纹，指纹相同（类型、参数和上游都相同）的节点只保留第一个，
+    其余节点的下游连接改为连接到保留节点的同一输出
+
+    参数:
+        plan: 执行计划
+        keep: 不能删除的节点名称
+
+    返回:
+        优化结果
+    """
+    keep = set(keep)
+    try:
+        order = plan.calculate_execution_order()
+    except CycleError:
+        return PassResult("common_subexpression_elimination", [], [])
+
+    # 被合并的节点名称 -> 保留节点名称
+    canonical: Dict[str, str] = {}
+    seen: Dict[Tuple, Any] = {}
+    removed = []
+    for node in order:
+        if not _is_deduplicable(node):
+            continue
+        fingerprint = _node_fingerprint(node, canonical)
+        if fingerprint is None:
+            continue
+        original = seen.get(fingerprint)
+        if original is None or node.name in keep:
+            seen.setdefault(fingerprint, node)
+            continue
+
+        canonical[node.name] = original.name
+        for source, socket in zip(original.outputs, node.outputs):
+            plan.redirect_links(socket, source)
+        removed.append(node.name)
+    plan.remove_nodes(set(removed))
+    return PassResult("common_subexpression_elimination", removed, [])
+
+
+def _materialize(value: Any) -> Any:
+    """
+    把输出中的流式数据（迭代器）物化为列表，使折叠结果可以重复使用
+    """
+    if isinstance(value, Iterator):
+        return list(value)
+    if isinstance(value, dict):
+        return {key: list(item) if isinstance(item, Iterator) else item for key, item in value.items()}
+    return value
+
+
+def _default_inputs(node: Any) -> Dict[str, Any]:
+    """
+    收集未连接输入套接字的默认值，键的规则与执行器收集输入时相同
+    """
+    input_data = {}
+    seen_names = set()
+    for index, socket in enumerate(node.inputs):
+        key = index if socket.name in seen_names else socket.name
+        seen_names.add(socket.name)
+        if getattr(socket, "use_default_value", False):
+            input_data[key] = socket.get_value()
+    return input_data
+
+
+def _fold_key(node: Any, input_data: Dict[str, Any]) -> Optional[Tuple]:
+    """
+    计算节点的指纹：蓝图、参数、默认输入和输出套接字，无法序列化时返回None
+    """
+    try:
+        return (
+            node.blueprint_id,
+            json.dumps(node.get_parameters(), sort_keys=True),
+            json.dumps(sorted(input_data.items(), key=lambda entry: str(entry[0]))),
+            tuple(socket.name for socket in node.outputs),
+        )
+    except (TypeError, ValueError):
+        return None
+
+
+def fold_constants(plan: ExecutionPlan, keep: Iterable[str] = ()) -> PassResult:
+    """
+    常量折叠：所有输入都未连接（只使用套接字默认值）的纯函数节点在计划阶段求值，
+    执行时直接使用结果；结果按节点指纹缓存，参数或默认值不变时多次执行只求值一次
+
+    参数:
+        plan: 执行计划
+        keep: 不折叠的节点名称
+
+    返回:
+        优化结果
+    """
+    keep = set(keep)
+    folded = []
+    for node in plan.nodes:
+        if node.name in keep or getattr(node, "blueprint_id", "") not in pure_blueprints:
+            continue
+        if any(socket.links for socket in node.inputs):
+            continue
+        handler = get_node_handler(node)
+        if handler is None or asyncio.iscoroutinefunction(handler):
+            continue
+        input_data = _default_inputs(node)
+        key = _fold_key(node, input_data)
+        if key is None:
+            continue
+        if key in _fold_cache:
+            _fold_cache.move_to_end(key)
+            output = _fold_cache[key]
+        else:
+            try:
+                output = _materialize(handler(node, input_data))
+            except Exception:
+                # 求值失败的节点留给执行器执行并报告错误
+                continue
+            _fold_cache[key] = output
+            if len(_fold_cache) > FOLD_CACHE_SIZE:
+                _fold_cache.popitem(last=False)
+        node.folded_output = output
+        node.is_folded = True
+        folded.append(node.name)
+    return PassResult("constant_folding", [], folded)
+
+
+# 默认的优化过程，按顺序执行：先删除传递节点并合并重复节点，再删除死节点，最后只对剩下的节点做常量折叠
+DEFAULT_PASSES: Tuple[Callable[[ExecutionPlan, Iterable[str]], PassResult], ...] = (
+    elide_passthrough_nodes,
+    eliminate_common_subexpressions,
+    eliminate_dead_nodes,
+    fold_constants,
+)
+
+
+def optimize_plan(graph: Any, passes: Iterable[Callable[[ExecutionPlan, Iterable[str]], PassResult]] = DEFAULT_PASSES,
+                  keep: Iterable[str] = ()) -> Tuple[Any, OptimizationReport]:
+    """
+    在执行计划的副本上依次运行优化过程，节点树和缓存的计划不会被修改
+
+    参数:
+        graph: compile_workflow返回的节点树或执行计划
+        passes: 优化过程，每个过程接收(计划, 不能修改的节点名称)并返回PassResult
+        keep: 不能删除或改写的节点名称（例如执行器中固定了结果的节点）
+
+    返回:
+        (优化后的执行计划, 优化报告)，没有任何优化时返回原来的graph
+    """
+    started = time.perf_counter()
+    plan = graph.copy() if isinstance(graph, ExecutionPlan) else ExecutionPlan.from_tree(graph)
+    keep = set(keep)
+    report = OptimizationReport(len(plan.nodes), len(plan.links))
+    # 有循环依赖的计划不优化，由执行器报告循环（否则循环可能被当作无用节点删除）
+    try:
+        plan.calculate_execution_order()
+    except CycleError:
+        return graph, report
+    for optimization_pass in passes:
+        report.passes.append(optimization_pass(plan, keep))
+    report.nodes_after = len(plan.nodes)
+    report.links_after = len(plan.links)
+    report.elapsed = time.perf_counter() - started
+    return (plan if report.changed else graph), report
+
+
+def _graph_identity(graph: Any) -> Any:
+    """
+    编译结果的标识：执行计划重新编译后是新对象，节点树用指针和拓扑版本区分
+    """
+    if isinstance(graph, ExecutionPlan):
+        return graph
+    return graph.as_pointer(), getattr(graph, "graph_version", 0)
+
+
+def _plan_state(graph: Any, keep: Set[str]) -> Optional[Tuple]:
+    """
+    拓扑以外影响优化结果的状态：节点参数、固定标记和使用默认值的未连接输入，参数无法序列化时返回None
+    """
+    state: List[Any] = [tuple(sorted(keep))]
+    try:
+        for node in graph.nodes:
+            state.append((
+                node.name,
+                json.dumps(node.get_parameters(), sort_keys=True),
+                bool(getattr(node, "pin_result", False)),
+                tuple(
+                    repr(socket.get_value()) if getattr(socket, "use_default_value", False) else None
+                    for socket in node.inputs if not socket.links
+                ),
+            ))
+    except (TypeError, ValueError):
+        return None
+    return tuple(state)
+
+
+def get_optimized_plan(node_tree: Any, graph: Any, keep: Iterable[str] = ()) -> Tuple[Any, OptimizationReport]:
+    """
+    获取优化后的执行计划：编译结果、节点参数、默认输入和固定节点都没有变化时复用上次的结果，
+    不再复制和重新优化
+
+    参数:
+        node_tree: 要执行的节点树
+        graph: compile_workflow的结果
+        keep: 不能删除或改写的节点名称
+
+    返回:
+        (优化后的执行计划, 优化报告)
+    """
+    keep = set(keep)
+    key = node_tree.as_pointer()
+    identity = _graph_identity(graph)
+    state = _plan_state(graph, keep)
+    cached = _optimized_cache.get(key)
+    if state is not None and cached is not None and cached[0] == identity and cached[1] == state:
+        return cached[2], cached[3]
+
+    plan, report = optimize_plan(graph, keep=keep)
+    if state is not None:
+        _optimized_cache[key] = (identity, state, plan, report)
+    else:
+        _optimized_cache.pop(key, None)
+    return plan, report
+
+
+def clear_optimized_plans() -> None:
+    """
+    清空已优化的执行计划
+    """
+    _optimized_cache.clear()
+
+
+def clear_fold_cache() -> None:
+    """
+    清空常量折叠结果缓存
+    """
+    _fold_cache.clear()
@@ -0,0 +1,153 @@
+import re
+from functools import lru_cache
+from typing import Any, Callable, Iterable, List, Tuple
+
+# 路径片段：name、.name、[0]、["name"]、[*]
+_SEGMENT_PATTERN = re.compile(r"""\s*(?:\.?([A-Za-z_$][\w$-]*)|\[\s*(-?\d+)\s*\]|\[\s*(['"])(.*?)\3\s*\]|\[\s*(\*)\s*\])""")
+
+# 投影标记
+_WILDCARD = object()
+
+
+class PathError(ValueError):
+    """
+    路径语法错误
+    """
+
+
+def _parse_segments(path: str) -> Tuple[Any, ...]:
+    """
+    将路径拆分为字段名、下标和投影标记
+    """
+    segments = []
+    position = 0
+    path = path.strip()
+    while position < len(path):
+        match = _SEGMENT_PATTERN.match(path, position)
+        if not match or match.end() == position:
+            raise PathError(f"Invalid path '{path}' at position {position}")
+        if match.group(1) is not None:
+            segments.append(match.group(1))
+        elif match.group(2) is not None:
+            segments.append(int(match.group(2)))
+        elif match.group(5) is not None:
+            segments.append(_WILDCARD)
+        else:
+            segments.append(match.group(4))
+        position = match.end()
+    return tuple(segments)
+
+
+def _make_lookup(keys: Tuple[Any, ...]) -> Callable[[Any], Any]:
+    """
+    为连续的字段名和下标生成取值函数，任一级缺失时返回None
+    """
+    if not keys:
+        return lambda value: value
+
+    if len(keys) == 1:
+        key = keys[0]
+
+        def lookup_one(value):
+            try:
+                return value[key]
+            except (KeyError, IndexError, TypeError):
+                return None
+        return lookup_one
+
+    def lookup(value):
+        try:
+            for key in keys:
+                value = value[key]
+            return value
+        except (KeyError, IndexError, TypeError):
+            return None
+    return lookup
+
+
+def _build_getter(segments: Tuple[Any, ...]) -> Callable[[Any], Any]:
+    """
+    将路径片段组合为取值函数，投影之后的片段作用于列表中的每个元素
+    """
+    if _WILDCARD not in segments:
+        return _make_lookup(segments)
+
+    split = segments.index(_WILDCARD)
+    head = _make_lookup(segments[:split])
+    rest = _build_getter(segments[split + 1:])
+
+    def project(value):
+        value = head(value)
+        if not isinstance(value, (list, tuple)):
+            return None
+        # 与JMESPath一致，投影结果中去掉缺失的值
+        return [result for result in map(rest, value) if result is not None]
+    return project
+
+
+class CompiledPath:
+    """
+    已编译的路径，取值函数只生成一次
+    """
+
+    def __init__(self, path: str):
+        """
+        解析路径
+
+        参数:
+            path: 路径，例如 user.address.city、items[0].name、orders[*].id
+        """
+        self.path = path
+        self.segments = _parse_segments(path)
+        self.get = _build_getter(self.segments)
+
+    def extract(self, items: Iterable[Any]) -> List[Any]:
+        """
+        从一批数据项中提取整列值
+
+        参数:
+            items: 数据项序列
+
+        返回:
+            每个数据项对应的值
+        """
+        return list(map(self.get, items))
+
+    def assign(self, item: Any, value: Any) -> Any:
+        """
+        按路径写入值，中间层级复制后再写入，缺失的层级创建为字典
+
+        参数:
+            item: 目标字典
+            value: 写入的值
+
+        返回:
+            目标字典
+        """
+        if not self.segments or _WILDCARD in self.segments:
+            raise PathError(f"Cannot assign to path '{self.path}'")
+
+        target = item
+        for key in self.segments[:-1]:
+            child = target[key] if isinstance(target, list) else target.get(key)
+            # 复制中间层级，避免修改其他节点共享的输入数据
+            child = child.copy() if isinstance(child, (dict, list)) else {}
+            target[key] = child
+            target = child
+        target[self.segments[-1]] = value
+        return item
+
+
+@lru_cache(maxsize=1024)
+def compile_path(path: str) -> CompiledPath:
+    """
+    编译路径，相同路径共享编译结果
+
+    参数:
+        path: 路径
+
+    返回:
+        已编译的路径
+    """
+    return CompiledPath(path)
+
@@ -0,0 +1,428 @@
+import bpy
+from bpy.app.handlers import persistent
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+from ..nodes.n8n_node_tree import N8nNodeTree
+
+# 子工作流相关节点的蓝图ID
+SUB_WORKFLOW_BLUEPRINT = "sub_workflow"
+WORKFLOW_INPUT_BLUEPRINT = "workflow_input"
+WORKFLOW_OUTPUT_BLUEPRINT = "workflow_output"
+
+# 子工作流节点的输入输出套接字名称
+SUB_WORKFLOW_INPUT = "input"
+SUB_WORKFLOW_OUTPUT = "output"
+WORKFLOW_PORT = "data"
+
+# 内联节点的名称分隔符：调用节点名称/子工作流中的节点名称
+NAME_SEPARATOR = "/"
+
+# 已编译的执行计划（调用方节点树指针 -> (签名, 执行计划)）
+_plan_cache: Dict[int, Tuple[Tuple, 'ExecutionPlan']] = {}
+
+# 缓存的计划引用节点和套接字，这些事件之后原对象可能已被释放，需要清空缓存
+_CACHE_RESET_HANDLERS = ("load_post", "undo_post", "redo_post")
+
+
+def _default_resolver(name: str) -> Optional[Any]:
+    """
+    按名称查找n8n节点树
+    """
+    tree = bpy.data.node_groups.get(name)
+    if tree is None or getattr(tree, "bl_idname", "") != N8nNodeTree.bl_idname:
+        return None
+    return tree
+
+
+class PlanSocket:
+    """
+    执行计划中的套接字，连接关系为展开后的图，其余属性取自原套接字
+    """
+
+    def __init__(self, node: 'PlanNode', source: Any = None, name: str = WORKFLOW_PORT, is_output: bool = False):
+        self.node = node
+        self.source = source
+        self.name = source.name if source is not None else name
+        self.identifier = source.identifier if source is not None else name
+        self.is_output = is_output
+        self.is_loop_back = bool(getattr(source, "is_loop_back", False))
+        self.link_limit = getattr(source, "link_limit", 1)
+        self.links: List['PlanLink'] = []
+
+    @property
+    def is_linked(self) -> bool:
+        return bool(self.links)
+
+    @property
+    def use_default_value(self) -> bool:
+        # 不属于拓扑，修改后不会重新编译，因此每次从原套接字读取
+        return bool(getattr(self.source, "use_default_value", False))
+
+    def get_value(self) -> Any:
+        return self.source.get_value() if self.source is not None else None
+
+
+class PlanLink:
+    """
+    执行计划中的连接
+    """
+
+    def __init__(self, from_socket: PlanSocket, to_socket: PlanSocket):
+        self.from_socket = from_socket
+        self.to_socket = to_socket
+        self.from_node = from_socket.node
+        self.to_node = to_socket.node
+        self.is_valid = True
+
+
+class PlanNode:
+    """
+    执行计划中的节点，包装原节点并使用展开后的名称和套接字；
+    参数和处理器取自原节点，因此修改节点参数后不需要重新编译
+    """
+
+    # 保存在计划节点上的执行状态属性
+    _STATE_ATTRIBUTES = ("execution_state", "execution_result", "error_message")
+
+    # 优化器常量折叠后的输出，执行时不再调用处理器
+    is_folded = False
+    folded_output: Any = None
+
+    def __init__(self, source: Any, name: str, caller: Any = None):
+        """
+        初始化计划节点
+
+        参数:
+            source: 原节点
+            name: 展开后的唯一名称
+            caller: 内联节点所属的顶层子工作流调用节点，顶层节点为None
+        """
+        self.__dict__.update(source=source, name=name, caller=caller,
+                             execution_state="IDLE", execution_result="", error_message="")
+        self.inputs = [PlanSocket(self, socket) for socket in source.inputs]
+        self.outputs = [PlanSocket(self, socket, is_output=True) for socket in source.outputs]
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.__dict__["source"], name)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        self.__dict__[name] = value
+        if name not in self._STATE_ATTRIBUTES:
+            return
+        if self.caller is None:
+            # 顶层节点的状态同步到原节点，界面照常显示
+            setattr(self.source, name, value)
+        elif name == "execution_state" and value == "ERROR":
+            # 内联节点失败时标记调用节点
+            self.caller.execution_state = "ERROR"
+        elif name == "error_message" and value:
+            self.caller.error_message = f"{self.name}: {value}"
+
+    def reset(self) -> None:
+        self.execution_state = "IDLE"
+        self.execution_result = ""
+        self.error_message = ""
+
+    def copy(self) -> 'PlanNode':
+        """
+        复制计划节点（不含连接）
+        """
+        clone = PlanNode(self.source, self.name, self.caller)
+        # 子工作流输入节点的虚拟输入套接字没有对应的原套接字
+        clone.inputs.extend(PlanSocket(clone, name=socket.name) for socket in self.inputs[len(clone.inputs):])
+        return clone
+
+
+class _PlanNodes(list):
+    """
+    计划节点列表，支持按名称查找
+    """
+
+    def __init__(self, nodes: Iterable[PlanNode] = ()):
+        super().__init__()
+        self._by_name: Dict[str, PlanNode] = {}
+        for node in nodes:
+            self.append(node)
+
+    def append(self, node: PlanNode) -> None:
+        super().append(node)
+        self._by_name[node.name] = node
+
+    def get(self, name: str, default: Any = None) -> Any:
+        return self._by_name.get(name, default)
+
+
+class ExecutionPlan:
+    """
+    展开子工作流后的执行计划，提供执行器所需的节点树接口
+    """
+
+    # 复用节点树的拓扑排序和循环检测
+    is_back_edge = staticmethod(N8nNodeTree.is_back_edge)
+    calculate_execution_order = N8nNodeTree.calculate_execution_order
+    find_cycles = N8nNodeTree.find_cycles
+    _dependency_adjacency = N8nNodeTree._dependency_adjacency
+
+    def __init__(self, node_tree: Any):
+        self.node_tree = node_tree
+        self.name = node_tree.name
+        self.nodes = _PlanNodes()
+        # 按添加顺序保存的连接（字典用作有序集合，删除连接为O(1)）
+        self._links: Dict[PlanLink, None] = {}
+
+    @property
+    def links(self) -> Iterable[PlanLink]:
+        return self._links.keys()
+
+    def highlight_cycles(self, cycles: List[List[str]]) -> None:
+        """
+        在原节点树中标记循环：顶层节点标记自身，内联节点标记其所属的子工作流调用节点
+
+        参数:
+            cycles: find_cycles()的结果，节点名称为展开后的名称
+        """
+        source_cycles = []
+        for cycle in cycles:
+            names = []
+            for name in cycle:
+                node = self.nodes.get(name)
+                if node is not None:
+                    names.append((node.caller or node.source).name)
+            source_cycles.append(names)
+        self.node_tree.highlight_cycles(source_cycles)
+
+    def reset_all_nodes(self) -> None:
+        """
+        重置所有节点状态
+        """
+        self.node_tree.reset_all_nodes()
+        for node in self.nodes:
+            node.reset()
+
+    def link(self, from_socket: PlanSocket, to_socket: PlanSocket, position: Optional[int] = None) -> PlanLink:
+        """
+        添加连接
+
+        参数:
+            from_socket: 输出套接字
+            to_socket: 输入套接字
+            position: 在输入套接字连接列表中的位置，为None时追加到末尾（多连接输入按此顺序收集数据）
+        """
+        link = PlanLink(from_socket, to_socket)
+        from_socket.links.append(link)
+        if position is None:
+            to_socket.links.append(link)
+        else:
+            to_socket.links.insert(position, link)
+        self._links[link] = None
+        return link
+
+    def unlink(self, link: PlanLink) -> None:
+        """
+        删除连接
+        """
+        link.from_socket.links.remove(link)
+        link.to_socket.links.remove(link)
+        del self._links[link]
+
+    def redirect_links(self, from_socket: PlanSocket, to_source: PlanSocket) -> None:
+        """
+        把输出套接字的所有连接改为从另一个输出套接字出发；连接对象不变，
+        因此在目标输入套接字连接列表中的位置（多连接输入的数据顺序）保持不变
+
+        参数:
+            from_socket: 原输出套接字
+            to_source: 新的输出套接字
+        """
+        for link in from_socket.links:
+            link.from_socket = to_source
+            link.from_node = to_source.node
+            to_source.links.append(link)
+        from_socket.links = []
+
+    def remove_nodes(self, names: Set[str]) -> None:
+        """
+        删除节点及其所有连接，每个受影响的套接字只重建一次连接列表
+        """
+        if not names:
+            return
+        removed = {link for link in self._links if link.from_node.name in names or link.to_node.name in names}
+        sockets = {id(socket): socket for link in removed for socket in (link.from_socket, link.to_socket)}
+        for socket in sockets.values():
+            socket.links = [link for link in socket.links if link not in removed]
+        for link in removed:
+            del self._links[link]
+        self.nodes = _PlanNodes(node for node in self.nodes if node.name not in names)
+
+    def copy(self) -> 'ExecutionPlan':
+        """
+        复制执行计划，修改副本不影响缓存的计划
+        """
+        plan = ExecutionPlan(self.node_tree)
+        sockets: Dict[int, PlanSocket] = {}
+        for node in self.nodes:
+            clone = node.copy()
+            plan.nodes.append(clone)
+            for old, new in zip(node.inputs + node.outputs, clone.inputs + clone.outputs):
+                sockets[id(old)] = new
+        # 按输入套接字遍历连接，保持多连接输入的数据顺序
+        for node in self.nodes:
+            for socket in node.inputs:
+                for link in socket.links:
+                    plan.link(sockets[id(link.from_socket)], sockets[id(link.to_socket)])
+        return plan
+
+    @classmethod
+    def from_tree(cls, node_tree: Any, resolve: Callable[[str], Any] = _default_resolver) -> 'ExecutionPlan':
+        """
+        不使用缓存，直接由节点树构建执行计划
+        """
+        plan = cls(node_tree)
+        _inline(plan, node_tree, "", None, resolve, [], [])
+        return plan
+
+
+def _call_target(node: Any) -> str:
+    return str(node.get_parameter("workflow", "") or "")
+
+
+def _is_sub_workflow(node: Any) -> bool:
+    return getattr(node, "blueprint_id", "") == SUB_WORKFLOW_BLUEPRINT
+
+
+def _signature(node_tree: Any, resolve: Callable[[str], Any], stack: Tuple[str, ...] = ()) -> Tuple:
+    """
+    计算节点树及其调用的所有子工作流的版本签名，任一节点树的拓扑或调用目标变化时签名改变
+    """
+    if node_tree.name in stack:
+        raise ValueError(f"Recursive sub-workflow call: {' -> '.join(stack + (node_tree.name,))}")
+    stack = stack + (node_tree.name,)
+    calls = []
+    for node in node_tree.nodes:
+        if _is_sub_workflow(node):
+            target = _call_target(node)
+            callee = resolve(target)
+            calls.append((node.name, target, _signature(callee, resolve, stack) if callee is not None else None))
+    return (node_tree.name, getattr(node_tree, "graph_version", 0), tuple(calls))
+
+
+def _inline(plan: ExecutionPlan, node_tree: Any, prefix: str, caller: Any, resolve: Callable[[str], Any],
+            entry: List[PlanSocket], exit_sockets: List[PlanSocket]) -> None:
+    """
+    把节点树的节点和连接加入执行计划
+
+    参数:
+        plan: 执行计划
+        node_tree: 要展开的节点树
+        prefix: 节点名称前缀，顶层为空
+        caller: 顶层调用节点，顶层节点树为None
+        resolve: 按名称查找节点树的函数
+        entry: 收集子工作流输入节点的输入套接字
+        exit_sockets: 收集子工作流输出节点的输出套接字
+    """
+    # 原套接字指针 -> 计划中的输出/输入套接字；子工作流调用节点的套接字映射到被调用工作流的输入输出节点
+    outputs: Dict[int, List[PlanSocket]] = {}
+    inputs: Dict[int, List[PlanSocket]] = {}
+
+    for node in node_tree.nodes:
+        name = prefix + node.name
+        if _is_sub_workflow(node):
+            target = _call_target(node)
+            callee = resolve(target)
+            if callee is None:
+                raise ValueError(f"Sub-workflow '{target}' called by node '{name}' was not found")
+            callee_entry: List[PlanSocket] = []
+            callee_exit: List[PlanSocket] = []
+            _inline(plan, callee, name + NAME_SEPARATOR, caller or node, resolve, callee_entry, callee_exit)
+            if len(callee_exit) > 1:
+                raise ValueError(f"Sub-workflow '{target}' must contain at most one Workflow Output node")
+            for socket in node.inputs:
+                if socket.name == SUB_WORKFLOW_INPUT:
+                    inputs[socket.as_pointer()] = callee_entry
+            for socket in node.outputs:
+                if socket.name == SUB_WORKFLOW_OUTPUT:
+                    outputs[socket.as_pointer()] = callee_exit
+            continue
+
+        plan_node = PlanNode(node, name, caller)
+        plan.nodes.append(plan_node)
+        if getattr(node, "blueprint_id", "") == WORKFLOW_INPUT_BLUEPRINT and prefix:
+            # 输入节点增加一个输入套接字，接收调用方连接到子工作流节点的数据
+            port = PlanSocket(plan_node, name=WORKFLOW_PORT)
+            plan_node.inputs.append(port)
+            entry.append(port)
+        if getattr(node, "blueprint_id", "") == WORKFLOW_OUTPUT_BLUEPRINT and prefix:
+            exit_sockets.extend(socket for socket in plan_node.outputs if socket.name == WORKFLOW_PORT)
+        for source, socket in zip(node.inputs, plan_node.inputs):
+            inputs[source.as_pointer()] = [socket]
+        for source, socket in zip(node.outputs, plan_node.outputs):
+            outputs[source.as_pointer()] = [socket]
+
+    for link in node_tree.links:
+        for from_socket in outputs.get(link.from_socket.as_pointer(), ()):
+            for to_socket in inputs.get(link.to_socket.as_pointer(), ()):
+                plan.link(from_socket, to_socket)
+
+
+def compile_workflow(node_tree: Any, resolve: Callable[[str], Any] = _default_resolver) -> Any:
+    """
+    编译工作流：把子工作流调用节点内联为被调用工作流的节点，节点名称为"调用节点/子节点"，
+    执行器只需执行一个平坦的图。结果按调用方缓存，调用方或任一被调用工作流变化后重新编译
+
+    参数:
+        node_tree: 要执行的节点树
+        resolve: 按名称查找节点树的函数
+
+    返回:
+        没有子工作流时返回节点树本身，否则返回ExecutionPlan
+    """
+    signature = _signature(node_tree, resolve)
+    if not signature[2]:
+        return node_tree
+
+    key = node_tree.as_pointer()
+    cached = _plan_cache.get(key)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+
+    plan = ExecutionPlan(node_tree)
+    _inline(plan, node_tree, "", None, resolve, [], [])
+    _plan_cache[key] = (signature, plan)
+    return plan
+
+
+def clear_plan_cache() -> None:
+    """
+    清空已编译的执行计划和由其优化得到的计划
+    """
+    from .n8n_optimizer import clear_optimized_plans
+    _plan_cache.clear()
+    clear_optimized_plans()
+
+
+@persistent
+def _reset_plan_cache(*_args: Any) -> None:
+    """
+    打开文件、撤销和重做后清空执行计划缓存
+    """
+    clear_plan_cache()
+
+
+def register_cache_handlers() -> None:
+    """
+    注册清空执行计划缓存的应用事件处理函数
+    """
+    for name in _CACHE_RESET_HANDLERS:
+        handlers = getattr(bpy.app.handlers, name)
+        if _reset_plan_cache not in handlers:
+            handlers.append(_reset_plan_cache)
+
+
+def unregister_cache_handlers() -> None:
+    """
+    注销应用事件处理函数并清空执行计划缓存
+    """
+    for name in _CACHE_RESET_HANDLERS:
+        handlers = getattr(bpy.app.handlers, name)
+        if _reset_plan_cache in handlers:
+            handlers.remove(_reset_plan_cache)
+    clear_plan_cache()
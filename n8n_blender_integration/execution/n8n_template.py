@@ -0,0 +1,190 @@
+import json
+import re
+from datetime import date, datetime
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .n8n_path import compile_path, PathError
+
+# 模板中的表达式片段 {{ ... }}
+_TEMPLATE_PATTERN = re.compile(r"\{\{(.*?)\}\}", re.DOTALL)
+
+# 表达式根变量，例如 $json，后面可以跟 .field、[0]、["field"] 形式的路径
+_ROOT_PATTERN = re.compile(r"\s*\$(\w+)")
+
+# 未由数据项提供时按需计算的内置变量
+_DEFAULT_VARIABLES: Dict[str, Callable[[], Any]] = {
+    "now": lambda: datetime.now().isoformat(),
+    "today": lambda: date.today().isoformat(),
+}
+
+# n8n参数值以"="开头表示表达式
+_EXPRESSION_MARKER = "="
+
+
+def _compile_slot(expression: str) -> Optional[Callable[[Any, int], Any]]:
+    """
+    将 $json.a[0]["b"]、$index、$now 形式的表达式编译为取值函数
+
+    参数:
+        expression: {{ }} 中的表达式文本
+
+    返回:
+        取值函数 resolve(item, index)，不支持的表达式（需要JavaScript求值）返回None
+    """
+    match = _ROOT_PATTERN.match(expression)
+    if not match:
+        return None
+    root = match.group(1)
+    rest = expression[match.end():].strip()
+    if rest and rest[0] not in ".[":
+        return None
+    try:
+        get = compile_path(rest).get
+    except PathError:
+        return None
+
+    if root == "json":
+        return lambda item, index: get(item)
+    if root == "index":
+        return lambda item, index: get(index)
+    default = _DEFAULT_VARIABLES.get(root)
+    if default is None:
+        return None
+    return lambda item, index: get(default())
+
+
+def _to_text(value: Any) -> str:
+    """
+    将表达式结果转换为模板文本
+    """
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, ensure_ascii=False)
+    return str(value)
+
+
+class CompiledTemplate:
+    """
+    已编译的参数模板，文本在编译时拆分为字面量和表达式片段
+    """
+
+    def __init__(self, source: str):
+        """
+        拆分模板文本
+
+        参数:
+            source: 参数文本，例如 ={{ $json.url }} 或 https://a/{{ $json.id }}
+        """
+        self.source = source
+        text = source[len(_EXPRESSION_MARKER):] if source.startswith(_EXPRESSION_MARKER) else source
+
+        # 字面量片段直接放入parts，表达式片段的位置记录在slots中
+        self.parts: List[str] = []
+        self.slots: List[Tuple[int, Callable[[Any, int], Any]]] = []
+        self.unsupported: List[str] = []
+
+        position = 0
+        for match in _TEMPLATE_PATTERN.finditer(text):
+            if match.start() > position:
+                self.parts.append(text[position:match.start()])
+            resolve = _compile_slot(match.group(1))
+            if resolve is None:
+                # 不支持的表达式按原文保留
+                self.unsupported.append(match.group(1).strip())
+                self.parts.append(match.group(0))
+            else:
+                self.slots.append((len(self.parts), resolve))
+                self.parts.append("")
+            position = match.end()
+        if position < len(text):
+            self.parts.append(text[position:])
+
+        self.text = "".join(self.parts) if not self.slots else None
+        # 整个参数只有一个表达式时保留结果的原始类型
+        self.is_single_expression = len(self.parts) == 1 and len(self.slots) == 1
+
+    @property
+    def is_static(self) -> bool:
+        """
+        模板中是否没有可求值的表达式
+        """
+        return not self.slots
+
+    def render(self, item: Any = None, index: int = 0) -> Any:
+        """
+        使用数据项渲染模板
+
+        参数:
+            item: 数据项，对应 $json
+            index: 数据项序号，对应 $index
+
+        返回:
+            单个表达式时为表达式结果，否则为拼接后的文本
+        """
+        if not self.slots:
+            return self.text
+        if self.is_single_expression:
+            return self.slots[0][1](item, index)
+
+        parts = self.parts.copy()
+        for slot, resolve in self.slots:
+            parts[slot] = _to_text(resolve(item, index))
+        return "".join(parts)
+
+    def render_many(self, items: List[Any]) -> List[Any]:
+        """
+        使用一批数据项渲染模板
+
+        参数:
+            items: 数据项列表
+
+        返回:
+            每个数据项对应的渲染结果
+        """
+        if not self.slots:
+            return [self.text] * len(items)
+        if self.is_single_expression:
+            resolve = self.slots[0][1]
+            return [resolve(item, index) for index, item in enumerate(items)]
+        return [self.render(item, index) for index, item in enumerate(items)]
+
+
+@lru_cache(maxsize=1024)
+def compile_template(source: str) -> CompiledTemplate:
+    """
+    编译模板，相同文本共享编译结果
+
+    参数:
+        source: 参数文本
+
+    返回:
+        已编译的模板
+    """
+    return CompiledTemplate(source)
+
+
+def is_template(value: Any) -> bool:
+    """
+    检查参数值是否需要按模板渲染：以"="开头的n8n表达式或包含 {{ }} 的文本
+    """
+    return isinstance(value, str) and (value.startswith(_EXPRESSION_MARKER) or ("{{" in value and "}}" in value))
+
+
+def resolve_column(value: Any, items: List[Any]) -> List[Any]:
+    """
+    计算参数在一批数据项上的取值，模板按数据项渲染，其他值保持不变
+
+    参数:
+        value: 参数值
+        items: 数据项列表
+
+    返回:
+        每个数据项对应的参数值
+    """
+    if not is_template(value):
+        return [value] * len(items)
+    return compile_template(value).render_many(items)
@@ -0,0 +1,118 @@
+import statistics
+import threading
+from collections import deque
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# 每个节点保留的最近耗时样本数
+DEFAULT_WINDOW = 20
+
+# 没有任何历史耗时时节点的估计耗时（秒），此时优先级退化为到汇节点的最长路径长度
+DEFAULT_NODE_DURATION = 0.001
+
+
+class NodeTimingHistory:
+    """
+    节点耗时历史，按(工作流, 节点)和蓝图分别保留最近的样本，用于估计节点耗时
+    """
+
+    def __init__(self, window: int = DEFAULT_WINDOW):
+        """
+        初始化耗时历史
+
+        参数:
+            window: 每个节点保留的最近样本数
+        """
+        self.window = window
+        self._nodes: Dict[Tuple[str, str], deque] = {}
+        self._blueprints: Dict[str, deque] = {}
+        self._lock = threading.Lock()
+
+    def record(self, workflow: str, node: str, blueprint_id: str, seconds: float) -> None:
+        """
+        记录一次节点执行耗时
+
+        参数:
+            workflow: 工作流（节点树）名称
+            node: 节点名称
+            blueprint_id: 节点的蓝图ID
+            seconds: 耗时（秒）
+        """
+        with self._lock:
+            self._nodes.setdefault((workflow, node), deque(maxlen=self.window)).append(seconds)
+            if blueprint_id:
+                self._blueprints.setdefault(blueprint_id, deque(maxlen=self.window)).append(seconds)
+
+    def median(self, workflow: str, node: str, blueprint_id: str = "") -> Optional[float]:
+        """
+        获取节点耗时的中位数，节点没有记录时使用同一蓝图的记录
+
+        返回:
+            耗时中位数（秒），没有记录时返回None
+        """
+        with self._lock:
+            samples = self._nodes.get((workflow, node)) or self._blueprints.get(blueprint_id)
+            return statistics.median(samples) if samples else None
+
+    def estimate(self, workflow: str, nodes: Iterable[Any]) -> Dict[str, float]:
+        """
+        估计一组节点的耗时
+
+        参数:
+            workflow: 工作流名称
+            nodes: 节点列表
+
+        返回:
+            节点名称到估计耗时的字典，没有记录的节点使用DEFAULT_NODE_DURATION
+        """
+        estimates = {}
+        for node in nodes:
+            median = self.median(workflow, node.name, getattr(node, "blueprint_id", ""))
+            estimates[node.name] = DEFAULT_NODE_DURATION if median is None else median
+        return estimates
+
+    def clear(self, workflow: Optional[str] = None) -> None:
+        """
+        清空耗时历史
+
+        参数:
+            workflow: 只清空该工作流的节点记录，为None时全部清空
+        """
+        with self._lock:
+            if workflow is None:
+                self._nodes.clear()
+                self._blueprints.clear()
+            else:
+                for key in [key for key in self._nodes if key[0] == workflow]:
+                    del self._nodes[key]
+
+
+def upward_ranks(order: List[Any], successors: Dict[str, List[str]],
+                 durations: Dict[str, float]) -> Dict[str, float]:
+    """
+    计算HEFT向上秩：节点自身耗时加上后继中最大的向上秩，即从该节点开始到结束的最长耗时路径
+
+    参数:
+        order: 按拓扑顺序排列的节点
+        successors: 节点名称到后继节点名称的字典（不含循环回边）
+        durations: 节点名称到估计耗时的字典
+
+    返回:
+        节点名称到向上秩的字典
+    """
+    ranks: Dict[str, float] = {}
+    for node in reversed(order):
+        name = node.name
+        ranks[name] = durations.get(name, DEFAULT_NODE_DURATION) + max(
+            (ranks.get(successor, 0.0) for successor in successors.get(name, ())), default=0.0)
+    return ranks
+
+
+# 全局耗时历史
+_node_timings = NodeTimingHistory()
+
+
+def get_node_timings() -> NodeTimingHistory:
+    """
+    获取全局共享的节点耗时历史
+    """
+    return _node_timings
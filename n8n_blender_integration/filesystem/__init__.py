@@ -0,0 +1,3 @@
+from .n8n_file_reader import read_file, read_whole, iter_lines, iter_chunks
+from .n8n_file_writer import write_file, write_items, FileWriterRegistry
+from .n8n_json_stream import iter_json_array, iter_json_file, loads as json_loads, JSON_STREAM_BACKEND
@@ -0,0 +1,132 @@
+import codecs
+import mmap
+import os
+from typing import Iterator
+
+# 分块读取的默认块大小
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+
+# 读取模式
+READ_MODES = ("whole", "lines", "chunks")
+
+
+def _newline_compatible(encoding: str) -> bool:
+    """
+    检查编码中的换行符是否为单字节b"\\n"，可以直接在字节上查找行边界
+    """
+    try:
+        return "\n".encode(encoding) == b"\n"
+    except LookupError:
+        return False
+
+
+def read_whole(file_path: str, encoding: str = "utf-8", errors: str = "strict") -> str:
+    """
+    通过mmap读取整个文件，直接从映射的内存解码，不额外复制字节
+
+    参数:
+        file_path: 文件路径
+        encoding: 文件编码
+        errors: 解码错误处理方式
+
+    返回:
+        文件内容
+    """
+    with open(file_path, "rb") as f:
+        # 空文件无法映射
+        if os.fstat(f.fileno()).st_size == 0:
+            return ""
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            with memoryview(mapped) as view:
+                return str(view, encoding, errors)
+
+
+def iter_lines(file_path: str, encoding: str = "utf-8", errors: str = "strict") -> Iterator[str]:
+    """
+    惰性逐行读取文件，每行不含换行符
+
+    参数:
+        file_path: 文件路径
+        encoding: 文件编码
+        errors: 解码错误处理方式
+
+    返回:
+        行迭代器
+    """
+    if not _newline_compatible(encoding):
+        # UTF-16等编码无法在字节上查找换行符，使用文本模式读取
+        with open(file_path, "r", encoding=encoding, errors=errors, newline=None) as f:
+            for line in f:
+                yield line.rstrip("\n")
+        return
+
+    with open(file_path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            position = 0
+            while position < size:
+                end = mapped.find(b"\n", position)
+                if end == -1:
+                    end = size
+                line = mapped[position:end]
+                if line.endswith(b"\r"):
+                    line = line[:-1]
+                yield line.decode(encoding, errors)
+                position = end + 1
+
+
+def iter_chunks(file_path: str, chunk_size: int = DEFAULT_CHUNK_SIZE, encoding: str = "utf-8",
+                errors: str = "strict") -> Iterator[str]:
+    """
+    按固定大小分块读取文件，多字节字符不会被拆分到两个块中
+
+    参数:
+        file_path: 文件路径
+        chunk_size: 每块字节数
+        encoding: 文件编码
+        errors: 解码错误处理方式
+
+    返回:
+        文本块迭代器
+    """
+    decoder = codecs.getincrementaldecoder(encoding)(errors)
+    with open(file_path, "rb", buffering=0) as f:
+        while True:
+            data = f.read(chunk_size)
+            if not data:
+                break
+            text = decoder.decode(data)
+            if text:
+                yield text
+    tail = decoder.decode(b"", final=True)
+    if tail:
+        yield tail
+
+
+def read_file(file_path: str, mode: str = "whole", encoding: str = "utf-8",
+              chunk_size: int = DEFAULT_CHUNK_SIZE, errors: str = "strict"):
+    """
+    按模式读取文件
+
+    参数:
+        file_path: 文件路径
+        mode: whole（整个文件）、lines（逐行）或chunks（分块）
+        encoding: 文件编码
+        chunk_size: chunks模式的块大小
+        errors: 解码错误处理方式
+
+    返回:
+        whole模式返回字符串，其他模式返回迭代器
+    """
+    if mode == "whole":
+        return read_whole(file_path, encoding, errors)
+    # 先检查文件，使错误在节点执行时而不是下游读取时出现
+    if not os.path.isfile(file_path):
+        raise FileNotFoundError(f"File not found: {file_path}")
+    if mode == "lines":
+        return iter_lines(file_path, encoding, errors)
+    if mode == "chunks":
+        return iter_chunks(file_path, max(1, int(chunk_size)), encoding, errors)
+    raise ValueError(f"Unsupported read mode: {mode}")
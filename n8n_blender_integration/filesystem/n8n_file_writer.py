@@ -0,0 +1,235 @@
+import json
+import os
+import queue
+import shutil
+import tempfile
+import threading
+from concurrent.futures import Future
+from typing import Dict, Any, Iterable, Optional
+
+# 合并写入的缓冲区大小（字节）
+DEFAULT_BUFFER_SIZE = 1024 * 1024
+
+# 写入线程空闲多久后退出（秒）
+_WRITER_IDLE_TIMEOUT = 5.0
+
+# 支持的写入模式
+WRITE_MODES = ("w", "a", "x")
+
+
+def _default_file_mode() -> int:
+    """
+    新文件的默认权限（按当前umask）
+    """
+    umask = os.umask(0)
+    os.umask(umask)
+    return 0o666 & ~umask
+
+
+# 导入时读取一次umask，避免在写入线程中修改进程umask
+_NEW_FILE_MODE = _default_file_mode()
+
+
+def _item_text(item: Any) -> str:
+    """
+    将数据项转换为写入的文本，字典和列表写为JSON
+    """
+    if isinstance(item, str):
+        return item
+    if isinstance(item, (bytes, bytearray)):
+        return bytes(item).decode("utf-8")
+    if isinstance(item, (dict, list)):
+        return json.dumps(item, ensure_ascii=False)
+    return "" if item is None else str(item)
+
+
+def write_items(file_path: str, items: Iterable[Any], mode: str = "w", encoding: str = "utf-8",
+                line_ending: str = "\n", fsync: bool = False,
+                buffer_size: int = DEFAULT_BUFFER_SIZE) -> int:
+    """
+    将数据项合并为大块写入文件。覆盖和新建模式先写临时文件，完成后原子替换目标文件；
+    追加模式直接在文件末尾按批写入，耗时只与新写入的数据量有关
+
+    参数:
+        file_path: 目标文件路径
+        items: 数据项序列，每项后追加line_ending
+        mode: w（覆盖）、a（追加）或x（文件已存在时失败）
+        encoding: 文件编码
+        line_ending: 每个数据项后追加的文本
+        fsync: 是否在每批写入后调用fsync
+        buffer_size: 每批写入的字符数
+
+    返回:
+        写入的字节数
+    """
+    if mode not in WRITE_MODES:
+        raise ValueError(f"Unsupported write mode: {mode}")
+    if mode == "x" and os.path.exists(file_path):
+        raise FileExistsError(f"File already exists: {file_path}")
+
+    directory = os.path.dirname(os.path.abspath(file_path))
+    os.makedirs(directory, exist_ok=True)
+    if mode == "a":
+        with open(file_path, "ab") as f:
+            return _write_batches(f, items, encoding, line_ending, fsync, buffer_size)
+
+    # 临时文件与目标文件在同一目录，保证os.replace是原子操作
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            if os.path.exists(file_path):
+                shutil.copymode(file_path, temp_path)
+            else:
+                os.chmod(temp_path, _NEW_FILE_MODE)
+            written = _write_batches(f, items, encoding, line_ending, fsync, buffer_size)
+
+        if mode == "x":
+            # 链接在目标已存在时失败，避免覆盖其他进程刚创建的文件
+            try:
+                os.link(temp_path, file_path)
+            except FileExistsError:
+                raise
+            except OSError:
+                # 文件系统不支持硬链接
+                if os.path.exists(file_path):
+                    raise FileExistsError(f"File already exists: {file_path}")
+                os.replace(temp_path, file_path)
+            else:
+                os.remove(temp_path)
+        else:
+            os.replace(temp_path, file_path)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+    return written
+
+
+def _write_batches(f, items: Iterable[Any], encoding: str, line_ending: str, fsync: bool,
+                   buffer_size: int) -> int:
+    """
+    把数据项合并为大块写入已打开的文件
+
+    返回:
+        写入的字节数
+    """
+    written = 0
+    pending = []
+    pending_size = 0
+    for item in items:
+        text = _item_text(item) + line_ending
+        pending.append(text)
+        pending_size += len(text)
+        if pending_size >= buffer_size:
+            written += _flush(f, pending, encoding, fsync)
+            pending = []
+            pending_size = 0
+    if pending:
+        written += _flush(f, pending, encoding, fsync)
+    return written
+
+
+def _flush(f, pending, encoding: str, fsync: bool) -> int:
+    """
+    写入一批缓冲的文本
+    """
+    data = "".join(pending).encode(encoding)
+    f.write(data)
+    if fsync:
+        f.flush()
+        os.fsync(f.fileno())
+    return len(data)
+
+
+class _PathWriter(threading.Thread):
+    """
+    单个路径的写入线程，按提交顺序依次执行写入任务
+    """
+
+    def __init__(self, registry: 'FileWriterRegistry', key: str):
+        super().__init__(name=f"n8n-file-writer:{os.path.basename(key)}", daemon=True)
+        self.registry = registry
+        self.key = key
+        self.jobs: "queue.Queue" = queue.Queue()
+
+    def run(self) -> None:
+        while True:
+            try:
+                future, args, kwargs = self.jobs.get(timeout=_WRITER_IDLE_TIMEOUT)
+            except queue.Empty:
+                # 空闲时退出，退出前确认没有新提交的任务
+                if self.registry.retire(self):
+                    return
+                continue
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(write_items(*args, **kwargs))
+            except BaseException as e:
+                future.set_exception(e)
+
+
+class FileWriterRegistry:
+    """
+    写入线程注册表，同一路径的写入由同一个线程串行执行
+    """
+
+    def __init__(self):
+        self._writers: Dict[str, _PathWriter] = {}
+        self._lock = threading.Lock()
+
+    def submit(self, file_path: str, items: Iterable[Any], **options: Any) -> Future:
+        """
+        提交写入任务
+
+        参数:
+            file_path: 目标文件路径
+            items: 数据项序列
+            options: 传给write_items的其他参数
+
+        返回:
+            写入结果（字节数）的Future
+        """
+        key = os.path.realpath(file_path)
+        future: Future = Future()
+        with self._lock:
+            writer = self._writers.get(key)
+            if writer is None:
+                writer = _PathWriter(self, key)
+                self._writers[key] = writer
+                writer.start()
+            writer.jobs.put((future, (file_path, items), options))
+        return future
+
+    def retire(self, writer: _PathWriter) -> bool:
+        """
+        移除空闲的写入线程，队列中仍有任务时返回False
+        """
+        with self._lock:
+            if not writer.jobs.empty():
+                return False
+            if self._writers.get(writer.key) is writer:
+                del self._writers[writer.key]
+            return True
+
+
+# 全局写入线程注册表
+_file_writers = FileWriterRegistry()
+
+
+def write_file(file_path: str, items: Iterable[Any], timeout: Optional[float] = None, **options: Any) -> int:
+    """
+    通过路径对应的写入线程写入文件并等待完成
+
+    参数:
+        file_path: 目标文件路径
+        items: 数据项序列
+        timeout: 等待的最长时间
+        options: 传给write_items的其他参数
+
+    返回:
+        写入的字节数
+    """
+    return _file_writers.submit(file_path, items, **options).result(timeout)
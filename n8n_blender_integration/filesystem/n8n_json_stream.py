@@ -0,0 +1,249 @@
+import codecs
+import itertools
+import json
+import re
+from typing import Any, Iterable, Iterator, Union
+
+# 可选的增量解析后端，安装了ijson时使用其C实现（yajl2_c），否则使用标准库
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+# 可选的快速整体解析后端
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# 流式读取的默认块大小
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+# 当前使用的流式解析后端名称
+JSON_STREAM_BACKEND = f"ijson/{ijson.backend}" if ijson is not None else "json"
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+# 数值可能继续的字符，数值后面只剩这些字符时说明数值可能在块边界被截断（如"12."、"1e"、"1e+"）
+_NUMBER_TAIL = re.compile(r"[0-9.eE+\-]*")
+
+JsonSource = Union[str, bytes, bytearray, memoryview, Iterable[Union[str, bytes]], Any]
+
+
+def loads(text: Union[str, bytes]) -> Any:
+    """
+    整体解析JSON，安装了orjson时使用orjson
+
+    参数:
+        text: JSON文本
+
+    返回:
+        解析结果
+    """
+    if orjson is not None:
+        try:
+            return orjson.loads(text)
+        except orjson.JSONDecodeError as e:
+            raise ValueError(f"Invalid JSON: {e}") from e
+    return json.loads(text)
+
+
+def _iter_raw_chunks(source: JsonSource, chunk_size: int) -> Iterator[Union[str, bytes]]:
+    """
+    将各种输入统一为文本或字节块的迭代器
+    """
+    if isinstance(source, (str, bytes, bytearray, memoryview)):
+        yield bytes(source) if not isinstance(source, str) else source
+    elif hasattr(source, "read"):
+        while True:
+            chunk = source.read(chunk_size)
+            if not chunk:
+                return
+            yield chunk
+    else:
+        for chunk in source:
+            if chunk:
+                yield chunk
+
+
+def _iter_text(chunks: Iterable[Union[str, bytes]]) -> Iterator[str]:
+    """
+    将字节块增量解码为UTF-8文本，多字节字符跨块时不会出错
+    """
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    for chunk in chunks:
+        text = decoder.decode(chunk) if not isinstance(chunk, str) else chunk
+        if text:
+            yield text
+    tail = decoder.decode(b"", final=True)
+    if tail:
+        yield tail
+
+
+class _ChunkReader:
+    """
+    将块迭代器包装为ijson可读取的二进制文件对象
+    """
+
+    def __init__(self, chunks: Iterator[Union[str, bytes]]):
+        self._chunks = chunks
+        self._buffer = b""
+
+    def read(self, size: int = -1) -> bytes:
+        while size < 0 or len(self._buffer) < size:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                break
+            self._buffer += chunk.encode("utf-8") if isinstance(chunk, str) else bytes(chunk)
+        if size < 0:
+            data, self._buffer = self._buffer, b""
+        else:
+            data, self._buffer = self._buffer[:size], self._buffer[size:]
+        return data
+
+
+def _iter_items_ijson(chunks: Iterator[Union[str, bytes]], chunk_size: int) -> Iterator[Any]:
+    """
+    使用ijson逐项解析顶层数组
+    """
+    try:
+        # use_float让小数解析为float而不是Decimal，与json模块的结果一致（超出64位的整数会解析失败）
+        yield from ijson.items(_ChunkReader(chunks), "item", buf_size=chunk_size, use_float=True)
+    except ijson.JSONError as e:
+        raise ValueError(f"Invalid JSON: {e}") from e
+
+
+def _iter_items_stdlib(text: str, chunks: Iterator[str]) -> Iterator[Any]:
+    """
+    使用标准库逐项解析顶层数组，缓冲区只保留尚未解析的文本
+
+    参数:
+        text: 已读取的文本，从数组的"["之后开始
+        chunks: 剩余的文本块
+    """
+    decoder = json.JSONDecoder()
+    buffer, pos, eof = text, 0, False
+    expect_value = True
+    first = True
+
+    while True:
+        pos = _WHITESPACE.match(buffer, pos).end()
+        if pos == len(buffer):
+            if eof:
+                raise ValueError("Invalid JSON: unterminated array")
+            chunk = next(chunks, None)
+            if chunk is None:
+                eof = True
+            else:
+                buffer = buffer[pos:] + chunk
+                pos = 0
+            continue
+
+        char = buffer[pos]
+        if not expect_value:
+            # 上一项之后只能是逗号或数组结束
+            if char == "]":
+                return
+            if char != ",":
+                raise ValueError(f"Invalid JSON: expected ',' or ']' but found {char!r}")
+            pos += 1
+            expect_value = True
+            continue
+        if first and char == "]":
+            return
+
+        try:
+            item, end = decoder.raw_decode(buffer, pos)
+            # 数值等在缓冲区末尾结束的值可能被截断，读取更多文本后重新解析；
+            # 数值后面只剩小数点、指数等字符时同样可能被截断
+            if eof:
+                complete = True
+            elif char in "-0123456789":
+                complete = _NUMBER_TAIL.match(buffer, end).end() < len(buffer)
+            else:
+                complete = end < len(buffer)
+        except json.JSONDecodeError:
+            if eof:
+                raise
+            complete = False
+
+        if not complete:
+            # 一次读取的文本至少与未解析部分一样多，大数据项的重复解析次数为对数级
+            pending = len(buffer) - pos
+            parts = [buffer[pos:]]
+            read = 0
+            while read < pending:
+                chunk = next(chunks, None)
+                if chunk is None:
+                    eof = True
+                    break
+                parts.append(chunk)
+                read += len(chunk)
+            buffer, pos = "".join(parts), 0
+            continue
+
+        yield item
+        pos = end
+        expect_value = False
+        first = False
+        # 丢弃已解析的文本
+        if pos > DEFAULT_CHUNK_SIZE:
+            buffer, pos = buffer[pos:], 0
+
+
+def _skip_leading_whitespace(chunks: Iterator[Union[str, bytes]]) -> Union[str, bytes]:
+    """
+    跳过开头的空白和BOM，返回第一个非空的块
+    """
+    for chunk in chunks:
+        if isinstance(chunk, str):
+            chunk = chunk.lstrip(" \t\n\r\ufeff")
+        else:
+            chunk = bytes(chunk).lstrip(b" \t\n\r")
+            if chunk.startswith(codecs.BOM_UTF8):
+                chunk = chunk[len(codecs.BOM_UTF8):].lstrip(b" \t\n\r")
+        if chunk:
+            return chunk
+    raise ValueError("Invalid JSON: empty input")
+
+
+def iter_json_array(source: JsonSource, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[Any]:
+    """
+    增量解析顶层为数组的JSON，每解析完一项就产出该项，内存占用与单项大小相关，与总大小无关；
+    顶层不是数组时整体解析后作为唯一的一项产出
+
+    参数:
+        source: JSON文本、字节、可读取的文件对象或文本/字节块的迭代器
+        chunk_size: 每次读取的大小
+
+    返回:
+        数组元素的迭代器
+    """
+    chunks = _iter_raw_chunks(source, chunk_size)
+    first = _skip_leading_whitespace(chunks)
+    chunks = itertools.chain([first], chunks)
+
+    if first[:1] not in ("[", b"["):
+        yield loads("".join(_iter_text(chunks)))
+        return
+
+    if ijson is not None:
+        yield from _iter_items_ijson(chunks, chunk_size)
+    else:
+        text = _iter_text(chunks)
+        yield from _iter_items_stdlib(next(text)[1:], text)
+
+
+def iter_json_file(file_path: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[Any]:
+    """
+    增量解析JSON文件的顶层数组
+
+    参数:
+        file_path: 文件路径
+        chunk_size: 每次读取的字节数
+
+    返回:
+        数组元素的迭代器
+    """
+    with open(file_path, "rb") as f:
+        yield from iter_json_array(f, chunk_size)
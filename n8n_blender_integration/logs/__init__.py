@@ -0,0 +1 @@
+from .n8n_log_sink import LogSink, LogEntry, LOG_LEVELS, LOG_PAGE_SIZE, get_log_sink, log
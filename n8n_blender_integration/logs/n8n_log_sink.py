@@ -0,0 +1,253 @@
+import itertools
+import os
+import tempfile
+import threading
+import time
+from collections import deque
+from typing import List, NamedTuple, Optional, Tuple
+
+# 日志级别
+LOG_LEVELS = ("debug", "info", "warning", "error")
+_LEVEL_RANK = {level: rank for rank, level in enumerate(LOG_LEVELS)}
+
+# 内存中保留的日志条数
+DEFAULT_CAPACITY = 10000
+
+# 日志面板每页显示的条数
+LOG_PAGE_SIZE = 20
+
+# 默认日志文件
+DEFAULT_LOG_FILE = os.path.join(tempfile.gettempdir(), "n8n_blender_logs", "workflow.log")
+
+# 单个日志文件的最大字节数和保留的历史文件数
+DEFAULT_MAX_BYTES = 5 * 1024 * 1024
+DEFAULT_BACKUP_COUNT = 3
+
+# 后台写入文件的间隔（秒）
+DEFAULT_FLUSH_INTERVAL = 0.5
+
+# 每次写入文件的最大条数
+_FLUSH_BATCH = 1000
+
+
+class LogEntry(NamedTuple):
+    """
+    日志条目
+    """
+    sequence: int
+    timestamp: float
+    level: str
+    source: str
+    message: str
+
+    def format(self) -> str:
+        """
+        格式化为日志文件中的一行
+        """
+        stamp = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(self.timestamp))
+        millis = int((self.timestamp % 1) * 1000)
+        source = f" [{self.source}]" if self.source else ""
+        return f"{stamp}.{millis:03d} {self.level.upper():<7}{source} {self.message}"
+
+
+class LogSink:
+    """
+    日志接收器：写入只追加到环形缓冲区，不加锁也不做IO，
+    后台线程定期把新条目批量写入轮转日志文件
+    """
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY, file_path: Optional[str] = DEFAULT_LOG_FILE,
+                 max_bytes: int = DEFAULT_MAX_BYTES, backup_count: int = DEFAULT_BACKUP_COUNT,
+                 flush_interval: float = DEFAULT_FLUSH_INTERVAL, echo_level: Optional[str] = "error"):
+        """
+        初始化日志接收器
+
+        参数:
+            capacity: 内存中保留的日志条数
+            file_path: 日志文件路径，为None时不写文件
+            max_bytes: 单个日志文件的最大字节数
+            backup_count: 保留的历史日志文件数
+            flush_interval: 后台写入文件的间隔
+            echo_level: 达到该级别的日志同时输出到控制台，为None时不输出
+        """
+        self.file_path = file_path
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.flush_interval = flush_interval
+        self.echo_level = echo_level
+        # deque的append和popleft在CPython中是原子操作，写日志时不需要加锁
+        self._entries: deque = deque(maxlen=capacity)
+        # 待写入文件的条目不限长度，后台线程来不及写时也不丢弃
+        self._pending: deque = deque()
+        self._sequence = itertools.count(1)
+        self._flusher: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+        self._start_lock = threading.Lock()
+
+    def log(self, level: str, message: str, source: str = "") -> None:
+        """
+        记录日志
+
+        参数:
+            level: 日志级别（debug、info、warning、error）
+            message: 日志内容
+            source: 日志来源，例如节点名称
+        """
+        if level not in _LEVEL_RANK:
+            level = "info"
+        entry = LogEntry(next(self._sequence), time.time(), level, source, str(message))
+        self._entries.append(entry)
+        if self.file_path:
+            self._pending.append(entry)
+            if self._flusher is None:
+                self._start_flusher()
+        if self.echo_level is not None and _LEVEL_RANK[level] >= _LEVEL_RANK.get(self.echo_level, 0):
+            print(entry.format())
+
+    def debug(self, message: str, source: str = "") -> None:
+        self.log("debug", message, source)
+
+    def info(self, message: str, source: str = "") -> None:
+        self.log("info", message, source)
+
+    def warning(self, message: str, source: str = "") -> None:
+        self.log("warning", message, source)
+
+    def error(self, message: str, source: str = "") -> None:
+        self.log("error", message, source)
+
+    def entries(self, min_level: str = "debug") -> List[LogEntry]:
+        """
+        获取内存中的日志条目（从旧到新）
+
+        参数:
+            min_level: 最低日志级别
+
+        返回:
+            日志条目列表
+        """
+        # 复制时缓冲区可能被其他线程修改，重试直到得到一致的快照
+        while True:
+            try:
+                snapshot = list(self._entries)
+                break
+            except RuntimeError:
+                continue
+        rank = _LEVEL_RANK.get(min_level, 0)
+        if rank == 0:
+            return snapshot
+        return [entry for entry in snapshot if _LEVEL_RANK[entry.level] >= rank]
+
+    def page(self, page: int, page_size: int = LOG_PAGE_SIZE, min_level: str = "debug") -> Tuple[List[LogEntry], int]:
+        """
+        分页获取日志，第0页为最新的条目
+
+        参数:
+            page: 页码
+            page_size: 每页条数
+            min_level: 最低日志级别
+
+        返回:
+            (本页条目（从新到旧）, 总页数)
+        """
+        entries = self.entries(min_level)
+        page_size = max(1, page_size)
+        total_pages = max(1, (len(entries) + page_size - 1) // page_size)
+        page = min(max(0, page), total_pages - 1)
+        end = len(entries) - page * page_size
+        start = max(0, end - page_size)
+        return entries[start:end][::-1], total_pages
+
+    def clear(self) -> None:
+        """
+        清空内存中的日志
+        """
+        self._entries.clear()
+
+    def _start_flusher(self) -> None:
+        with self._start_lock:
+            if self._flusher is None:
+                self._stopped.clear()
+                self._flusher = threading.Thread(target=self._flush_loop, name="n8n-log-flusher", daemon=True)
+                self._flusher.start()
+
+    def _flush_loop(self) -> None:
+        while not self._stopped.wait(self.flush_interval):
+            self.flush()
+        self.flush()
+
+    def flush(self) -> None:
+        """
+        把待写入的日志分批写入文件，每批写入前检查是否需要轮转
+        """
+        while self._pending:
+            lines = []
+            while len(lines) < _FLUSH_BATCH:
+                try:
+                    lines.append(self._pending.popleft().format())
+                except IndexError:
+                    break
+            if not lines or not self.file_path:
+                return
+            try:
+                os.makedirs(os.path.dirname(self.file_path), exist_ok=True)
+                self._rotate_if_needed()
+                with open(self.file_path, "a", encoding="utf-8") as f:
+                    f.write("\n".join(lines) + "\n")
+            except OSError as e:
+                print(f"Failed to write log file {self.file_path}: {e}")
+                return
+
+    def _rotate_if_needed(self) -> None:
+        """
+        日志文件超过大小限制时轮转：workflow.log -> workflow.log.1 -> ...
+        """
+        try:
+            if os.path.getsize(self.file_path) < self.max_bytes:
+                return
+        except OSError:
+            return
+        for index in range(self.backup_count - 1, 0, -1):
+            source = f"{self.file_path}.{index}"
+            if os.path.exists(source):
+                os.replace(source, f"{self.file_path}.{index + 1}")
+        if self.backup_count > 0:
+            os.replace(self.file_path, f"{self.file_path}.1")
+        else:
+            os.remove(self.file_path)
+
+    def close(self) -> None:
+        """
+        停止后台线程并写入剩余日志
+        """
+        flusher = self._flusher
+        if flusher is not None:
+            self._stopped.set()
+            flusher.join()
+            with self._start_lock:
+                self._flusher = None
+        # 线程退出后、_flusher清空前到达的日志不会再启动新线程，这里补写一次
+        self.flush()
+
+
+# 全局日志接收器
+_log_sink = LogSink()
+
+
+def get_log_sink() -> LogSink:
+    """
+    获取全局共享的日志接收器
+    """
+    return _log_sink
+
+
+def log(level: str, message: str, source: str = "") -> None:
+    """
+    记录日志到全局日志接收器
+
+    参数:
+        level: 日志级别
+        message: 日志内容
+        source: 日志来源
+    """
+    _log_sink.log(level, message, source)
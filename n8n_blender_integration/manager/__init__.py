@@ -1,2 +1,5 @@
 from .n8n_manager import N8nManager, global_manager
 from .n8n_parser import N8nParser
+from .n8n_validator import (WorkflowValidator, ValidationIssue, get_validator, revalidate_nodes,
+                            register_validation_handlers, unregister_validation_handlers)
+from .n8n_diff import diff_workflows, WorkflowDiff, NodeChange, MISSING
@@ -0,0 +1,324 @@
+import json
+from collections import Counter
+from typing import Any, Dict, List, NamedTuple, Optional, Set, Tuple
+
+
+class _Missing:
+    """
+    表示参数或字段在一侧不存在
+    """
+
+    def __repr__(self) -> str:
+        return "<missing>"
+
+
+MISSING = _Missing()
+
+# 节点的运行时状态字段，不属于工作流文档的内容，比较时忽略
+_RUNTIME_FIELDS = {"execution_state", "execution_result", "error_message", "index"}
+
+# 工作流级别参与比较的字段（state、execution_time等运行时字段不比较）
+_WORKFLOW_FIELDS = ("name", "description")
+
+# 连接的比较键：(源节点, 源套接字, 目标节点, 目标套接字)
+LinkKey = Tuple[str, str, str, str]
+
+
+class NodeChange(NamedTuple):
+    """
+    匹配到的节点之间的差异
+    """
+    # 新版本中的节点名称
+    name: str
+    # 旧版本中的节点名称，与name不同表示节点被重命名
+    old_name: str
+    # 除参数外发生变化的字段 -> (旧值, 新值)
+    fields: Dict[str, Tuple[Any, Any]]
+    # 发生变化的参数 -> (旧值, 新值)，新增或删除的参数一侧为MISSING
+    parameters: Dict[str, Tuple[Any, Any]]
+
+    @property
+    def is_cosmetic(self) -> bool:
+        """
+        是否只有位置或名称变化，不影响执行结果
+        """
+        return not self.parameters and all(field in ("location", "name") for field in self.fields)
+
+
+class _Node(NamedTuple):
+    """
+    统一格式后的节点
+    """
+    key: str
+    id: str
+    name: str
+    type: str
+    parameters: Dict[str, Any]
+    # 其余字段（位置等）
+    fields: Dict[str, Any]
+    data: Dict[str, Any]
+
+
+class _Document(NamedTuple):
+    """
+    统一格式后的工作流
+    """
+    fields: Dict[str, Any]
+    nodes: List[_Node]
+    links: List[LinkKey]
+
+
+def _normalize_node(data: Dict[str, Any]) -> _Node:
+    """
+    统一节点格式，兼容N8nNodeTree.serialize()、serialize_workflow()和parse_workflow_definition()的结果
+    """
+    node_id = str(data.get("id") or "")
+    name = str(data.get("name") or node_id)
+    parameters = data.get("parameters")
+    if parameters is None:
+        parameters = data.get("properties", {})
+    fields = {}
+    for field, value in data.items():
+        if field in _RUNTIME_FIELDS or field in ("id", "name", "parameters", "properties", "blueprint_id", "type"):
+            continue
+        # location和position是同一个字段在不同格式中的名称
+        fields["location" if field == "position" else field] = value
+    node_type = str(data.get("blueprint_id") or data.get("type") or "")
+    return _Node(name or node_id, node_id, name, node_type, dict(parameters or {}), fields, data)
+
+
+def _normalize(workflow: Dict[str, Any]) -> _Document:
+    """
+    统一工作流格式：连接的端点统一为节点名称
+    """
+    nodes = [_normalize_node(node_data) for node_data in workflow.get("nodes", [])]
+
+    # 连接引用节点的方式：序号（serialize）、名称或ID
+    references: Dict[Any, str] = {}
+    for position, (node, node_data) in enumerate(zip(nodes, workflow.get("nodes", []))):
+        references[node_data.get("index", position)] = node.key
+        if node.id:
+            references.setdefault(node.id, node.key)
+        references.setdefault(node.name, node.key)
+
+    links = []
+    for connection in workflow.get("connections", []):
+        if "from" in connection:
+            (from_node, from_socket), (to_node, to_socket) = connection["from"][:2], connection["to"][:2]
+        else:
+            from_node, from_socket = connection.get("from_node"), connection.get("from_socket", "")
+            to_node, to_socket = connection.get("to_node"), connection.get("to_socket", "")
+        from_key = references.get(from_node)
+        to_key = references.get(to_node)
+        if from_key is not None and to_key is not None:
+            links.append((from_key, str(from_socket), to_key, str(to_socket)))
+
+    fields = {field: workflow.get(field) for field in _WORKFLOW_FIELDS}
+    return _Document(fields, nodes, links)
+
+
+def _structural_hash(node: _Node) -> Optional[Tuple[str, str]]:
+    """
+    节点的结构哈希：类型和参数，与名称和位置无关，用于匹配被重命名的节点
+    """
+    try:
+        return node.type, json.dumps(node.parameters, sort_keys=True)
+    except (TypeError, ValueError):
+        return None
+
+
+def _match_nodes(old_nodes: List[_Node], new_nodes: List[_Node]) -> List[Tuple[_Node, _Node]]:
+    """
+    依次按ID、名称和结构哈希匹配新旧版本的节点，每个节点最多匹配一次
+
+    返回:
+        (旧节点, 新节点)列表
+    """
+    pairs = []
+    unmatched_old = list(old_nodes)
+    unmatched_new = list(new_nodes)
+
+    for key_of in (lambda node: node.id, lambda node: node.name, _structural_hash):
+        candidates: Dict[Any, List[_Node]] = {}
+        for node in unmatched_old:
+            key = key_of(node)
+            if key:
+                candidates.setdefault(key, []).append(node)
+        # 同一个键对应多个旧节点时按文档顺序配对
+        for entries in candidates.values():
+            entries.reverse()
+
+        matched_old: Set[int] = set()
+        remaining_new = []
+        for node in unmatched_new:
+            key = key_of(node)
+            entries = candidates.get(key) if key else None
+            if entries:
+                old = entries.pop()
+                matched_old.add(id(old))
+                pairs.append((old, node))
+            else:
+                remaining_new.append(node)
+        unmatched_old = [node for node in unmatched_old if id(node) not in matched_old]
+        unmatched_new = remaining_new
+        if not unmatched_old or not unmatched_new:
+            break
+    return pairs
+
+
+def _compare_nodes(old: _Node, new: _Node) -> Optional[NodeChange]:
+    """
+    比较匹配到的两个节点，没有差异时返回None
+    """
+    fields = {}
+    if old.name != new.name:
+        fields["name"] = (old.name, new.name)
+    if old.type != new.type:
+        fields["type"] = (old.type, new.type)
+    for field in old.fields.keys() | new.fields.keys():
+        old_value = old.fields.get(field, MISSING)
+        new_value = new.fields.get(field, MISSING)
+        if old_value != new_value:
+            fields[field] = (old_value, new_value)
+
+    parameters = {}
+    if old.parameters != new.parameters:
+        for parameter in old.parameters.keys() | new.parameters.keys():
+            old_value = old.parameters.get(parameter, MISSING)
+            new_value = new.parameters.get(parameter, MISSING)
+            if old_value != new_value:
+                parameters[parameter] = (old_value, new_value)
+
+    if not fields and not parameters:
+        return None
+    return NodeChange(new.key, old.key, fields, parameters)
+
+
+class WorkflowDiff:
+    """
+    两个工作流版本之间的结构差异，节点名称和连接均使用新版本中的名称
+    """
+
+    def __init__(self):
+        # 新增节点的序列化数据
+        self.added_nodes: List[Dict[str, Any]] = []
+        # 删除的节点的序列化数据（旧版本）
+        self.removed_nodes: List[Dict[str, Any]] = []
+        self.changed_nodes: List[NodeChange] = []
+        self.added_links: List[LinkKey] = []
+        self.removed_links: List[LinkKey] = []
+        # 工作流级别字段的变化 -> (旧值, 新值)
+        self.workflow_fields: Dict[str, Tuple[Any, Any]] = {}
+        # 新版本中的所有节点名称
+        self.node_names: Set[str] = set()
+
+    @property
+    def is_empty(self) -> bool:
+        return not (self.added_nodes or self.removed_nodes or self.changed_nodes
+                    or self.added_links or self.removed_links or self.workflow_fields)
+
+    @property
+    def renamed_nodes(self) -> Dict[str, str]:
+        """
+        被重命名的节点：旧名称 -> 新名称
+        """
+        return {change.old_name: change.name for change in self.changed_nodes if change.old_name != change.name}
+
+    def affected_nodes(self) -> Set[str]:
+        """
+        获取执行结果可能改变的节点（新版本中的名称）：新增节点、类型或参数变化的节点，
+        以及输入连接变化的节点；不包含下游节点，需要时由调用方沿连接传播
+
+        返回:
+            节点名称集合
+        """
+        affected = {_node_key(data) for data in self.added_nodes}
+        affected.update(change.name for change in self.changed_nodes if not change.is_cosmetic)
+        affected.update(link[2] for link in self.added_links)
+        affected.update(link[2] for link in self.removed_links)
+        # 删除的连接可能指向已删除的节点
+        return affected & self.node_names
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        转换为可以写入JSON的增量数据
+        """
+        def values(old: Any, new: Any) -> Dict[str, Any]:
+            entry = {}
+            if old is not MISSING:
+                entry["old"] = old
+            if new is not MISSING:
+                entry["new"] = new
+            return entry
+
+        return {
+            "workflow": {field: values(*change) for field, change in self.workflow_fields.items()},
+            "added_nodes": self.added_nodes,
+            "removed_nodes": [_node_key(data) for data in self.removed_nodes],
+            "changed_nodes": {
+                change.name: {
+                    "old_name": change.old_name,
+                    "fields": {field: values(*values_) for field, values_ in change.fields.items()},
+                    "parameters": {name: values(*values_) for name, values_ in change.parameters.items()},
+                }
+                for change in self.changed_nodes
+            },
+            "added_links": [list(link) for link in self.added_links],
+            "removed_links": [list(link) for link in self.removed_links],
+        }
+
+    def summary(self) -> str:
+        """
+        一行摘要
+        """
+        return (f"{len(self.added_nodes)} added, {len(self.removed_nodes)} removed, "
+                f"{len(self.changed_nodes)} changed nodes; "
+                f"{len(self.added_links)} added, {len(self.removed_links)} removed links")
+
+
+def _node_key(data: Dict[str, Any]) -> str:
+    return str(data.get("name") or data.get("id") or "")
+
+
+def diff_workflows(old: Dict[str, Any], new: Dict[str, Any]) -> WorkflowDiff:
+    """
+    比较两个序列化的工作流（N8nNodeTree.serialize()或serialize_workflow()的结果）。
+    节点先按ID、再按名称、最后按结构哈希（类型和参数）匹配，因此重命名的节点报告为变化而不是删除加新增；
+    旧版本的连接换算为新名称后再与新版本比较。耗时与节点数、连接数和参数大小成线性关系
+
+    参数:
+        old: 旧版本
+        new: 新版本
+
+    返回:
+        WorkflowDiff
+    """
+    old_document = _normalize(old)
+    new_document = _normalize(new)
+    diff = WorkflowDiff()
+    diff.node_names = {node.key for node in new_document.nodes}
+
+    for field in _WORKFLOW_FIELDS:
+        if old_document.fields[field] != new_document.fields[field]:
+            diff.workflow_fields[field] = (old_document.fields[field], new_document.fields[field])
+
+    pairs = _match_nodes(old_document.nodes, new_document.nodes)
+    renames = {old_node.key: new_node.key for old_node, new_node in pairs}
+    matched_new = {id(new_node) for _, new_node in pairs}
+
+    diff.removed_nodes = [node.data for node in old_document.nodes if node.key not in renames]
+    diff.added_nodes = [node.data for node in new_document.nodes if id(node) not in matched_new]
+    for old_node, new_node in pairs:
+        change = _compare_nodes(old_node, new_node)
+        if change is not None:
+            diff.changed_nodes.append(change)
+
+    # 旧版本的连接换算为新名称，被删除节点的连接保留旧名称
+    old_links = Counter(
+        (renames.get(from_node, from_node), from_socket, renames.get(to_node, to_node), to_socket)
+        for from_node, from_socket, to_node, to_socket in old_document.links
+    )
+    new_links = Counter(new_document.links)
+    diff.removed_links = list((old_links - new_links).elements())
+    diff.added_links = list((new_links - old_links).elements())
+    return diff
@@ -2,7 +2,7 @@ import bpy
 from typing import Dict, Any, List, Set
 from ..nodes.n8n_node_base import N8nNodeBase
 from ..nodes.n8n_node_tree import N8nNodeTree
-from ..nodes.n8n_socket import N8nSocket
+from ..nodes.n8n_socket import N8nSocket, MULTI_INPUT_LINK_LIMIT
 
 class N8nManager:
     """
@@ -222,12 +222,14 @@ n8n节点和连接管理器，负责管理节点实例和连接关系
             # 创建节点
             node = node_tree.nodes.new(type=node_type)
             node.location = location
+            node.blueprint_id = blueprint_id
             
-            # 设置节点属性
+            # 设置节点属性（蓝图属性以参数形式保存在节点上）
             if "properties" in blueprint:
-                for prop_name, prop_value in blueprint["properties"].items():
-                    if hasattr(node, prop_name):
-                        setattr(node, prop_name, prop_value)
+                for prop_name, prop_data in blueprint["properties"].items():
+                    prop_value = prop_data.get("value") if isinstance(prop_data, dict) else prop_data
+                    if prop_value is not None:
+                        node.set_parameter(prop_name, prop_value)
             
             # 创建输入套接字
             if "inputs" in blueprint:
@@ -236,11 +238,18 @@ n8n节点和连接管理器，负责管理节点实例和连接关系
                     data_type = socket_data.get("data_type", "ANY")
                     default_value = socket_data.get("default_value", "")
                     use_default = socket_data.get("use_default", False)
+                    multiple = socket_data.get("multiple", False)
+                    loop_back = socket_data.get("loop_back", False)
+                    required = socket_data.get("required", False)
                     
                     socket = node.inputs.new("N8nSocketType", socket_name)
                     socket.data_type = data_type
                     socket.default_value = default_value
                     socket.use_default_value = use_default
+                    # 多连接输入允许扇入
+                    socket.link_limit = MULTI_INPUT_LINK_LIMIT if multiple else 1
+                    socket.is_loop_back = loop_back
+                    socket.is_required = required
             
             # 创建输出套接字
             if "outputs" in blueprint:
@@ -0,0 +1,253 @@
+import bpy
+from bpy.app.handlers import persistent
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from .n8n_manager import global_manager
+from ..nodes.n8n_node_tree import N8nNodeTree
+
+# 验证状态按节点树指针保存，这些事件之后指针可能被其他数据复用，需要清空并重新验证
+_STATE_RESET_HANDLERS = ("load_post", "undo_post", "redo_post")
+
+
+class ValidationIssue(NamedTuple):
+    """
+    验证问题
+    """
+    # ERROR或WARNING
+    severity: str
+    node: str
+    socket: str
+    message: str
+
+
+# 连接的比较键：(源节点, 源套接字, 目标节点, 目标套接字, 是否有效)
+LinkKey = Tuple[str, str, str, str, bool]
+
+
+class _TreeState:
+    """
+    单个节点树的验证状态
+    """
+
+    def __init__(self):
+        self.link_keys: Set[LinkKey] = set()
+        self.nodes: Set[str] = set()
+        # 节点名称 -> 验证问题，没有问题的节点为空列表
+        self.issues: Dict[str, List[ValidationIssue]] = {}
+        # 需要在下次更新时重新验证的节点（例如属性被修改）
+        self.dirty: Set[str] = set()
+
+
+class WorkflowValidator:
+    """
+    工作流验证引擎：检查套接字类型兼容性、必需输入和悬空连接，
+    结果按节点保存，每次更新只重新验证连接或节点发生变化的节点
+    """
+
+    def __init__(self):
+        self._states: Dict[int, _TreeState] = {}
+
+    def _state(self, node_tree: Any) -> _TreeState:
+        return self._states.setdefault(node_tree.as_pointer(), _TreeState())
+
+    def update(self, node_tree: Any, full: bool = False) -> Set[str]:
+        """
+        遍历一次连接，找出自上次更新以来连接发生变化的节点并重新验证
+
+        参数:
+            node_tree: 节点树
+            full: 是否重新验证所有节点
+
+        返回:
+            重新验证的节点名称
+        """
+        state = self._state(node_tree)
+        nodes = {node.name: node for node in node_tree.nodes}
+
+        link_keys = set()
+        links_by_target: Dict[str, List[Any]] = {}
+        for link in node_tree.links:
+            target = link.to_node.name
+            link_keys.add((link.from_node.name, link.from_socket.identifier, target,
+                           link.to_socket.identifier, link.is_valid))
+            links_by_target.setdefault(target, []).append(link)
+
+        if full:
+            touched = set(nodes)
+        else:
+            # 新增或删除的连接两端的节点，以及新增和被标记的节点
+            touched = set(nodes.keys() - state.nodes) | state.dirty
+            for key in link_keys.symmetric_difference(state.link_keys):
+                touched.add(key[0])
+                touched.add(key[2])
+            touched.intersection_update(nodes)
+
+        for name in state.nodes - nodes.keys():
+            state.issues.pop(name, None)
+        for name in touched:
+            state.issues[name] = self._check_node(nodes[name], links_by_target.get(name, ()))
+
+        state.link_keys = link_keys
+        state.nodes = set(nodes)
+        state.dirty.clear()
+        return touched
+
+    def invalidate(self, node_tree: Any, node_names: Optional[Iterable[str]] = None) -> None:
+        """
+        标记需要在下次更新时重新验证的节点，用于连接以外的修改（例如套接字类型）
+
+        参数:
+            node_tree: 节点树
+            node_names: 节点名称，为None时标记所有节点
+        """
+        state = self._state(node_tree)
+        state.dirty.update(node_names if node_names is not None else (node.name for node in node_tree.nodes))
+
+    def get_issues(self, node_tree: Any, node_name: Optional[str] = None) -> List[ValidationIssue]:
+        """
+        获取已保存的验证结果，不会重新验证
+
+        参数:
+            node_tree: 节点树
+            node_name: 节点名称，为None时返回所有节点的问题
+
+        返回:
+            验证问题列表
+        """
+        state = self._states.get(node_tree.as_pointer())
+        if state is None:
+            return []
+        if node_name is not None:
+            return list(state.issues.get(node_name, ()))
+        return [issue for issues in state.issues.values() for issue in issues]
+
+    def forget(self, node_tree: Any) -> None:
+        """
+        删除节点树的验证状态
+        """
+        self._states.pop(node_tree.as_pointer(), None)
+
+    def clear(self) -> None:
+        """
+        清空所有验证状态
+        """
+        self._states.clear()
+
+    @staticmethod
+    def _check_node(node: Any, incoming: Iterable[Any]) -> List[ValidationIssue]:
+        """
+        验证单个节点的输入连接和必需输入
+
+        参数:
+            node: 节点
+            incoming: 连接到该节点的连接
+
+        返回:
+            验证问题列表
+        """
+        issues = []
+        linked_inputs = set()
+        for link in incoming:
+            to_socket = link.to_socket
+            from_socket = link.from_socket
+            linked_inputs.add(to_socket.identifier)
+            source = link.from_node.name
+
+            # 悬空连接：连接到不可用的套接字或被Blender标记为无效
+            if not getattr(to_socket, "enabled", True) or not getattr(from_socket, "enabled", True):
+                issues.append(ValidationIssue("ERROR", node.name, to_socket.name,
+                                              f"Link from '{source}.{from_socket.name}' is attached to an unavailable socket"))
+                continue
+            if not link.is_valid:
+                issues.append(ValidationIssue("ERROR", node.name, to_socket.name,
+                                              f"Invalid link from '{source}.{from_socket.name}'"))
+                continue
+
+            if not global_manager.validate_connection(from_socket, to_socket):
+                issues.append(ValidationIssue(
+                    "ERROR", node.name, to_socket.name,
+                    f"Incompatible socket types: {source}.{from_socket.name} "
+                    f"({getattr(from_socket, 'data_type', '?')}) -> {getattr(to_socket, 'data_type', '?')}"))
+
+        for socket in node.inputs:
+            if (getattr(socket, "is_required", False) and socket.identifier not in linked_inputs
+                    and not getattr(socket, "use_default_value", False)):
+                issues.append(ValidationIssue("ERROR", node.name, socket.name,
+                                              f"Required input '{socket.name}' is not connected"))
+        return issues
+
+
+# 全局验证引擎
+_validator = WorkflowValidator()
+
+# 等待重新验证的节点树名称
+_pending_trees: Set[str] = set()
+
+
+def get_validator() -> WorkflowValidator:
+    """
+    获取全局共享的工作流验证引擎
+    """
+    return _validator
+
+
+def _run_pending_updates() -> None:
+    """
+    重新验证等待中的节点树，由计时器在当前事件处理完后调用
+    """
+    for name in _pending_trees:
+        node_tree = bpy.data.node_groups.get(name)
+        if node_tree is not None:
+            _validator.update(node_tree)
+    _pending_trees.clear()
+
+
+def revalidate_nodes(node_tree: Any, node_names: Iterable[str]) -> None:
+    """
+    标记节点并在当前事件处理完后重新验证节点树，用于不改变连接的修改（例如套接字类型、默认值开关）；
+    同一轮中的多次修改（例如导入工作流时逐个设置套接字）只验证一次
+
+    参数:
+        node_tree: 节点树
+        node_names: 需要重新验证的节点名称
+    """
+    _validator.invalidate(node_tree, node_names)
+    if not _pending_trees:
+        bpy.app.timers.register(_run_pending_updates, first_interval=0.0)
+    _pending_trees.add(node_tree.name)
+
+
+@persistent
+def _reset_validation(*_args: Any) -> None:
+    """
+    打开文件、撤销和重做后清空验证状态，并重新验证所有n8n节点树
+    """
+    _validator.clear()
+    _pending_trees.clear()
+    for node_tree in bpy.data.node_groups:
+        if node_tree.bl_idname == N8nNodeTree.bl_idname:
+            _validator.update(node_tree, full=True)
+
+
+def register_validation_handlers() -> None:
+    """
+    注册清空验证状态的应用事件处理函数
+    """
+    for name in _STATE_RESET_HANDLERS:
+        handlers = getattr(bpy.app.handlers, name)
+        if _reset_validation not in handlers:
+            handlers.append(_reset_validation)
+
+
+def unregister_validation_handlers() -> None:
+    """
+    注销应用事件处理函数并清空验证状态
+    """
+    for name in _STATE_RESET_HANDLERS:
+        handlers = getattr(bpy.app.handlers, name)
+        if _reset_validation in handlers:
+            handlers.remove(_reset_validation)
+    if bpy.app.timers.is_registered(_run_pending_updates):
+        bpy.app.timers.unregister(_run_pending_updates)
+    _pending_trees.clear()
+    _validator.clear()
@@ -0,0 +1,21 @@
+from .n8n_http_pool import (
+    HTTPPoolManager,
+    HTTPConnectionPool,
+    HttpResponse,
+    HttpError,
+    get_pool_manager,
+    configure_http_pool,
+)
+from .n8n_http_cache import (
+    HttpCache,
+    CachedResponse,
+    get_http_cache,
+    configure_http_cache,
+)
+from .n8n_rate_limit import (
+    RateLimitRegistry,
+    TokenBucket,
+    get_rate_limits,
+    configure_rate_limits,
+    parse_host_limits,
+)
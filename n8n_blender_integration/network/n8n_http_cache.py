@@ -0,0 +1,471 @@
+import hashlib
+import http.client
+import json
+import os
+import tempfile
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Dict, Any, Iterator, List, Optional, Tuple
+
+from .n8n_http_pool import BaseResponse, HttpError, HTTPPoolManager, DEFAULT_CHUNK_SIZE, get_pool_manager
+
+# 默认缓存目录
+DEFAULT_CACHE_DIRECTORY = os.path.join(tempfile.gettempdir(), "n8n_blender_http_cache")
+
+# 可以缓存的请求方法和响应状态码
+_CACHEABLE_METHODS = {"GET"}
+_CACHEABLE_STATUS = {200, 203, 300, 301, 410}
+
+# 会修改资源的请求方法，成功后使对应URL的缓存失效
+_UNSAFE_METHODS = {"POST", "PUT", "PATCH", "DELETE"}
+
+# 重新验证后需要用304响应更新的头
+_REVALIDATION_HEADERS = ("cache-control", "date", "expires", "etag", "last-modified", "age", "vary")
+
+
+def _parse_cache_control(value: Optional[str]) -> Dict[str, Optional[str]]:
+    """
+    解析Cache-Control头为指令字典
+    """
+    directives: Dict[str, Optional[str]] = {}
+    for part in (value or "").split(","):
+        name, _, argument = part.strip().partition("=")
+        if name:
+            directives[name.lower()] = argument.strip('"') if argument else None
+    return directives
+
+
+def _parse_http_date(value: Optional[str]) -> Optional[float]:
+    """
+    解析HTTP日期为时间戳，无法解析时返回None
+    """
+    if not value:
+        return None
+    try:
+        return parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError, IndexError):
+        return None
+
+
+def _header_lookup(headers: Dict[str, str], name: str) -> Optional[str]:
+    """
+    不区分大小写地读取请求头
+    """
+    for key, value in headers.items():
+        if key.lower() == name:
+            return value
+    return None
+
+
+def _build_message(header_items: List[Tuple[str, str]]) -> http.client.HTTPMessage:
+    """
+    由保存的响应头创建HTTPMessage
+    """
+    message = http.client.HTTPMessage()
+    for name, value in header_items:
+        message[name] = value
+    return message
+
+
+class CacheEntry:
+    """
+    缓存条目（一个URL的一个Vary变体）
+    """
+
+    def __init__(self, data: Dict[str, Any]):
+        self.data = data
+
+    @property
+    def headers(self) -> http.client.HTTPMessage:
+        return _build_message(self.data["headers"])
+
+    def freshness_lifetime(self) -> float:
+        """
+        计算响应的有效期（秒），没有缓存信息时为0
+        """
+        headers = self.headers
+        directives = _parse_cache_control(headers.get("Cache-Control"))
+        if "no-cache" in directives:
+            return 0.0
+        if "max-age" in directives:
+            try:
+                return float(directives["max-age"])
+            except (TypeError, ValueError):
+                return 0.0
+        expires = _parse_http_date(headers.get("Expires"))
+        if expires is not None:
+            date = _parse_http_date(headers.get("Date")) or self.data["stored_at"]
+            return max(0.0, expires - date)
+        return 0.0
+
+    def current_age(self) -> float:
+        """
+        计算响应当前的年龄（秒）
+        """
+        try:
+            age = float(self.headers.get("Age") or 0)
+        except ValueError:
+            age = 0.0
+        return age + max(0.0, time.time() - self.data["stored_at"])
+
+    def is_fresh(self) -> bool:
+        """
+        检查缓存是否仍然新鲜
+        """
+        return self.freshness_lifetime() > self.current_age()
+
+    def validators(self) -> Dict[str, str]:
+        """
+        生成重新验证用的条件请求头
+        """
+        headers = self.headers
+        validators = {}
+        if headers.get("ETag"):
+            validators["If-None-Match"] = headers["ETag"]
+        if headers.get("Last-Modified"):
+            validators["If-Modified-Since"] = headers["Last-Modified"]
+        return validators
+
+
+class CachedResponse(BaseResponse):
+    """
+    从磁盘缓存读取的响应
+    """
+
+    def __init__(self, entry: CacheEntry, body_path: str, method: str, url: str, revalidated: bool = False):
+        self.method = method
+        self.url = url
+        self.status = entry.data["status"]
+        self.reason = entry.data["reason"]
+        self.headers = entry.headers
+        self.body_path = body_path
+        # 是否经过服务器重新验证（304）
+        self.revalidated = revalidated
+        self.from_cache = True
+
+    def read(self) -> bytes:
+        """
+        读取完整响应体
+        """
+        with open(self.body_path, "rb") as f:
+            return f.read()
+
+    def iter_content(self, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[bytes]:
+        """
+        按块读取响应体
+        """
+        with open(self.body_path, "rb") as f:
+            while True:
+                chunk = f.read(chunk_size)
+                if not chunk:
+                    break
+                yield chunk
+
+
+class HttpCache:
+    """
+    HTTP响应的磁盘缓存，按请求方法、URL和Vary请求头区分条目
+    """
+
+    def __init__(self, directory: str = DEFAULT_CACHE_DIRECTORY, offline: bool = False,
+                 pool_manager: Optional[HTTPPoolManager] = None):
+        """
+        初始化缓存
+
+        参数:
+            directory: 缓存目录
+            offline: 强制离线模式，只从缓存返回响应
+            pool_manager: 发送请求使用的连接池管理器，默认为全局共享的管理器
+        """
+        self.directory = directory
+        self.offline = offline
+        self.pool_manager = pool_manager
+        self._lock = threading.Lock()
+
+    def _primary_key(self, method: str, url: str) -> str:
+        return hashlib.sha256(f"{method} {url}".encode("utf-8")).hexdigest()
+
+    def _index_path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def _body_path(self, key: str, variant: str) -> str:
+        return os.path.join(self.directory, f"{key}-{variant}.body")
+
+    def _load_index(self, key: str) -> Dict[str, Any]:
+        try:
+            with open(self._index_path(key), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {"variants": []}
+
+    def _write_atomic(self, path: str, data: bytes) -> None:
+        """
+        先写临时文件再替换，避免并发读取到写了一半的文件
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(temp_path, path)
+        except BaseException:
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+            raise
+
+    @staticmethod
+    def _vary_values(vary_names: List[str], headers: Dict[str, str]) -> Dict[str, Optional[str]]:
+        return {name: _header_lookup(headers, name) for name in vary_names}
+
+    def lookup(self, method: str, url: str, headers: Dict[str, str]) -> Optional[Tuple[CacheEntry, str]]:
+        """
+        查找与请求头匹配的缓存条目
+
+        返回:
+            (缓存条目, 响应体文件路径)，没有缓存时返回None
+        """
+        key = self._primary_key(method, url)
+        for variant in self._load_index(key)["variants"]:
+            if self._vary_values(variant["vary_names"], headers) == variant["vary"]:
+                body_path = self._body_path(key, variant["id"])
+                if os.path.exists(body_path):
+                    return CacheEntry(variant), body_path
+        return None
+
+    def store(self, method: str, url: str, headers: Dict[str, str], status: int, reason: str,
+              header_items: List[Tuple[str, str]], body: bytes) -> Optional[Tuple[CacheEntry, str]]:
+        """
+        保存响应，不可缓存的响应返回None
+        """
+        variant = self._new_variant(headers, status, reason, header_items)
+        if variant is None:
+            return None
+        key = self._primary_key(method, url)
+        body_path = self._body_path(key, variant["id"])
+        with self._lock:
+            self._write_atomic(body_path, body)
+            self._save_variant(key, url, variant)
+        return CacheEntry(variant), body_path
+
+    def _new_variant(self, headers: Dict[str, str], status: int, reason: str,
+                     header_items: List[Tuple[str, str]]) -> Optional[Dict[str, Any]]:
+        """
+        生成缓存条目数据，不可缓存的响应返回None
+        """
+        response_headers = _build_message(header_items)
+        directives = _parse_cache_control(response_headers.get("Cache-Control"))
+        vary = response_headers.get("Vary", "")
+        if "no-store" in directives or vary.strip() == "*":
+            return None
+
+        vary_names = sorted({name.strip().lower() for name in vary.split(",") if name.strip()})
+        vary_values = self._vary_values(vary_names, headers)
+        variant_id = hashlib.sha256(json.dumps(vary_values, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+        variant = {
+            "id": variant_id,
+            "vary_names": vary_names,
+            "vary": vary_values,
+            "status": status,
+            "reason": reason,
+            "headers": [list(item) for item in header_items],
+            "stored_at": time.time(),
+        }
+        return variant
+
+    def _save_variant(self, key: str, url: str, variant: Dict[str, Any]) -> None:
+        """
+        把缓存条目写入索引，调用方需要持有锁
+        """
+        index = self._load_index(key)
+        index["url"] = url
+        index["variants"] = [item for item in index["variants"] if item["id"] != variant["id"]] + [variant]
+        self._write_atomic(self._index_path(key), json.dumps(index).encode("utf-8"))
+
+    def _commit_body(self, method: str, url: str, variant: Dict[str, Any], temp_path: str) -> None:
+        """
+        把已完整写入的临时响应体文件移动到缓存中并加入索引
+        """
+        key = self._primary_key(method, url)
+        with self._lock:
+            os.replace(temp_path, self._body_path(key, variant["id"]))
+            self._save_variant(key, url, variant)
+
+    def _refresh(self, method: str, url: str, entry: CacheEntry, not_modified: http.client.HTTPMessage) -> CacheEntry:
+        """
+        用304响应的头更新缓存条目
+        """
+        header_items = [
+            (name, value) for name, value in entry.data["headers"]
+            if name.lower() not in _REVALIDATION_HEADERS or name.lower() not in not_modified
+        ]
+        header_items += [
+            (name, value) for name, value in not_modified.items() if name.lower() in _REVALIDATION_HEADERS
+        ]
+        entry.data["headers"] = [list(item) for item in header_items]
+        entry.data["stored_at"] = time.time()
+
+        key = self._primary_key(method, url)
+        with self._lock:
+            index = self._load_index(key)
+            index["variants"] = [
+                entry.data if item["id"] == entry.data["id"] else item for item in index["variants"]
+            ]
+            self._write_atomic(self._index_path(key), json.dumps(index).encode("utf-8"))
+        return entry
+
+    def invalidate(self, url: str) -> None:
+        """
+        删除URL的所有缓存条目
+        """
+        key = self._primary_key("GET", url)
+        with self._lock:
+            for variant in self._load_index(key)["variants"]:
+                try:
+                    os.remove(self._body_path(key, variant["id"]))
+                except OSError:
+                    pass
+            try:
+                os.remove(self._index_path(key))
+            except OSError:
+                pass
+
+    def clear(self) -> None:
+        """
+        清空缓存目录
+        """
+        with self._lock:
+            if not os.path.isdir(self.directory):
+                return
+            for name in os.listdir(self.directory):
+                if name.endswith((".json", ".body", ".tmp")):
+                    try:
+                        os.remove(os.path.join(self.directory, name))
+                    except OSError:
+                        pass
+
+    def request(self, method: str, url: str, headers: Optional[Dict[str, str]] = None, body: Any = None,
+                connect_timeout: Optional[float] = None, read_timeout: Optional[float] = None) -> BaseResponse:
+        """
+        发送请求，可以缓存的请求优先使用缓存
+
+        参数:
+            method: HTTP方法
+            url: 请求URL
+            headers: 请求头
+            body: 请求体
+            connect_timeout: 连接超时
+            read_timeout: 读取超时
+
+        返回:
+            HTTP响应或缓存响应
+        """
+        method = method.upper()
+        headers = dict(headers or {})
+        pool_manager = self.pool_manager or get_pool_manager()
+        request_directives = _parse_cache_control(_header_lookup(headers, "cache-control"))
+
+        if method not in _CACHEABLE_METHODS or "no-store" in request_directives:
+            if self.offline:
+                raise HttpError(f"{method} {url} is not available in offline mode")
+            response = pool_manager.request(method, url, headers, body, connect_timeout, read_timeout)
+            if method in _UNSAFE_METHODS and response.ok:
+                self.invalidate(url)
+            return response
+
+        cached = self.lookup(method, url, headers)
+        if cached is not None:
+            entry, body_path = cached
+            if self.offline:
+                return CachedResponse(entry, body_path, method, url)
+            if entry.is_fresh() and "no-cache" not in request_directives and request_directives.get("max-age") != "0":
+                return CachedResponse(entry, body_path, method, url)
+            headers.update(entry.validators())
+        elif self.offline:
+            raise HttpError(f"{method} {url} is not cached and offline mode is enabled")
+
+        response = pool_manager.request(method, url, headers, body, connect_timeout, read_timeout)
+        if response.status == 304 and cached is not None:
+            response.read()
+            entry = self._refresh(method, url, cached[0], response.headers)
+            return CachedResponse(entry, cached[1], method, url, revalidated=True)
+        if response.status not in _CACHEABLE_STATUS:
+            return response
+
+        # 响应体在调用方读取时写入缓存，流式读取不会被整体载入内存
+        variant = self._new_variant(headers, response.status, response.reason, list(response.headers.items()))
+        if variant is None:
+            return response
+        return _CachingResponse(self, response, variant)
+
+
+class _CachingResponse(BaseResponse):
+    """
+    边读取边写入缓存的响应：数据块先写入临时文件，响应体完整读取后才加入缓存，中途停止读取时丢弃
+    """
+
+    def __init__(self, cache: HttpCache, response: BaseResponse, variant: Dict[str, Any]):
+        self.method = response.method
+        self.url = response.url
+        self.status = response.status
+        self.reason = response.reason
+        self.headers = response.headers
+        self.from_cache = False
+        self._cache = cache
+        self._response = response
+        self._variant = variant
+
+    def iter_content(self, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[bytes]:
+        """
+        按块读取响应体，同时写入缓存
+        """
+        os.makedirs(self._cache.directory, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=self._cache.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                for chunk in self._response.iter_content(chunk_size):
+                    f.write(chunk)
+                    yield chunk
+            self._cache._commit_body(self.method, self.url, self._variant, temp_path)
+        except BaseException:
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+            raise
+
+    def read(self) -> bytes:
+        """
+        读取完整响应体
+        """
+        return b"".join(self.iter_content())
+
+    def close(self) -> None:
+        self._response.close()
+
+
+# 全局HTTP缓存
+_http_cache = HttpCache()
+
+
+def get_http_cache() -> HttpCache:
+    """
+    获取全局共享的HTTP缓存
+    """
+    return _http_cache
+
+
+def configure_http_cache(directory: Optional[str] = None, offline: Optional[bool] = None) -> None:
+    """
+    修改全局HTTP缓存配置
+
+    参数:
+        directory: 缓存目录
+        offline: 强制离线模式
+    """
+    if directory is not None:
+        _http_cache.directory = directory
+    if offline is not None:
+        _http_cache.offline = offline
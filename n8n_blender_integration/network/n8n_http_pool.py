@@ -0,0 +1,475 @@
+import http.client
+import json
+import ssl
+import threading
+from collections import deque
+from typing import Dict, Any, Iterable, Iterator, Optional, Tuple
+from urllib.parse import urlsplit
+
+from .n8n_rate_limit import get_rate_limits, parse_retry_after, DEFAULT_BACKOFF
+
+# 每个主机的默认最大连接数
+DEFAULT_POOL_SIZE = 10
+
+# 默认连接超时（秒）
+DEFAULT_CONNECT_TIMEOUT = 10.0
+
+# 默认读取超时（秒）
+DEFAULT_READ_TIMEOUT = 30.0
+
+# 连接池已满时等待空闲连接的最长时间（秒）
+DEFAULT_POOL_TIMEOUT = 60.0
+
+# 流式读取响应体的块大小
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+DEFAULT_USER_AGENT = "n8n-blender-integration"
+
+# 复用的空闲连接已被服务器关闭时出现的异常，可以换新连接重试
+_STALE_CONNECTION_ERRORS = (
+    http.client.RemoteDisconnected,
+    http.client.CannotSendRequest,
+    ConnectionResetError,
+    ConnectionAbortedError,
+    BrokenPipeError,
+)
+
+
+class HttpError(ConnectionError):
+    """
+    HTTP请求失败（无法连接或连接池耗尽）
+    """
+
+
+class BaseResponse:
+    """
+    HTTP响应基类，子类实现read、iter_content和close
+    """
+
+    method: str
+    url: str
+    status: int
+    reason: str
+    headers: http.client.HTTPMessage
+
+    def header(self, name: str, default: Any = None) -> Any:
+        """
+        获取响应头（不区分大小写）
+        """
+        return self.headers.get(name, default)
+
+    @property
+    def ok(self) -> bool:
+        """
+        状态码是否表示成功
+        """
+        return 200 <= self.status < 400
+
+    def text(self, encoding: Optional[str] = None) -> str:
+        """
+        以文本形式读取响应体
+        """
+        encoding = encoding or self.headers.get_content_charset() or "utf-8"
+        return self.read().decode(encoding, errors="replace")
+
+    def json(self) -> Any:
+        """
+        以JSON形式读取响应体
+        """
+        return json.loads(self.text())
+
+    def decoded_body(self) -> Any:
+        """
+        按Content-Type读取响应体，JSON响应解析为对象，其他响应返回文本
+        """
+        content_type = self.headers.get_content_type()
+        if content_type == "application/json" or content_type.endswith("+json"):
+            text = self.text()
+            return json.loads(text) if text.strip() else None
+        return self.text()
+
+    def close(self) -> None:
+        """
+        关闭响应
+        """
+
+    def __enter__(self) -> 'BaseResponse':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+
+class HttpResponse(BaseResponse):
+    """
+    HTTP响应，响应体读取完毕后连接自动归还连接池
+    """
+
+    def __init__(self, pool: 'HTTPConnectionPool', connection: http.client.HTTPConnection,
+                 raw: http.client.HTTPResponse, method: str, url: str):
+        self._pool = pool
+        self._connection = connection
+        self._raw = raw
+        self.method = method
+        self.url = url
+        self.status = raw.status
+        self.reason = raw.reason
+        self.headers = raw.headers
+
+    def iter_content(self, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[bytes]:
+        """
+        流式读取响应体，读取完毕后归还连接
+
+        参数:
+            chunk_size: 每块字节数
+
+        返回:
+            响应体数据块迭代器
+        """
+        try:
+            while True:
+                chunk = self._raw.read(chunk_size)
+                if not chunk:
+                    break
+                yield chunk
+        except BaseException:
+            # 中途停止读取的连接无法复用
+            self.close()
+            raise
+        self._release()
+
+    def read(self) -> bytes:
+        """
+        读取完整响应体
+        """
+        try:
+            data = self._raw.read()
+        except BaseException:
+            self.close()
+            raise
+        self._release()
+        return data
+
+    def close(self) -> None:
+        """
+        关闭响应，未读完的连接直接丢弃
+        """
+        if self._connection is not None:
+            connection, self._connection = self._connection, None
+            self._raw.close()
+            self._pool.discard_connection(connection)
+
+    def _release(self) -> None:
+        """
+        响应体读取完毕后归还连接
+        """
+        if self._connection is None:
+            return
+        connection, self._connection = self._connection, None
+        if self._raw.will_close:
+            self._pool.discard_connection(connection)
+        else:
+            self._pool.put_connection(connection)
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
+
+
+class HTTPConnectionPool:
+    """
+    单个主机的keep-alive连接池
+    """
+
+    def __init__(self, scheme: str, host: str, port: int, maxsize: int = DEFAULT_POOL_SIZE,
+                 pool_timeout: float = DEFAULT_POOL_TIMEOUT):
+        """
+        初始化连接池
+
+        参数:
+            scheme: http或https
+            host: 主机名
+            port: 端口
+            maxsize: 最大连接数
+            pool_timeout: 连接池已满时等待空闲连接的最长时间
+        """
+        self.scheme = scheme
+        self.host = host
+        self.port = port
+        self.maxsize = maxsize
+        self.pool_timeout = pool_timeout
+        self._idle = deque()
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(maxsize)
+        self._ssl_context = ssl.create_default_context() if scheme == "https" else None
+
+    def _new_connection(self, connect_timeout: float) -> http.client.HTTPConnection:
+        """
+        创建并连接新的连接
+        """
+        if self.scheme == "https":
+            connection = http.client.HTTPSConnection(
+                self.host, self.port, timeout=connect_timeout, context=self._ssl_context
+            )
+        else:
+            connection = http.client.HTTPConnection(self.host, self.port, timeout=connect_timeout)
+        connection.connect()
+        return connection
+
+    def get_connection(self, connect_timeout: float) -> Tuple[http.client.HTTPConnection, bool]:
+        """
+        获取连接，优先复用空闲连接
+
+        参数:
+            connect_timeout: 新建连接时的连接超时
+
+        返回:
+            (连接, 是否为复用的连接)
+        """
+        if not self._slots.acquire(timeout=self.pool_timeout):
+            raise HttpError(f"Connection pool for {self.host}:{self.port} is exhausted")
+
+        with self._lock:
+            connection = self._idle.pop() if self._idle else None
+        if connection is not None:
+            return connection, True
+
+        try:
+            return self._new_connection(connect_timeout), False
+        except OSError as e:
+            self._slots.release()
+            raise HttpError(f"Failed to connect to {self.host}:{self.port}: {e}") from e
+        except BaseException:
+            self._slots.release()
+            raise
+
+    def put_connection(self, connection: http.client.HTTPConnection) -> None:
+        """
+        归还可以复用的连接
+        """
+        with self._lock:
+            self._idle.append(connection)
+        self._slots.release()
+
+    def discard_connection(self, connection: http.client.HTTPConnection) -> None:
+        """
+        关闭并丢弃连接
+        """
+        connection.close()
+        self._slots.release()
+
+    def urlopen(self, method: str, path: str, body: Any = None, headers: Optional[Dict[str, str]] = None,
+                connect_timeout: float = DEFAULT_CONNECT_TIMEOUT,
+                read_timeout: float = DEFAULT_READ_TIMEOUT, url: str = "") -> HttpResponse:
+        """
+        在连接池中的连接上发送请求
+
+        参数:
+            method: HTTP方法
+            path: 请求路径（含查询字符串）
+            body: 请求体（bytes、文件对象或bytes迭代器）
+            headers: 请求头
+            connect_timeout: 连接超时
+            read_timeout: 读取超时
+            url: 完整URL，仅用于响应记录
+
+        返回:
+            HTTP响应
+        """
+        headers = headers or {}
+        # 迭代器请求体只能发送一次（http.client按分块传输发送），不重试
+        streaming = body is not None and not isinstance(body, (bytes, bytearray, str))
+        attempts = 1 if streaming else 2
+
+        for attempt in range(attempts):
+            connection, reused = self.get_connection(connect_timeout)
+            try:
+                if connection.sock is not None:
+                    connection.sock.settimeout(read_timeout)
+                connection.request(method, path, body=body, headers=headers)
+                raw = connection.getresponse()
+            except _STALE_CONNECTION_ERRORS as e:
+                self.discard_connection(connection)
+                if reused and attempt + 1 < attempts:
+                    continue
+                raise HttpError(f"{method} {url or path} failed: {e}") from e
+            except BaseException:
+                self.discard_connection(connection)
+                raise
+            return HttpResponse(self, connection, raw, method, url or path)
+
+    def clear(self) -> None:
+        """
+        关闭所有空闲连接
+        """
+        with self._lock:
+            idle, self._idle = self._idle, deque()
+        for connection in idle:
+            connection.close()
+
+
+class HTTPPoolManager:
+    """
+    按主机管理连接池，所有节点和所有工作流运行共享
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_POOL_SIZE,
+                 connect_timeout: float = DEFAULT_CONNECT_TIMEOUT,
+                 read_timeout: float = DEFAULT_READ_TIMEOUT,
+                 pool_timeout: float = DEFAULT_POOL_TIMEOUT):
+        """
+        初始化连接池管理器
+
+        参数:
+            maxsize: 每个主机的最大连接数
+            connect_timeout: 默认连接超时
+            read_timeout: 默认读取超时
+            pool_timeout: 连接池已满时等待空闲连接的最长时间
+        """
+        self.maxsize = maxsize
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.pool_timeout = pool_timeout
+        self._pools: Dict[Tuple[str, str, int], HTTPConnectionPool] = {}
+        self._lock = threading.Lock()
+
+    def configure(self, maxsize: Optional[int] = None, connect_timeout: Optional[float] = None,
+                  read_timeout: Optional[float] = None, pool_timeout: Optional[float] = None) -> None:
+        """
+        修改连接池配置，修改连接数时重建连接池
+        """
+        if connect_timeout is not None:
+            self.connect_timeout = connect_timeout
+        if read_timeout is not None:
+            self.read_timeout = read_timeout
+        if pool_timeout is not None:
+            self.pool_timeout = pool_timeout
+        if maxsize is not None and maxsize != self.maxsize:
+            self.maxsize = maxsize
+            self.clear()
+
+    def connection_pool(self, scheme: str, host: str, port: int) -> HTTPConnectionPool:
+        """
+        获取主机对应的连接池，不存在时创建
+        """
+        key = (scheme, host, port)
+        with self._lock:
+            pool = self._pools.get(key)
+            if pool is None:
+                pool = HTTPConnectionPool(scheme, host, port, self.maxsize, self.pool_timeout)
+                self._pools[key] = pool
+            return pool
+
+    def request(self, method: str, url: str, headers: Optional[Dict[str, str]] = None, body: Any = None,
+                connect_timeout: Optional[float] = None, read_timeout: Optional[float] = None) -> HttpResponse:
+        """
+        发送HTTP请求
+
+        参数:
+            method: HTTP方法
+            url: 请求URL
+            headers: 请求头
+            body: 请求体，字典和列表按JSON发送
+            connect_timeout: 连接超时，为None时使用默认值
+            read_timeout: 读取超时，为None时使用默认值
+
+        返回:
+            HTTP响应，调用方需要读取响应体或关闭响应。
+            请求经过全局限速注册表，收到429时按Retry-After等待后重试
+        """
+        parts = urlsplit(url)
+        scheme = parts.scheme.lower()
+        if scheme not in ("http", "https") or not parts.hostname:
+            raise ValueError(f"Unsupported URL: {url}")
+        port = parts.port or (443 if scheme == "https" else 80)
+        path = parts.path or "/"
+        if parts.query:
+            path = f"{path}?{parts.query}"
+
+        headers = dict(headers or {})
+        body = encode_body(body, headers)
+        headers.setdefault("User-Agent", DEFAULT_USER_AGENT)
+
+        pool = self.connection_pool(scheme, parts.hostname, port)
+        rate_limits = get_rate_limits()
+        bucket_key = rate_limits.bucket_key(url, headers)
+        replayable = body is None or isinstance(body, (bytes, bytearray))
+
+        attempt = 0
+        while True:
+            rate_limits.acquire(bucket_key)
+            response = pool.urlopen(
+                method.upper(), path, body, headers,
+                connect_timeout=self.connect_timeout if connect_timeout is None else connect_timeout,
+                read_timeout=self.read_timeout if read_timeout is None else read_timeout,
+                url=url,
+            )
+            retry_after = response.header("Retry-After")
+            if response.status != 429 and not (response.status == 503 and retry_after):
+                return response
+
+            # 被限流时暂停同一主机或凭据的所有请求，再重试
+            delay = parse_retry_after(retry_after)
+            if delay is None:
+                delay = DEFAULT_BACKOFF * 2 ** attempt
+            rate_limits.pause(bucket_key, delay)
+            if attempt >= rate_limits.max_retries or not replayable:
+                return response
+            response.read()
+            attempt += 1
+
+    def clear(self) -> None:
+        """
+        关闭并移除所有连接池
+        """
+        with self._lock:
+            pools, self._pools = self._pools, {}
+        for pool in pools.values():
+            pool.clear()
+
+
+def encode_body(body: Any, headers: Dict[str, str]) -> Any:
+    """
+    编码请求体，按需要补充Content-Type
+
+    参数:
+        body: 请求体
+        headers: 请求头，会被修改
+
+    返回:
+        可以直接发送的请求体
+    """
+    if body is None or isinstance(body, (bytes, bytearray)):
+        return body
+    if isinstance(body, str):
+        return body.encode("utf-8")
+    if isinstance(body, (dict, list)):
+        if not any(name.lower() == "content-type" for name in headers):
+            headers["Content-Type"] = "application/json"
+        return json.dumps(body, ensure_ascii=False).encode("utf-8")
+    if isinstance(body, Iterable) or hasattr(body, "read"):
+        return body
+    return str(body).encode("utf-8")
+
+
+# 全局连接池管理器
+_pool_manager = HTTPPoolManager()
+
+
+def get_pool_manager() -> HTTPPoolManager:
+    """
+    获取全局共享的连接池管理器
+    """
+    return _pool_manager
+
+
+def configure_http_pool(**settings: Any) -> None:
+    """
+    修改全局连接池配置
+
+    参数:
+        settings: maxsize、connect_timeout、read_timeout、pool_timeout
+    """
+    _pool_manager.configure(**settings)
@@ -0,0 +1,238 @@
+import hashlib
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Dict, Any, Optional, Tuple
+from urllib.parse import urlsplit
+
+# 默认每秒请求数，0表示不限制
+DEFAULT_RATE = 0.0
+
+# 默认突发请求数（令牌桶容量）
+DEFAULT_BURST = 5
+
+# 收到429后的最大重试次数
+DEFAULT_MAX_RETRIES = 3
+
+# 429响应没有Retry-After时的初始退避时间（秒），每次重试翻倍
+DEFAULT_BACKOFF = 1.0
+
+# 不限速的主机被暂停时使用的补充速率
+_UNLIMITED_RATE = 1e9
+
+# 标识凭据的请求头，同一主机的不同凭据分别限速
+_CREDENTIAL_HEADERS = ("authorization", "x-api-key", "x-n8n-api-key")
+
+
+class TokenBucket:
+    """
+    令牌桶，按固定速率补充令牌，容量为突发请求数
+    """
+
+    def __init__(self, rate: float, burst: int):
+        """
+        初始化令牌桶
+
+        参数:
+            rate: 每秒补充的令牌数
+            burst: 令牌桶容量
+        """
+        self.rate = rate
+        self.burst = max(1, burst)
+        self.tokens = float(self.burst)
+        # 上次补充令牌的时间，被Retry-After暂停时为暂停结束的时间
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """
+        预留一个令牌
+
+        返回:
+            获得令牌前需要等待的秒数
+        """
+        with self._lock:
+            now = time.monotonic()
+            if now > self.updated:
+                self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+            self.tokens -= 1
+            # 令牌不足时按欠下的令牌数计算等待时间
+            return max(0.0, self.updated - now) + max(0.0, -self.tokens) / self.rate
+
+    def pause(self, seconds: float) -> None:
+        """
+        暂停发放令牌，用于遵守Retry-After
+
+        参数:
+            seconds: 暂停秒数
+        """
+        with self._lock:
+            resume = time.monotonic() + seconds
+            if resume > self.updated:
+                self.updated = resume
+                self.tokens = min(self.tokens, 0.0)
+
+
+class RateLimitRegistry:
+    """
+    全局限速注册表，按主机或凭据分配令牌桶，所有HTTP节点共享
+    """
+
+    def __init__(self, default_rate: float = DEFAULT_RATE, default_burst: int = DEFAULT_BURST,
+                 max_retries: int = DEFAULT_MAX_RETRIES):
+        """
+        初始化限速注册表
+
+        参数:
+            default_rate: 默认每秒请求数，0表示不限制
+            default_burst: 默认突发请求数
+            max_retries: 收到429后的最大重试次数
+        """
+        self.default_rate = default_rate
+        self.default_burst = default_burst
+        self.max_retries = max_retries
+        self.host_limits: Dict[str, Tuple[float, int]] = {}
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def configure(self, default_rate: Optional[float] = None, default_burst: Optional[int] = None,
+                  host_limits: Optional[Dict[str, Tuple[float, int]]] = None,
+                  max_retries: Optional[int] = None) -> None:
+        """
+        修改限速配置，已有的令牌桶会被重建
+        """
+        with self._lock:
+            if default_rate is not None:
+                self.default_rate = default_rate
+            if default_burst is not None:
+                self.default_burst = default_burst
+            if host_limits is not None:
+                self.host_limits = dict(host_limits)
+            if max_retries is not None:
+                self.max_retries = max_retries
+            self._buckets.clear()
+
+    def limit_for(self, host: str) -> Tuple[float, int]:
+        """
+        获取主机的限速配置
+
+        返回:
+            (每秒请求数, 突发请求数)
+        """
+        return self.host_limits.get(host, (self.default_rate, self.default_burst))
+
+    @staticmethod
+    def bucket_key(url: str, headers: Optional[Dict[str, str]] = None) -> str:
+        """
+        计算请求对应的令牌桶，带凭据的请求按主机和凭据区分
+        """
+        host = (urlsplit(url).hostname or "").lower()
+        for name, value in (headers or {}).items():
+            if name.lower() in _CREDENTIAL_HEADERS and value:
+                digest = hashlib.sha1(str(value).encode("utf-8")).hexdigest()[:12]
+                return f"{host}#{digest}"
+        return host
+
+    def _bucket(self, key: str, create_unlimited: bool = False) -> Optional[TokenBucket]:
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                rate, burst = self.limit_for(key.split("#", 1)[0])
+                if rate <= 0:
+                    if not create_unlimited:
+                        return None
+                    # 不限速的主机只在Retry-After暂停期间生效
+                    rate = _UNLIMITED_RATE
+                bucket = TokenBucket(rate, burst)
+                self._buckets[key] = bucket
+            return bucket
+
+    def acquire(self, key: str) -> float:
+        """
+        等待令牌桶发放令牌
+
+        参数:
+            key: 令牌桶键
+
+        返回:
+            实际等待的秒数
+        """
+        bucket = self._bucket(key)
+        if bucket is None:
+            return 0.0
+        delay = bucket.reserve()
+        if delay > 0:
+            time.sleep(delay)
+        return delay
+
+    def pause(self, key: str, seconds: float) -> None:
+        """
+        按Retry-After暂停令牌桶，不限速的主机也会暂停
+        """
+        self._bucket(key, create_unlimited=True).pause(seconds)
+
+
+def parse_retry_after(value: Any) -> Optional[float]:
+    """
+    解析Retry-After头（秒数或HTTP日期）
+
+    返回:
+        需要等待的秒数，无法解析时返回None
+    """
+    if value is None:
+        return None
+    value = str(value).strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError, IndexError):
+        return None
+
+
+def parse_host_limits(text: str) -> Dict[str, Tuple[float, int]]:
+    """
+    解析主机限速配置
+
+    参数:
+        text: 例如 "api.example.com=5/10, slow.example.org=0.5"，
+              等号后为每秒请求数，斜杠后为可选的突发请求数
+
+    返回:
+        主机到(每秒请求数, 突发请求数)的字典
+    """
+    limits = {}
+    for entry in (text or "").replace(";", ",").split(","):
+        host, _, limit = entry.strip().partition("=")
+        if not host or not limit:
+            continue
+        rate, _, burst = limit.partition("/")
+        try:
+            limits[host.strip().lower()] = (float(rate), int(burst) if burst.strip() else DEFAULT_BURST)
+        except ValueError:
+            raise ValueError(f"Invalid rate limit entry: {entry.strip()}")
+    return limits
+
+
+# 全局限速注册表
+_rate_limits = RateLimitRegistry()
+
+
+def get_rate_limits() -> RateLimitRegistry:
+    """
+    获取全局共享的限速注册表
+    """
+    return _rate_limits
+
+
+def configure_rate_limits(**settings: Any) -> None:
+    """
+    修改全局限速配置
+
+    参数:
+        settings: default_rate、default_burst、host_limits、max_retries
+    """
+    _rate_limits.configure(**settings)
@@ -1,7 +1,8 @@
 from .n8n_node_base import N8nNodeBase
-from .n8n_node_tree import N8nNodeTree, N8nNodeTreeSpace
+from .n8n_node_tree import N8nNodeTree, N8nNodeTreeSpace, CycleError, ScheduledNode
 from .n8n_socket import N8nSocket, N8nSocketMixin
 from .n8n_blueprints import node_blueprints, register_builtin_blueprints, N8nNodeBlueprint
+from .n8n_layout import auto_layout, layered_layout, needs_layout
 from .n8n_node_menu import register as register_menu, unregister as unregister_menu
 from ..manager.n8n_parser import N8nParser
 import os
@@ -51,7 +51,7 @@ n8n节点蓝图类，用于定义节点的结构和属性
         }
         return self
     
-    def add_input(self, name: str, data_type: str = "ANY", default_value: Any = "", use_default: bool = False, description: str = "") -> 'N8nNodeBlueprint':
+    def add_input(self, name: str, data_type: str = "ANY", default_value: Any = "", use_default: bool = False, description: str = "", multiple: bool = False, loop_back: bool = False, required: bool = False) -> 'N8nNodeBlueprint':
         """
         添加输入套接字
         
@@ -61,6 +61,9 @@ n8n节点蓝图类，用于定义节点的结构和属性
             default_value: 默认值
             use_default: 是否使用默认值
             description: 描述
+            multiple: 是否允许多个连接
+            loop_back: 是否为循环回环输入，连接到此输入的连接是循环的回边
+            required: 是否为必需的输入，未连接且未使用默认值时验证报错
             
         返回:
             自身实例，用于链式调用
@@ -70,7 +73,10 @@ n8n节点蓝图类，用于定义节点的结构和属性
             "data_type": data_type,
             "default_value": str(default_value),
             "use_default": use_default,
-            "description": description
+            "description": description,
+            "multiple": multiple,
+            "loop_back": loop_back,
+            "required": required
         })
         return self
     
@@ -140,7 +146,10 @@ def register_builtin_blueprints():
     http_request_blueprint.add_property("url", "https://", "URL to make the request to")
     http_request_blueprint.add_property("headers", "{}", "HTTP headers in JSON format")
     http_request_blueprint.add_property("body", "{}", "Request body in JSON format")
-    http_request_blueprint.add_property("timeout", 30, "Request timeout in seconds")
+    http_request_blueprint.add_property("timeout", 30, "Read timeout in seconds")
+    http_request_blueprint.add_property("connect_timeout", 10, "Connect timeout in seconds")
+    http_request_blueprint.add_property("stream", False, "Stream the response body as chunks instead of reading it whole")
+    http_request_blueprint.add_property("use_cache", True, "Serve GET requests from the local HTTP cache when allowed")
     http_request_blueprint.add_input("url", "STRING", "", False, "URL override")
     http_request_blueprint.add_input("headers", "JSON", "{}", False, "Headers override")
     http_request_blueprint.add_input("body", "JSON", "{}", False, "Body override")
@@ -167,6 +176,9 @@ def register_builtin_blueprints():
         "Parse JSON string to object",
         group="transform"
     )
+    json_parse_blueprint.add_property("mode", "whole", "Parse mode (whole, stream: emit top-level array items as they are decoded)")
+    json_parse_blueprint.add_property("file_path", "", "Parse this file instead of the input string")
+    json_parse_blueprint.add_property("chunk_size", 65536, "Bytes read at a time in stream mode")
     json_parse_blueprint.add_input("json_string", "STRING", "{}", False, "JSON string to parse")
     json_parse_blueprint.add_output("parsed_data", "JSON", "Parsed JSON object")
     json_parse_blueprint.register()
@@ -192,6 +204,8 @@ def register_builtin_blueprints():
     )
     file_read_blueprint.add_property("file_path", "", "Path to the file to read")
     file_read_blueprint.add_property("encoding", "utf-8", "File encoding")
+    file_read_blueprint.add_property("mode", "whole", "Read mode (whole, lines, chunks)")
+    file_read_blueprint.add_property("chunk_size", 1048576, "Chunk size in bytes for chunks mode")
     file_read_blueprint.add_input("file_path", "STRING", "", False, "File path override")
     file_read_blueprint.add_output("content", "STRING", "File content")
     file_read_blueprint.add_output("success", "BOOLEAN", "Whether the file was read successfully")
@@ -208,6 +222,8 @@ def register_builtin_blueprints():
     file_write_blueprint.add_property("content", "", "Content to write to the file")
     file_write_blueprint.add_property("mode", "w", "File mode (w, a, x, etc.)")
     file_write_blueprint.add_property("encoding", "utf-8", "File encoding")
+    file_write_blueprint.add_property("line_ending", "\n", "Text appended after each item when writing a list or stream")
+    file_write_blueprint.add_property("fsync", False, "Flush each written batch to disk with fsync")
     file_write_blueprint.add_input("file_path", "STRING", "", False, "File path override")
     file_write_blueprint.add_input("content", "STRING", "", False, "Content override")
     file_write_blueprint.add_output("success", "BOOLEAN", "Whether the file was written successfully")
@@ -251,6 +267,68 @@ def register_builtin_blueprints():
     log_blueprint.add_input("data", "ANY", "", False, "Data to log")
     log_blueprint.add_output("logged", "BOOLEAN", "Whether the data was logged successfully")
     log_blueprint.register()
+    
+    # Merge Node  合并节点
+    merge_blueprint = N8nNodeBlueprint(
+        "merge",
+        "Merge",
+        "Merge data from multiple branches",
+        group="transform"
+    )
+    merge_blueprint.add_property("mode", "append", "Merge mode (append, zip, key_join, key_mismatch)")
+    merge_blueprint.add_property("key", "id", "Field to match on in key_join and key_mismatch modes")
+    merge_blueprint.add_input("inputs", "ANY", "", False, "Data streams to merge", multiple=True)
+    merge_blueprint.add_output("output", "ARRAY", "Merged items")
+    merge_blueprint.register()
+    
+    # Split In Batches Node  分批循环节点
+    split_in_batches_blueprint = N8nNodeBlueprint(
+        "split_in_batches",
+        "Split In Batches",
+        "Feed items through the connected subgraph in fixed-size batches",
+        group="logic"
+    )
+    split_in_batches_blueprint.add_property("batch_size", 100, "Number of items per batch")
+    split_in_batches_blueprint.add_property("accumulate", True, "Collect the results of every batch on the done output; discard them when disabled")
+    split_in_batches_blueprint.add_input("items", "ANY", "", False, "Items to process")
+    split_in_batches_blueprint.add_input("loop", "ANY", "", False, "Result of the loop body for the current batch", multiple=True, loop_back=True)
+    split_in_batches_blueprint.add_output("batch", "ARRAY", "Current batch of items")
+    split_in_batches_blueprint.add_output("done", "ARRAY", "Accumulated results after the last batch")
+    split_in_batches_blueprint.add_output("processed", "NUMBER", "Number of items processed")
+    split_in_batches_blueprint.register()
+    
+    # Sub-workflow Node  子工作流节点
+    sub_workflow_blueprint = N8nNodeBlueprint(
+        "sub_workflow",
+        "Sub-workflow",
+        "Run another n8n workflow; it is inlined into the caller when the workflow is compiled",
+        group="utility"
+    )
+    sub_workflow_blueprint.add_property("workflow", "", "Name of the workflow to call")
+    sub_workflow_blueprint.add_input("input", "ANY", "", False, "Data passed to the Workflow Input nodes")
+    sub_workflow_blueprint.add_output("output", "ANY", "Data from the Workflow Output node")
+    sub_workflow_blueprint.register()
+    
+    # Workflow Input Node  子工作流输入节点
+    workflow_input_blueprint = N8nNodeBlueprint(
+        "workflow_input",
+        "Workflow Input",
+        "Receives the data passed to a sub-workflow",
+        group="utility"
+    )
+    workflow_input_blueprint.add_output("data", "ANY", "Data from the calling workflow")
+    workflow_input_blueprint.register()
+    
+    # Workflow Output Node  子工作流输出节点
+    workflow_output_blueprint = N8nNodeBlueprint(
+        "workflow_output",
+        "Workflow Output",
+        "Returns data from a sub-workflow to its caller",
+        group="utility"
+    )
+    workflow_output_blueprint.add_input("data", "ANY", "", False, "Data returned to the calling workflow")
+    workflow_output_blueprint.add_output("data", "ANY", "Returned data")
+    workflow_output_blueprint.register()
 
 # 初始化时注册内置蓝图
 register_builtin_blueprints()
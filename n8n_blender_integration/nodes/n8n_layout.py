@@ -0,0 +1,302 @@
+import math
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+# 默认的列间距和行间距
+DEFAULT_SPACING_X = 80.0
+DEFAULT_SPACING_Y = 40.0
+
+# 默认的交叉减少迭代次数（每次迭代包括一次向下和一次向上扫描）
+DEFAULT_ITERATIONS = 4
+
+# 节点尺寸尚未计算时使用的估计值
+DEFAULT_NODE_WIDTH = 140.0
+_NODE_HEADER_HEIGHT = 40.0
+_SOCKET_HEIGHT = 22.0
+
+
+def _acyclic_successors(count: int, successors: List[List[int]]) -> Tuple[List[List[int]], List[int]]:
+    """
+    迭代深度优先搜索，去掉回边得到无环图
+
+    返回:
+        (无环图的后继列表, 拓扑顺序)
+    """
+    # 0: 未访问，1: 在栈上，2: 已完成
+    state = [0] * count
+    dag: List[List[int]] = [[] for _ in range(count)]
+    postorder = []
+    for root in range(count):
+        if state[root]:
+            continue
+        state[root] = 1
+        stack = [(root, 0)]
+        while stack:
+            node, index = stack[-1]
+            if index < len(successors[node]):
+                stack[-1] = (node, index + 1)
+                successor = successors[node][index]
+                if state[successor] == 1:
+                    continue
+                dag[node].append(successor)
+                if state[successor] == 0:
+                    state[successor] = 1
+                    stack.append((successor, 0))
+            else:
+                stack.pop()
+                state[node] = 2
+                postorder.append(node)
+    postorder.reverse()
+    return dag, postorder
+
+
+def _assign_layers(dag: List[List[int]], order: List[int]) -> List[int]:
+    """
+    线性时间的分层：先按到源节点的最长路径分层，再把节点右移到紧挨其最近的后继，缩短跨层连接
+    """
+    layer = [0] * len(dag)
+    for node in order:
+        for successor in dag[node]:
+            if layer[successor] <= layer[node]:
+                layer[successor] = layer[node] + 1
+    for node in reversed(order):
+        if dag[node]:
+            layer[node] = max(layer[node], min(layer[successor] for successor in dag[node]) - 1)
+    return layer
+
+
+def _count_crossings(layers: List[List[int]], successors: List[List[int]], layer_of: List[int]) -> int:
+    """
+    统计相邻两层之间的连接交叉数（跨多层的连接不计入），每对相邻层用树状数组计算逆序对，O(E log V)
+    """
+    rank = {}
+    for layer in layers:
+        for index, node in enumerate(layer):
+            rank[node] = index
+    crossings = 0
+    for upper, lower in zip(layers, layers[1:]):
+        next_layer = layer_of[lower[0]]
+        targets = [rank[target] for node in upper for target in sorted(
+            (successor for successor in successors[node] if layer_of[successor] == next_layer), key=rank.__getitem__)]
+        tree = [0] * (len(lower) + 1)
+        for seen, target in enumerate(targets):
+            # 之前出现的目标中位置大于当前目标的个数
+            index = target + 1
+            smaller_or_equal = 0
+            while index > 0:
+                smaller_or_equal += tree[index]
+                index -= index & -index
+            crossings += seen - smaller_or_equal
+            index = target + 1
+            while index <= len(lower):
+                tree[index] += 1
+                index += index & -index
+    return crossings
+
+
+def _reduce_crossings(layers: List[List[int]], predecessors: List[List[int]], successors: List[List[int]],
+                      layer_of: List[int], group: List[int], iterations: int) -> List[List[int]]:
+    """
+    重心法减少交叉：交替向下和向上扫描，每层按相邻节点的相对位置的平均值排序，
+    迭代次数有上限，返回交叉最少的一次的排列；排序键先比较所属的连通分量，不同分量的节点不会交错
+    """
+    position = [0.0] * len(group)
+
+    def update(layer: List[int]) -> None:
+        size = len(layer)
+        for index, node in enumerate(layer):
+            position[node] = (index + 0.5) / size
+
+    for layer in layers:
+        update(layer)
+
+    def sweep(indices: Sequence[int], neighbours: List[List[int]]) -> None:
+        for layer_index in indices:
+            layer = layers[layer_index]
+            keys = {}
+            for node in layer:
+                adjacent = neighbours[node]
+                barycenter = sum(position[other] for other in adjacent) / len(adjacent) if adjacent else position[node]
+                keys[node] = (group[node], barycenter)
+            layer.sort(key=keys.__getitem__)
+            update(layer)
+
+    best = [list(layer) for layer in layers]
+    best_crossings = _count_crossings(layers, successors, layer_of)
+    for _ in range(iterations):
+        if best_crossings == 0:
+            break
+        sweep(range(1, len(layers)), predecessors)
+        sweep(range(len(layers) - 2, -1, -1), successors)
+        crossings = _count_crossings(layers, successors, layer_of)
+        if crossings < best_crossings:
+            best = [list(layer) for layer in layers]
+            best_crossings = crossings
+    return best
+
+
+def layered_layout(count: int, edges: Sequence[Tuple[int, int]], widths: Optional[Sequence[float]] = None,
+                   heights: Optional[Sequence[float]] = None, spacing_x: float = DEFAULT_SPACING_X,
+                   spacing_y: float = DEFAULT_SPACING_Y,
+                   iterations: int = DEFAULT_ITERATIONS) -> List[Tuple[float, float]]:
+    """
+    分层布局（Sugiyama风格）：去掉回边后线性时间分层，重心法减少交叉，再按列计算坐标。
+    每个连通分量占一个水平带，孤立节点排成网格放在最后
+
+    参数:
+        count: 节点数
+        edges: (源节点序号, 目标节点序号)列表
+        widths: 节点宽度
+        heights: 节点高度
+        spacing_x: 列间距
+        spacing_y: 行间距
+        iterations: 交叉减少的迭代次数
+
+    返回:
+        每个节点左上角的坐标（Blender节点坐标，y向上）
+    """
+    widths = widths or [DEFAULT_NODE_WIDTH] * count
+    heights = heights or [_NODE_HEADER_HEIGHT] * count
+
+    successors: List[List[int]] = [[] for _ in range(count)]
+    for source, target in edges:
+        if source != target:
+            successors[source].append(target)
+    dag, order = _acyclic_successors(count, successors)
+    predecessors: List[List[int]] = [[] for _ in range(count)]
+    for node in range(count):
+        for successor in dag[node]:
+            predecessors[successor].append(node)
+
+    # 连通分量按拓扑顺序中第一次出现的先后编号
+    group = [-1] * count
+    group_count = 0
+    for start in order:
+        if group[start] >= 0 or not (dag[start] or predecessors[start]):
+            continue
+        group[start] = group_count
+        stack = [start]
+        while stack:
+            node = stack.pop()
+            for other in dag[node] + predecessors[node]:
+                if group[other] < 0:
+                    group[other] = group_count
+                    stack.append(other)
+        group_count += 1
+    isolated = [node for node in order if group[node] < 0]
+
+    layer_of = _assign_layers(dag, order)
+    layers: List[List[int]] = [[] for _ in range(max(layer_of, default=-1) + 1)]
+    for node in order:
+        if group[node] >= 0:
+            layers[layer_of[node]].append(node)
+    # 右移后可能出现空层
+    layers = [layer for layer in layers if layer]
+    layers = _reduce_crossings(layers, predecessors, dag, layer_of, group, iterations)
+
+    # 列的x坐标由前面各列的最大宽度决定
+    column_x = []
+    x = 0.0
+    for layer in layers:
+        column_x.append(x)
+        x += max(widths[node] for node in layer) + spacing_x
+
+    # 每个连通分量的带高为其在各列中占用的最大高度，列在带内垂直居中
+    column_heights: Dict[Tuple[int, int], float] = {}
+    for layer_index, layer in enumerate(layers):
+        for node in layer:
+            key = (group[node], layer_index)
+            column_heights[key] = column_heights.get(key, -spacing_y) + heights[node] + spacing_y
+    band_heights = [0.0] * group_count
+    for (component, _), height in column_heights.items():
+        band_heights[component] = max(band_heights[component], height)
+    band_top = []
+    y = 0.0
+    for height in band_heights:
+        band_top.append(y)
+        y += height + spacing_y * 2
+
+    locations: List[Tuple[float, float]] = [(0.0, 0.0)] * count
+    for layer_index, layer in enumerate(layers):
+        cursor: Dict[int, float] = {}
+        for node in layer:
+            component = group[node]
+            if component not in cursor:
+                free = band_heights[component] - column_heights[(component, layer_index)]
+                cursor[component] = band_top[component] + free / 2
+            locations[node] = (column_x[layer_index], -cursor[component])
+            cursor[component] += heights[node] + spacing_y
+
+    # 孤立节点排成接近正方形的网格
+    if isolated:
+        columns = max(1, math.ceil(math.sqrt(len(isolated))))
+        cell_width = max(widths[node] for node in isolated) + spacing_x
+        row_top = y
+        for row_start in range(0, len(isolated), columns):
+            row = isolated[row_start:row_start + columns]
+            for column, node in enumerate(row):
+                locations[node] = (column * cell_width, -row_top)
+            row_top += max(heights[node] for node in row) + spacing_y
+    return locations
+
+
+def _estimate_height(node: Any) -> float:
+    """
+    估计节点高度：标题加上每个可见套接字一行
+    """
+    sockets = sum(1 for socket in node.inputs if getattr(socket, "enabled", True))
+    sockets += sum(1 for socket in node.outputs if getattr(socket, "enabled", True))
+    return _NODE_HEADER_HEIGHT + _SOCKET_HEIGHT * sockets
+
+
+def needs_layout(node_tree: Any) -> bool:
+    """
+    检查节点树是否缺少有效位置：有多个节点且所有节点都在同一位置（通常是导入时没有位置信息）
+    """
+    nodes = [node for node in node_tree.nodes if node.type != 'FRAME']
+    if len(nodes) < 2:
+        return False
+    first = tuple(nodes[0].location)
+    return all(tuple(node.location) == first for node in nodes)
+
+
+def auto_layout(node_tree: Any, spacing_x: float = DEFAULT_SPACING_X, spacing_y: float = DEFAULT_SPACING_Y,
+                iterations: int = DEFAULT_ITERATIONS) -> int:
+    """
+    对节点树做分层自动布局，所有位置计算完成后一次性写入
+
+    参数:
+        node_tree: 节点树
+        spacing_x: 列间距
+        spacing_y: 行间距
+        iterations: 交叉减少的迭代次数
+
+    返回:
+        布局的节点数
+    """
+    all_nodes = list(node_tree.nodes)
+    # 框架节点的位置由其中的节点决定，不参与布局
+    indices = {node.name: index for index, node in enumerate(node for node in all_nodes if node.type != 'FRAME')}
+    nodes = [node for node in all_nodes if node.name in indices]
+    edges = [
+        (indices[link.from_node.name], indices[link.to_node.name])
+        for link in node_tree.links
+        if link.from_node.name in indices and link.to_node.name in indices
+    ]
+    widths = [node.width or DEFAULT_NODE_WIDTH for node in nodes]
+    heights = [_estimate_height(node) for node in nodes]
+    locations = layered_layout(len(nodes), edges, widths, heights, spacing_x, spacing_y, iterations)
+
+    # 批量写入位置，避免逐个节点触发属性更新
+    flat = [0.0] * (len(all_nodes) * 2)
+    node_tree.nodes.foreach_get("location", flat)
+    for position, node in enumerate(all_nodes):
+        index = indices.get(node.name)
+        if index is not None:
+            flat[position * 2], flat[position * 2 + 1] = locations[index]
+    try:
+        node_tree.nodes.foreach_set("location", flat)
+    except (AttributeError, TypeError, RuntimeError):
+        for node, index in ((node, indices.get(node.name)) for node in all_nodes):
+            if index is not None:
+                node.location = locations[index]
+    return len(nodes)
@@ -11,6 +11,13 @@ n8n节点基类，所有n8n节点都继承自此类
     bl_icon = "NODETREE"
     bl_width_default = 200
     
+    # 创建节点所用的蓝图ID，执行器据此查找节点处理器
+    blueprint_id: bpy.props.StringProperty(
+        name="Blueprint ID",
+        default="",
+        description="ID of the blueprint this node was created from"
+    )
+    
     # 节点执行状态
     execution_state: bpy.props.EnumProperty(
         name="Execution State",
@@ -19,6 +26,7 @@ n8n节点基类，所有n8n节点都继承自此类
             ("RUNNING", "Running", "Node is executing"),
             ("SUCCESS", "Success", "Node executed successfully"),
             ("ERROR", "Error", "Node execution failed"),
+            ("SKIPPED", "Skipped", "Node was skipped because its branch did not fire"),
         ],
         default="IDLE",
         description="Current execution state of the node"
@@ -38,6 +46,13 @@ n8n节点基类，所有n8n节点都继承自此类
         description="Error message if execution failed"
     )
     
+    # 固定执行结果，执行期间不释放，便于查看
+    pin_result: bpy.props.BoolProperty(
+        name="Pin Result",
+        default=False,
+        description="Keep this node's output in memory after its consumers have read it"
+    )
+    
     def init(self, context):
         """
         初始化节点，创建输入和输出套接字
@@ -49,6 +64,7 @@ n8n节点基类，所有n8n节点都继承自此类
         绘制节点属性面板
         """
         layout.prop(self, "execution_state")
+        layout.prop(self, "pin_result")
         if self.execution_state == "SUCCESS" and self.execution_result:
             layout.label(text="Result:")
             layout.label(text=self.execution_result, icon="CHECKMARK")
@@ -69,17 +85,63 @@ n8n节点基类，所有n8n节点都继承自此类
         # 子类需要重写此方法
         return {}
     
+    def get_parameter(self, name: str, default: Any = None) -> Any:
+        """
+        获取节点参数，参数以ID属性的形式保存在节点上
+        
+        参数:
+            name: 参数名称
+            default: 参数不存在时返回的默认值
+            
+        返回:
+            参数值
+        """
+        parameters = self.get("parameters")
+        if parameters is None or name not in parameters:
+            return default
+        value = parameters[name]
+        if hasattr(value, "to_dict"):
+            return value.to_dict()
+        if hasattr(value, "to_list"):
+            return value.to_list()
+        return value
+    
+    def set_parameter(self, name: str, value: Any) -> None:
+        """
+        设置节点参数
+        
+        参数:
+            name: 参数名称
+            value: 参数值
+        """
+        if self.get("parameters") is None:
+            self["parameters"] = {}
+        self["parameters"][name] = value
+    
+    def get_parameters(self) -> Dict[str, Any]:
+        """
+        获取节点的所有参数
+        
+        返回:
+            参数字典
+        """
+        parameters = self.get("parameters")
+        return parameters.to_dict() if parameters is not None else {}
+    
     def serialize(self) -> Dict[str, Any]:
         """
         序列化节点数据
         """
         return {
             "bl_idname": self.bl_idname,
+            "blueprint_id": self.blueprint_id,
             "name": self.name,
             "location": [self.location.x, self.location.y],
             "execution_state": self.execution_state,
             "execution_result": self.execution_result,
-            "error_message": self.error_message
+            "error_message": self.error_message,
+            "pin_result": self.pin_result,
+            "parameters": self.get_parameters()
         }
     
     def deserialize(self, data: Dict[str, Any]) -> None:
@@ -87,10 +149,14 @@ n8n节点基类，所有n8n节点都继承自此类
         反序列化节点数据
         """
         self.name = data.get("name", self.name)
+        self.blueprint_id = data.get("blueprint_id", "")
         self.location = data.get("location", self.location)
         self.execution_state = data.get("execution_state", "IDLE")
         self.execution_result = data.get("execution_result", "")
         self.error_message = data.get("error_message", "")
+        self.pin_result = data.get("pin_result", False)
+        for name, value in data.get("parameters", {}).items():
+            self.set_parameter(name, value)
     
     def reset(self):
         """
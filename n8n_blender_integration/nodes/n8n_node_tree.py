@@ -1,6 +1,122 @@
 import bpy
+import json
 from bpy.types import NodeTree
-from typing import List, Dict, Any
+from collections import deque
+from typing import List, Dict, Any, Hashable, Iterable, NamedTuple, Union
+
+# 标记循环依赖节点的颜色
+CYCLE_HIGHLIGHT_COLOR = (0.8, 0.15, 0.15)
+
+# calculate_execution_order的返回模式
+EXECUTION_ORDER_MODES = ("sequence", "levels")
+
+
+class ScheduledNode(NamedTuple):
+    """
+    分层执行顺序中的节点
+    """
+    node: Any
+    # 所在层，即从任一源节点到该节点的最长路径长度
+    depth: int
+    # 从该节点到任一汇节点的最长路径长度
+    height: int
+
+
+class CycleError(ValueError):
+    """
+    工作流存在循环依赖时抛出，cycles为构成每个循环的节点名称
+    """
+
+    def __init__(self, cycles: List[List[str]]):
+        self.cycles = cycles
+        paths = "; ".join(" -> ".join(cycle + cycle[:1]) for cycle in cycles)
+        super().__init__(f"Workflow contains circular dependencies: {paths}")
+
+
+def strongly_connected_components(adjacency: Dict[Hashable, Iterable[Hashable]]) -> List[List[Hashable]]:
+    """
+    Tarjan算法求强连通分量，使用显式栈，时间复杂度为O(节点数 + 边数)
+    
+    参数:
+        adjacency: 邻接表，所有后继都必须是邻接表的键
+        
+    返回:
+        强连通分量列表，按逆拓扑序排列
+    """
+    index = {}
+    low = {}
+    stack = []
+    on_stack = set()
+    components = []
+    counter = 0
+    
+    for root in adjacency:
+        if root in index:
+            continue
+        index[root] = low[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack.add(root)
+        work = [(root, iter(adjacency[root]))]
+        
+        while work:
+            node, successors = work[-1]
+            for successor in successors:
+                if successor not in index:
+                    index[successor] = low[successor] = counter
+                    counter += 1
+                    stack.append(successor)
+                    on_stack.add(successor)
+                    work.append((successor, iter(adjacency[successor])))
+                    break
+                if successor in on_stack:
+                    low[node] = min(low[node], index[successor])
+            else:
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    low[parent] = min(low[parent], low[node])
+                if low[node] == index[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == node:
+                            break
+                    components.append(component)
+    
+    return components
+
+
+def find_cycles(adjacency: Dict[Hashable, List[Hashable]]) -> List[List[Hashable]]:
+    """
+    找出图中的循环，每个包含循环的强连通分量给出一条循环路径
+    
+    参数:
+        adjacency: 邻接表
+        
+    返回:
+        循环路径列表，每条路径按连接方向排列，首尾相连
+    """
+    cycles = []
+    for component in strongly_connected_components(adjacency):
+        if len(component) == 1:
+            node = component[0]
+            if node in adjacency[node]:
+                cycles.append([node])
+            continue
+        # 分量内每个节点都有位于分量内的后继，沿后继前进必然回到路径上的某个节点
+        members = set(component)
+        path = []
+        position = {}
+        node = component[-1]
+        while node not in position:
+            position[node] = len(path)
+            path.append(node)
+            node = next(successor for successor in adjacency[node] if successor in members)
+        cycles.append(path[position[node]:])
+    return cycles
 
 class N8nNodeTree(NodeTree):
     """
@@ -66,15 +182,141 @@ n8n节点树，用于管理n8n工作流
                 return node
         return None
     
-    def calculate_execution_order(self) -> List[Any]:
+    @staticmethod
+    def is_back_edge(link: Any) -> bool:
         """
-        计算节点执行顺序
+        检查连接是否为循环回边（连接到循环节点的回环输入）
         
+        参数:
+            link: 节点连接
+            
         返回:
-            按执行顺序排列的节点列表
+            是回边返回True，否则返回False
         """
-        # 实现拓扑排序算法
-        from collections import deque
+        return bool(getattr(link.to_socket, "is_loop_back", False))
+    
+    # 上次标记为循环依赖的节点名称（JSON列表）
+    cycle_nodes: bpy.props.StringProperty(
+        name="Cycle Nodes",
+        default="[]",
+        description="Names of the nodes currently highlighted as part of a dependency cycle"
+    )
+    
+    # 标记前节点自身的颜色设置（JSON字典：节点名称 -> [use_custom_color, color]），取消标记时恢复
+    cycle_saved_colors: bpy.props.StringProperty(
+        name="Cycle Saved Colors",
+        default="{}",
+        description="Custom color settings of highlighted nodes, restored when they leave the cycle"
+    )
+    
+    # 最宽一层的节点数和层数，节点树拓扑变化时更新；
+    # 同一层的节点一定可以同时执行，但不同层的节点也可能互不依赖，因此这只是最大并行度的下界
+    max_parallelism: bpy.props.IntProperty(
+        name="Widest Level",
+        default=0,
+        description="Number of nodes in the widest dependency level, a lower bound on how many nodes can run at the same time"
+    )
+    
+    level_count: bpy.props.IntProperty(
+        name="Levels",
+        default=0,
+        description="Number of dependency levels (length of the longest chain)"
+    )
+    
+    # 拓扑版本，每次节点树更新时递增，调用此工作流的执行计划据此失效
+    graph_version: bpy.props.IntProperty(
+        name="Graph Version",
+        default=0,
+        description="Incremented on every topology change"
+    )
+    
+    def update(self):
+        """
+        节点树拓扑变化时检查循环依赖并标记相关节点，更新最宽层的节点数，
+        并重新验证连接发生变化的节点
+        """
+        self.graph_version += 1
+        from ..manager.n8n_validator import get_validator
+        get_validator().update(self)
+        
+        cycles = self.find_cycles()
+        self.highlight_cycles(cycles)
+        if not cycles:
+            self.update_parallelism()
+        elif self.max_parallelism or self.level_count:
+            self.max_parallelism = 0
+            self.level_count = 0
+    
+    def _dependency_adjacency(self) -> Dict[str, List[str]]:
+        """
+        按节点名称构建邻接表，循环回边不计入依赖
+        """
+        adjacency = {node.name: [] for node in self.nodes}
+        for link in self.links:
+            if not self.is_back_edge(link):
+                adjacency[link.from_node.name].append(link.to_node.name)
+        return adjacency
+    
+    def find_cycles(self) -> List[List[str]]:
+        """
+        查找循环依赖，循环回边不计入依赖
+        
+        返回:
+            构成每个循环的节点名称列表
+        """
+        return find_cycles(self._dependency_adjacency())
+    
+    def highlight_cycles(self, cycles: List[List[str]]) -> None:
+        """
+        用颜色标记循环中的节点，并取消不再处于循环中的节点的标记；
+        标记前保存节点原来的颜色设置，取消标记时恢复
+        
+        参数:
+            cycles: find_cycles()的结果
+        """
+        current = sorted({name for cycle in cycles for name in cycle})
+        try:
+            previous = set(json.loads(self.cycle_nodes))
+        except ValueError:
+            previous = set()
+        if set(current) == previous:
+            return
+        
+        try:
+            saved_colors = json.loads(self.cycle_saved_colors)
+        except ValueError:
+            saved_colors = {}
+        
+        for name in previous.difference(current):
+            node = self.nodes.get(name)
+            use_custom_color, color = saved_colors.pop(name, (False, None))
+            if node is not None:
+                node.use_custom_color = use_custom_color
+                if color is not None:
+                    node.color = color
+        for name in current:
+            node = self.nodes[name]
+            if name not in saved_colors:
+                saved_colors[name] = (node.use_custom_color, tuple(node.color))
+            node.use_custom_color = True
+            node.color = CYCLE_HIGHLIGHT_COLOR
+        self.cycle_nodes = json.dumps(current)
+        self.cycle_saved_colors = json.dumps(saved_colors)
+    
+    def calculate_execution_order(self, mode: str = "sequence") -> Union[List[Any], List[List[ScheduledNode]]]:
+        """
+        计算节点执行顺序，循环回边不计入依赖
+        
+        参数:
+            mode: sequence返回按执行顺序排列的节点列表；
+                  levels返回按深度分层的反链，同一层的节点互不依赖，可以并行执行
+        
+        返回:
+            sequence模式为节点列表，levels模式为每层的ScheduledNode列表，
+            层内按到汇节点的最长路径降序排列
+        """
+        if mode not in EXECUTION_ORDER_MODES:
+            raise ValueError(f"Unknown execution order mode: {mode}")
         
         # 构建邻接表和入度表
         adjacency = {}
@@ -87,6 +329,8 @@ n8n节点树，用于管理n8n工作流
         
         # 构建图
         for link in self.links:
+            if self.is_back_edge(link):
+                continue
             from_node = link.from_node
             to_node = link.to_node
             adjacency[from_node].append(to_node)
@@ -98,22 +342,52 @@ n8n节点树，用于管理n8n工作流
             if degree == 0:
                 queue.append(node)
         
-        # 执行拓扑排序
+        # 执行拓扑排序，同时计算每个节点的深度
         execution_order = []
+        depth = dict.fromkeys(adjacency, 0)
         while queue:
             current = queue.popleft()
             execution_order.append(current)
             
             for neighbor in adjacency[current]:
+                depth[neighbor] = max(depth[neighbor], depth[current] + 1)
                 in_degree[neighbor] -= 1
                 if in_degree[neighbor] == 0:
                     queue.append(neighbor)
         
         # 检查是否存在循环依赖
         if len(execution_order) != len(self.nodes):
-            raise ValueError("Workflow contains circular dependencies")
+            cycles = self.find_cycles()
+            self.highlight_cycles(cycles)
+            raise CycleError(cycles)
+        
+        if mode == "sequence":
+            return execution_order
         
-        return execution_order
+        # 逆拓扑序计算到汇节点的最长路径
+        height = {}
+        for node in reversed(execution_order):
+            height[node] = max((height[neighbor] + 1 for neighbor in adjacency[node]), default=0)
+        
+        levels = [[] for _ in range(max(depth.values(), default=-1) + 1)]
+        for node in execution_order:
+            levels[depth[node]].append(ScheduledNode(node, depth[node], height[node]))
+        for level in levels:
+            level.sort(key=lambda scheduled: -scheduled.height)
+        return levels
+    
+    def update_parallelism(self) -> None:
+        """
+        更新工作流最宽一层的节点数（最大并行度的下界）和层数
+        """
+        try:
+            levels = self.calculate_execution_order(mode="levels")
+        except CycleError:
+            levels = []
+        max_parallelism = max((len(level) for level in levels), default=0)
+        if self.max_parallelism != max_parallelism or self.level_count != len(levels):
+            self.max_parallelism = max_parallelism
+            self.level_count = len(levels)
     
     def reset_all_nodes(self):
         """
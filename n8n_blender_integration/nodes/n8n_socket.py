@@ -2,6 +2,20 @@ import bpy
 from bpy.types import NodeSocket
 from typing import Any, Dict
 
+# 多连接输入套接字的连接上限（Blender允许的最大值）
+MULTI_INPUT_LINK_LIMIT = 4095
+
+def _revalidate_socket(socket, context):
+    """
+    套接字类型、默认值开关或必需标记变化时重新验证所属节点和相连的节点；
+    这些修改不改变连接，节点树的update()不会发现
+    """
+    from ..manager.n8n_validator import revalidate_nodes
+    node_names = [socket.node.name]
+    if socket.is_linked:
+        node_names.extend(link.to_node.name if socket.is_output else link.from_node.name for link in socket.links)
+    revalidate_nodes(socket.id_data, node_names)
+
 class N8nSocket(NodeSocket):
     """
 n8n自定义套接字，支持多种数据类型
@@ -22,7 +36,8 @@ n8n自定义套接字，支持多种数据类型
             ("ANY", "Any", "Any data type", "NODETREE", 7),
         ],
         default="ANY",
-        description="Data type of the socket"
+        description="Data type of the socket",
+        update=_revalidate_socket
     )
     
     # 默认值
@@ -36,7 +51,23 @@ n8n自定义套接字，支持多种数据类型
     use_default_value: bpy.props.BoolProperty(
         name="Use Default",
         default=False,
-        description="Use default value if no connection is present"
+        description="Use default value if no connection is present",
+        update=_revalidate_socket
+    )
+    
+    # 是否为循环回环输入
+    is_loop_back: bpy.props.BoolProperty(
+        name="Loop Back",
+        default=False,
+        description="Links into this input close a loop and are not treated as dependencies"
+    )
+    
+    # 是否为必需的输入
+    is_required: bpy.props.BoolProperty(
+        name="Required",
+        default=False,
+        description="The input must be connected or use its default value",
+        update=_revalidate_socket
     )
     
     def draw(self, context, layout, node, text):
@@ -108,6 +139,15 @@ n8n自定义套接字，支持多种数据类型
         
         return self.data_type == other_socket.data_type
     
+    def is_multi_link(self) -> bool:
+        """
+        检查套接字是否允许多个连接
+        
+        返回:
+            允许多个连接返回True，否则返回False
+        """
+        return not self.is_output and self.link_limit > 1
+    
     def get_value(self) -> Any:
         """
         获取套接字的值
@@ -165,7 +205,10 @@ n8n自定义套接字，支持多种数据类型
             "name": self.name,
             "data_type": self.data_type,
             "default_value": self.default_value,
-            "use_default_value": self.use_default_value
+            "use_default_value": self.use_default_value,
+            "link_limit": self.link_limit,
+            "is_loop_back": self.is_loop_back,
+            "is_required": self.is_required
         }
     
     def deserialize(self, data: Dict[str, Any]) -> None:
@@ -176,6 +219,9 @@ n8n自定义套接字，支持多种数据类型
         self.data_type = data.get("data_type", "ANY")
         self.default_value = data.get("default_value", "")
         self.use_default_value = data.get("use_default_value", False)
+        self.link_limit = data.get("link_limit", 1)
+        self.is_loop_back = data.get("is_loop_back", False)
+        self.is_required = data.get("is_required", False)
 
 # 注册套接字属性到节点
 class N8nSocketMixin:
@@ -184,7 +230,7 @@ class N8nSocketMixin:
     """
     
     @staticmethod
-    def add_input_socket(node, name: str, data_type: str = "ANY", default_value: Any = "", use_default: bool = False) -> N8nSocket:
+    def add_input_socket(node, name: str, data_type: str = "ANY", default_value: Any = "", use_default: bool = False, multiple: bool = False) -> N8nSocket:
         """
         添加输入套接字
         """
@@ -192,6 +238,7 @@ class N8nSocketMixin:
         socket.data_type = data_type
         socket.default_value = str(default_value)
         socket.use_default_value = use_default
+        socket.link_limit = MULTI_INPUT_LINK_LIMIT if multiple else 1
         return socket
     
     @staticmethod
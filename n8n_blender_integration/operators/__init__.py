@@ -7,13 +7,19 @@ from .workflow_ops import (
     N8N_OT_duplicate_workflow,
     N8N_OT_delete_workflow,
     N8N_OT_export_workflow,
-    N8N_OT_import_workflow
+    N8N_OT_import_workflow,
+    N8N_OT_auto_layout
 )
 
 from .node_ops import (
     N8N_OT_add_node
 )
 
+from .log_ops import (
+    N8N_OT_log_page,
+    N8N_OT_clear_log
+)
+
 classes = [
     N8N_OT_execute_workflow,
     N8N_OT_reset_workflow,
@@ -23,7 +29,10 @@ classes = [
     N8N_OT_delete_workflow,
     N8N_OT_export_workflow,
     N8N_OT_import_workflow,
-    N8N_OT_add_node
+    N8N_OT_auto_layout,
+    N8N_OT_add_node,
+    N8N_OT_log_page,
+    N8N_OT_clear_log
 ]
 
 def register():
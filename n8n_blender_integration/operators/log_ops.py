@@ -0,0 +1,52 @@
+from bpy.types import Operator
+from bpy.props import EnumProperty
+from ..logs import get_log_sink, LOG_PAGE_SIZE
+
+class N8N_OT_log_page(Operator):
+    """
+    日志面板翻页操作符
+    """
+    bl_idname = "n8n.log_page"
+    bl_label = "Change Log Page"
+    bl_description = "Show newer or older log entries"
+    
+    direction: EnumProperty(
+        name="Direction",
+        items=[
+            ("LATEST", "Latest", "Show the most recent entries"),
+            ("NEWER", "Newer", "Show newer entries"),
+            ("OLDER", "Older", "Show older entries")
+        ],
+        default="OLDER"
+    )
+    
+    def execute(self, context):
+        """
+        执行操作
+        """
+        wm = context.window_manager
+        if self.direction == "LATEST":
+            wm.n8n_log_page = 0
+        elif self.direction == "NEWER":
+            wm.n8n_log_page = max(0, wm.n8n_log_page - 1)
+        else:
+            # 总页数随日志增加而变化，翻页时按当前总页数限制页码
+            _, total_pages = get_log_sink().page(0, LOG_PAGE_SIZE, wm.n8n_log_level.lower())
+            wm.n8n_log_page = min(wm.n8n_log_page + 1, total_pages - 1)
+        return {'FINISHED'}
+
+class N8N_OT_clear_log(Operator):
+    """
+    清空日志面板操作符
+    """
+    bl_idname = "n8n.clear_log"
+    bl_label = "Clear Log"
+    bl_description = "Clear the log entries kept in memory"
+    
+    def execute(self, context):
+        """
+        执行操作
+        """
+        get_log_sink().clear()
+        context.window_manager.n8n_log_page = 0
+        return {'FINISHED'}
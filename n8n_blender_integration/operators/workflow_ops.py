@@ -1,14 +1,26 @@
 import bpy
+import asyncio
+import concurrent.futures
 import os
+import time
 from bpy.types import Operator
-from bpy.props import StringProperty, BoolProperty, FloatProperty, EnumProperty
+from bpy.props import StringProperty, BoolProperty, FloatProperty, EnumProperty, IntProperty
 from bpy_extras.io_utils import ExportHelper, ImportHelper
 from ..execution.n8n_workflow import N8nWorkflow
 from ..nodes.n8n_node_tree import N8nNodeTree
+from ..nodes.n8n_layout import (auto_layout, needs_layout, DEFAULT_SPACING_X, DEFAULT_SPACING_Y,
+                                DEFAULT_ITERATIONS)
+
+# 异步执行时推进事件循环的间隔（秒）
+EXECUTION_STEP_INTERVAL = 0.05
+
+# 每个计时器事件中运行事件循环的最长时间（秒），其余时间留给界面
+EXECUTION_STEP_BUDGET = 0.02
 
 class N8N_OT_execute_workflow(Operator):
     """
-    执行n8n工作流操作符
+    执行n8n工作流操作符，从界面调用时在模态计时器中推进异步执行，等待节点不会阻塞界面；
+    从脚本调用execute()时同步执行
     """
     bl_idname = "n8n.execute_workflow"
     bl_label = "Execute n8n Workflow"
@@ -36,12 +48,11 @@ class N8N_OT_execute_workflow(Operator):
         try:
             # 创建工作流并执行
             workflow = N8nWorkflow(node_tree)
-            start_time = bpy.context.scene.frame_current
+            start_time = time.perf_counter()
             
             if workflow.execute():
                 # 计算执行时间
-                execution_time = bpy.context.scene.frame_current - start_time
-                node_tree.execution_time = execution_time
+                node_tree.execution_time = time.perf_counter() - start_time
                 self.report({'INFO'}, "Workflow executed successfully")
             else:
                 self.report({'ERROR'}, "Workflow execution failed")
@@ -50,6 +61,84 @@ class N8N_OT_execute_workflow(Operator):
         except Exception as e:
             self.report({'ERROR'}, f"Execution failed: {e}")
             return {'CANCELLED'}
+    
+    def invoke(self, context, event):
+        """
+        启动异步执行，工作流在独立的事件循环中运行，由计时器事件推进
+        """
+        node_tree = context.space_data.edit_tree
+        
+        if not isinstance(node_tree, N8nNodeTree):
+            self.report({'ERROR'}, "Not an n8n node tree")
+            return {'CANCELLED'}
+        if node_tree.workflow_state == "RUNNING":
+            self.report({'WARNING'}, "Workflow is already running")
+            return {'CANCELLED'}
+        
+        self._node_tree = node_tree
+        self._start_time = time.perf_counter()
+        self._loop = asyncio.new_event_loop()
+        # 使用单独的线程池，取消执行时不需要等待仍在运行的节点线程
+        self._executor = concurrent.futures.ThreadPoolExecutor(thread_name_prefix="n8n-node")
+        self._loop.set_default_executor(self._executor)
+        self._task = self._loop.create_task(N8nWorkflow(node_tree).execute_async())
+        # 工作流结束时立即停止事件循环，不必等到本次时间片用完
+        self._task.add_done_callback(lambda task: self._loop.stop())
+        
+        window_manager = context.window_manager
+        self._timer = window_manager.event_timer_add(EXECUTION_STEP_INTERVAL, window=context.window)
+        window_manager.modal_handler_add(self)
+        return {'RUNNING_MODAL'}
+    
+    def modal(self, context, event):
+        """
+        每个计时器事件运行事件循环一个时间片，然后把控制权交回界面；按Esc取消执行
+        """
+        if event.type == 'ESC' and not self._task.done():
+            self._task.cancel()
+        if event.type != 'TIMER':
+            return {'PASS_THROUGH'}
+        
+        # 时间片内就绪的回调和线程池中完成的节点会连续处理，一次可以推进多个节点
+        stop = self._loop.call_later(EXECUTION_STEP_BUDGET, self._loop.stop)
+        self._loop.run_forever()
+        stop.cancel()
+        
+        # 刷新节点编辑器中的节点状态
+        for area in context.screen.areas:
+            if area.type == 'NODE_EDITOR':
+                area.tag_redraw()
+        
+        if not self._task.done():
+            return {'PASS_THROUGH'}
+        return self._finish(context)
+    
+    def _finish(self, context):
+        """
+        结束异步执行：移除计时器、关闭事件循环并报告结果
+        """
+        context.window_manager.event_timer_remove(self._timer)
+        # 取消后不等待仍在运行的节点线程，避免界面卡住；线程结束时事件循环已关闭，结果直接丢弃
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self._loop.close()
+        
+        if self._task.cancelled():
+            # 执行器已把运行中的节点重置并标记为已取消
+            self.report({'WARNING'}, "Workflow execution cancelled")
+            return {'CANCELLED'}
+        
+        error = self._task.exception()
+        if error is not None:
+            self._node_tree.workflow_state = "ERROR"
+            self.report({'ERROR'}, f"Execution failed: {error}")
+            return {'CANCELLED'}
+        
+        if self._task.result():
+            self._node_tree.execution_time = time.perf_counter() - self._start_time
+            self.report({'INFO'}, "Workflow executed successfully")
+        else:
+            self.report({'ERROR'}, "Workflow execution failed")
+        return {'FINISHED'}
 
 class N8N_OT_reset_workflow(Operator):
     """
@@ -298,6 +387,10 @@ class N8N_OT_import_workflow(Operator, ImportHelper):
             # 从文件加载工作流
             workflow = N8nWorkflow.load_from_file(self.filepath)
             
+            # 导入的工作流没有位置信息时自动布局
+            if needs_layout(workflow.node_tree):
+                auto_layout(workflow.node_tree)
+            
             # 打开节点编辑器并显示工作流
             for area in bpy.context.screen.areas:
                 if area.type == 'NODE_EDITOR':
@@ -311,6 +404,64 @@ class N8N_OT_import_workflow(Operator, ImportHelper):
             self.report({'ERROR'}, f"Import failed: {e}")
             return {'CANCELLED'}
 
+class N8N_OT_auto_layout(Operator):
+    """
+    自动布局n8n工作流操作符
+    """
+    bl_idname = "n8n.auto_layout"
+    bl_label = "Auto Layout"
+    bl_description = "Arrange the nodes of the current workflow in layers from left to right"
+    bl_options = {'REGISTER', 'UNDO'}
+    
+    spacing_x: FloatProperty(
+        name="Horizontal Spacing",
+        description="Gap between node columns",
+        default=DEFAULT_SPACING_X,
+        min=0.0
+    )
+    
+    spacing_y: FloatProperty(
+        name="Vertical Spacing",
+        description="Gap between nodes in a column",
+        default=DEFAULT_SPACING_Y,
+        min=0.0
+    )
+    
+    iterations: IntProperty(
+        name="Iterations",
+        description="Number of crossing reduction passes",
+        default=DEFAULT_ITERATIONS,
+        min=0,
+        max=50
+    )
+    
+    @classmethod
+    def poll(cls, context):
+        """
+        检查是否可以执行操作
+        """
+        return (context.space_data.tree_type == "N8nNodeTreeType" and 
+                context.space_data.edit_tree)
+    
+    def execute(self, context):
+        """
+        执行操作
+        """
+        node_tree = context.space_data.edit_tree
+        
+        if not isinstance(node_tree, N8nNodeTree):
+            self.report({'ERROR'}, "Not an n8n node tree")
+            return {'CANCELLED'}
+        
+        try:
+            start_time = time.perf_counter()
+            count = auto_layout(node_tree, self.spacing_x, self.spacing_y, self.iterations)
+            self.report({'INFO'}, f"Arranged {count} nodes in {time.perf_counter() - start_time:.2f}s")
+            return {'FINISHED'}
+        except Exception as e:
+            self.report({'ERROR'}, f"Auto layout failed: {e}")
+            return {'CANCELLED'}
+
 class N8N_OT_open_workflow(Operator):
     """
     在节点编辑器中打开工作流
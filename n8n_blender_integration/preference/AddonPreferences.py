@@ -1,10 +1,26 @@
 import os
 
 import bpy
-from bpy.props import StringProperty, IntProperty, BoolProperty
+from bpy.props import StringProperty, IntProperty, BoolProperty, FloatProperty
 from bpy.types import AddonPreferences
 
 from ..config import __addon_name__
+from ..network import configure_rate_limits, parse_host_limits, configure_http_cache, configure_http_pool
+from ..network.n8n_http_pool import DEFAULT_POOL_SIZE
+
+
+def _update_rate_limits(self, context):
+    """
+    偏好设置修改后更新全局限速注册表
+    """
+    self.apply_rate_limits()
+
+
+def _update_http_settings(self, context):
+    """
+    偏好设置修改后更新全局连接池和HTTP缓存
+    """
+    self.apply_http_settings()
 
 
 class ExampleAddonPreferences(AddonPreferences):
@@ -28,9 +44,88 @@ class ExampleAddonPreferences(AddonPreferences):
         default=False,
     )
 
+    # HTTP限速，所有HTTP节点共享
+    rate_limit_default: FloatProperty(
+        name="Requests per Second",
+        description="Default request rate per host or credential, 0 means unlimited",
+        default=0.0,
+        min=0.0,
+        update=_update_rate_limits,
+    )
+    rate_limit_burst: IntProperty(
+        name="Burst",
+        description="Number of requests that may be sent at once before the rate applies",
+        default=5,
+        min=1,
+        update=_update_rate_limits,
+    )
+    rate_limit_hosts: StringProperty(
+        name="Per-Host Limits",
+        description="Comma separated host=rate[/burst] entries, e.g. api.example.com=5/10",
+        default="",
+        update=_update_rate_limits,
+    )
+    rate_limit_retries: IntProperty(
+        name="Retries on 429",
+        description="How many times a throttled request is retried after waiting for Retry-After",
+        default=3,
+        min=0,
+        update=_update_rate_limits,
+    )
+
+    # HTTP连接池和缓存
+    http_pool_size: IntProperty(
+        name="Connections per Host",
+        description="Maximum number of pooled connections kept for each host",
+        default=DEFAULT_POOL_SIZE,
+        min=1,
+        update=_update_http_settings,
+    )
+    http_offline: BoolProperty(
+        name="Force Offline",
+        description="Serve cacheable requests only from the HTTP cache and fail all others",
+        default=False,
+        update=_update_http_settings,
+    )
+
+    def apply_rate_limits(self):
+        """
+        将限速设置应用到全局限速注册表
+        """
+        try:
+            host_limits = parse_host_limits(self.rate_limit_hosts)
+        except ValueError as e:
+            print(f"Invalid per-host rate limits: {e}")
+            host_limits = {}
+        configure_rate_limits(
+            default_rate=self.rate_limit_default,
+            default_burst=self.rate_limit_burst,
+            host_limits=host_limits,
+            max_retries=self.rate_limit_retries,
+        )
+
+    def apply_http_settings(self):
+        """
+        将连接池和缓存设置应用到全局连接池和HTTP缓存
+        """
+        configure_http_pool(maxsize=self.http_pool_size)
+        configure_http_cache(offline=self.http_offline)
+
     def draw(self, context: bpy.types.Context):
         layout = self.layout
         layout.label(text="Add-on Preferences View")
         layout.prop(self, "filepath")
         layout.prop(self, "number")
         layout.prop(self, "boolean")
+
+        box = layout.box()
+        box.label(text="HTTP Rate Limits")
+        box.prop(self, "rate_limit_default")
+        box.prop(self, "rate_limit_burst")
+        box.prop(self, "rate_limit_hosts")
+        box.prop(self, "rate_limit_retries")
+
+        box = layout.box()
+        box.label(text="HTTP Connections")
+        box.prop(self, "http_pool_size")
+        box.prop(self, "http_offline")
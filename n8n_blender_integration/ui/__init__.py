@@ -1,5 +1,6 @@
 from .panels import (
     N8N_PT_workflow_panel,
     N8N_PT_node_properties_panel,
-    N8N_PT_workflow_list_panel
+    N8N_PT_workflow_list_panel,
+    N8N_PT_log_panel
 )
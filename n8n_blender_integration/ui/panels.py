@@ -3,6 +3,8 @@ from bpy.types import Panel
 from ..nodes.n8n_node_tree import N8nNodeTree
 from ..nodes.n8n_node_base import N8nNodeBase
 from ..execution.n8n_workflow import N8nWorkflow
+from ..logs import get_log_sink, LOG_PAGE_SIZE
+from ..manager.n8n_validator import get_validator
 
 class N8N_PT_workflow_panel(Panel):
     """
@@ -44,6 +46,21 @@ n8n工作流面板，显示在节点编辑器的侧边栏
         box.prop(node_tree, "workflow_state")
         if node_tree.workflow_state == "SUCCESS":
             box.label(text=f"Execution Time: {node_tree.execution_time:.2f}s", icon="TIME")
+        if node_tree.level_count:
+            box.label(text=f"Widest Level: {node_tree.max_parallelism} nodes ({node_tree.level_count} levels)", icon="NODETREE")
+        if node_tree.cycle_nodes != "[]":
+            for cycle in node_tree.find_cycles():
+                box.label(text="Cycle: " + " -> ".join(cycle + cycle[:1]), icon="ERROR")
+        
+        # 验证结果（节点树更新时增量计算，这里只读取）
+        issues = get_validator().get_issues(node_tree)
+        if issues:
+            box = layout.box()
+            box.label(text=f"Problems: {len(issues)}", icon="ERROR")
+            for issue in issues[:10]:
+                box.label(text=f"{issue.node}: {issue.message}")
+            if len(issues) > 10:
+                box.label(text=f"... and {len(issues) - 10} more")
         
         # 工作流操作
         box = layout.box()
@@ -51,6 +68,7 @@ n8n工作流面板，显示在节点编辑器的侧边栏
         row = box.row()
         row.operator("n8n.execute_workflow", text="Execute", icon="PLAY")
         row.operator("n8n.reset_workflow", text="Reset", icon="LOOP_BACK")
+        row.operator("n8n.auto_layout", text="Layout", icon="NODETREE")
         
         # 导入/导出
         row = box.row()
@@ -106,6 +124,8 @@ n8n节点属性面板，显示在节点编辑器的侧边栏
         elif active_node.execution_state == "ERROR" and active_node.error_message:
             box.label(text="Error:")
             box.label(text=active_node.error_message, icon="ERROR")
+        for issue in get_validator().get_issues(context.space_data.edit_tree, active_node.name):
+            box.label(text=issue.message, icon="ERROR" if issue.severity == "ERROR" else "INFO")
         
         # 节点特定属性
         box = layout.box()
@@ -184,3 +204,63 @@ n8n工作流列表面板，显示在3D视图的侧边栏
             "ERROR": "ERROR"
         }
         return icon_map.get(state, "INFO")
+
+class N8N_PT_log_panel(Panel):
+    """
+n8n日志面板，分页显示最近的日志条目
+    """
+    bl_label = "n8n Log"
+    bl_idname = "N8N_PT_log_panel"
+    bl_space_type = "NODE_EDITOR"
+    bl_region_type = "UI"
+    bl_category = "n8n"
+    bl_options = {"DEFAULT_CLOSED"}
+    
+    @classmethod
+    def poll(cls, context):
+        """
+        检查是否显示面板
+        """
+        return context.space_data.tree_type == "N8nNodeTreeType"
+    
+    def draw(self, context):
+        """
+        绘制面板
+        """
+        layout = self.layout
+        wm = context.window_manager
+        
+        row = layout.row()
+        row.prop(wm, "n8n_log_level", text="")
+        row.operator("n8n.clear_log", text="", icon="TRASH")
+        
+        # 只复制当前页，日志再多也不影响界面绘制
+        entries, total_pages = get_log_sink().page(wm.n8n_log_page, LOG_PAGE_SIZE, wm.n8n_log_level.lower())
+        page = min(wm.n8n_log_page, total_pages - 1)
+        
+        row = layout.row(align=True)
+        row.operator("n8n.log_page", text="", icon="REW").direction = "LATEST"
+        row.operator("n8n.log_page", text="", icon="TRIA_LEFT").direction = "NEWER"
+        row.label(text=f"Page {page + 1}/{total_pages}")
+        row.operator("n8n.log_page", text="", icon="TRIA_RIGHT").direction = "OLDER"
+        
+        box = layout.box()
+        if not entries:
+            box.label(text="No log entries", icon="INFO")
+            return
+        col = box.column(align=True)
+        for entry in entries:
+            source = f"[{entry.source}] " if entry.source else ""
+            col.label(text=f"{source}{entry.message}", icon=self._get_level_icon(entry.level))
+    
+    def _get_level_icon(self, level):
+        """
+        获取日志级别对应的图标
+        """
+        icon_map = {
+            "debug": "DOT",
+            "info": "INFO",
+            "warning": "ERROR",
+            "error": "CANCEL"
+        }
+        return icon_map.get(level, "INFO")
@@ -0,0 +1,70 @@
+import importlib.util
+import json
+import os
+import random
+
+import pytest
+
+# 插件包的__init__依赖bpy，这里按文件路径单独加载不依赖Blender的流式解析模块
+_MODULE_PATH = os.path.join(
+    os.path.dirname(__file__), os.pardir, "n8n_blender_integration", "filesystem", "n8n_json_stream.py"
+)
+_spec = importlib.util.spec_from_file_location("n8n_json_stream", _MODULE_PATH)
+json_stream = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(json_stream)
+
+
+def _random_value(rng, depth=0):
+    kind = rng.randrange(8 if depth < 3 else 5)
+    if kind == 0:
+        return rng.randint(-10 ** 12, 10 ** 12)
+    if kind == 1:
+        return rng.uniform(-1e6, 1e6) * 10 ** rng.randint(-30, 30)
+    if kind == 2:
+        return rng.choice([True, False, None])
+    if kind == 3:
+        return "".join(rng.choice("ab \"\\/é中\n") for _ in range(rng.randrange(6)))
+    if kind == 4:
+        return rng.choice([0, -0.0, 1e-7, 12.5, -3e+20])
+    if kind in (5, 6):
+        return [_random_value(rng, depth + 1) for _ in range(rng.randrange(4))]
+    return {f"k{i}": _random_value(rng, depth + 1) for i in range(rng.randrange(4))}
+
+
+def _split(data, rng):
+    chunks, pos = [], 0
+    while pos < len(data):
+        size = rng.randint(1, 8)
+        chunks.append(data[pos:pos + size])
+        pos += size
+    return chunks
+
+
+@pytest.fixture
+def stdlib_backend(monkeypatch):
+    monkeypatch.setattr(json_stream, "ijson", None)
+
+
+@pytest.mark.parametrize("chunks", [
+    [b"[12.", b"5]"],
+    [b"[1e", b"5]"],
+    [b"[1E+", b"5, 2]"],
+    [b"[-", b"1.0e-3]"],
+    [b"[0", b".25 , 3]"],
+])
+def test_numbers_split_at_chunk_boundary(stdlib_backend, chunks):
+    assert list(json_stream.iter_json_array(iter(chunks))) == json.loads(b"".join(chunks))
+
+
+def test_random_chunk_boundaries_match_json_loads(stdlib_backend):
+    rng = random.Random(40)
+    for _ in range(300):
+        value = [_random_value(rng) for _ in range(rng.randrange(6))]
+        text = json.dumps(value, ensure_ascii=rng.random() < 0.5, indent=rng.choice([None, 1]))
+        data = text.encode("utf-8")
+        assert list(json_stream.iter_json_array(iter(_split(data, rng)))) == json.loads(data)
+
+
+def test_truncated_number_at_end_of_input_is_rejected(stdlib_backend):
+    with pytest.raises(ValueError):
+        list(json_stream.iter_json_array(iter([b"[12.", b""])))